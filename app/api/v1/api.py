@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from app.api.v1.endpoints import auth, cityworks_endpoint, uploads, health, transactions, file_status, admin, users
 from app.api.v1.endpoints import reports, cash_variance, schedule, time_off, special_events, enforcement
+from app.api.v1.endpoints import data_lake_endpoints
 
 api_router = APIRouter()
 
@@ -11,6 +12,7 @@ api_router.include_router(users.router, tags=["users"])
 api_router.include_router(uploads.router, prefix="/files", tags=["file-uploads"])
 api_router.include_router(file_status.router, prefix="/files", tags=["file-status"])
 api_router.include_router(transactions.router)
+api_router.include_router(data_lake_endpoints.router)  # /data-lake: transaction search and revenue summaries
 api_router.include_router(reports.router)
 api_router.include_router(admin.router)
 api_router.include_router(cash_variance.router)
@@ -1,27 +1,31 @@
 """
 API Endpoints for Data Lake Operations
-Add this to app/api/v1/endpoints/data_lake.py
+Mounted under /api/v1/data-lake (see app/api/v1/api.py)
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
+from decimal import Decimal
+import orjson
 import os
 import pandas as pd
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db, SessionLocal
 from app.api.dependencies import get_current_user
-from app.models.database import User, UserRole, UploadedFile, Transaction, DataSourceType
+from app.models.database import User, UserRole, UploadedFile, Transaction, DataSourceType, PaymentType
 from app.models.schemas import (
     FileProcessRequest, FileProcessResponse,
     ETLProcessRequest, ETLProcessResponse, ETLStatusResponse,
     TransactionFilter, TransactionResponse, TransactionSummary,
+    DailySummary, MonthlySummary,
     BulkUploadRequest, BulkUploadResponse
 )
 from app.utils.etl_processor import ETLProcessor, DataLoader
 
-router = APIRouter(prefix="/api/v1/data-lake", tags=["data-lake"])
+router = APIRouter(prefix="/data-lake", tags=["data-lake"])
 
 
 # ============= File Upload to Staging =============
@@ -160,7 +164,7 @@ async def run_etl_process(
     start_time = datetime.now()
     
     try:
-        processor = ETLProcessor(db)
+        processor = ETLProcessor(db, session_factory=SessionLocal)
         
         if request.dry_run:
             # Preview mode - don't commit changes
@@ -217,58 +221,48 @@ async def get_etl_status(
     """
     from sqlalchemy import func, and_
     from app.models.database import (
-        WindcaveStaging, PaymentsInsiderStaging, 
+        WindcaveStaging, PaymentsInsiderSalesStaging, PaymentsInsiderPaymentsStaging,
         IPSCashStaging, ETLProcessingLog
     )
     
     # Count pending records in each staging table
     pending = {}
     
-    pending["windcave"] = db.query(WindcaveStaging).filter(
+    # COUNT(id) / MAX(start_time) select only what is returned, not whole rows
+    pending["windcave"] = db.query(func.count(WindcaveStaging.id)).filter(
         WindcaveStaging.processed_to_final == False
-    ).count()
+    ).scalar()
     
-    pending["payments_insider"] = db.query(PaymentsInsiderStaging).filter(
-        PaymentsInsiderStaging.processed_to_final == False
-    ).count()
+    # Payments Insider has a sales and a payments staging table; report them together
+    pending["payments_insider"] = sum(
+        db.query(func.count(model.id)).filter(model.processed_to_final == False).scalar()
+        for model in (PaymentsInsiderSalesStaging, PaymentsInsiderPaymentsStaging)
+    )
     
-    pending["ips_cash"] = db.query(IPSCashStaging).filter(
+    pending["ips_cash"] = db.query(func.count(IPSCashStaging.id)).filter(
         IPSCashStaging.processed_to_final == False
-    ).count()
+    ).scalar()
     
     # Get today's processed count
     today = datetime.now().date()
-    processed_today = db.query(Transaction).filter(
+    processed_today = db.query(func.count(Transaction.id)).filter(
         func.date(Transaction.created_at) == today
-    ).count()
+    ).scalar()
     
     # Get last ETL run
-    last_run = db.query(ETLProcessingLog).order_by(
-        ETLProcessingLog.start_time.desc()
-    ).first()
+    last_run = db.query(func.max(ETLProcessingLog.start_time)).scalar()
     
     return ETLStatusResponse(
         pending_records=pending,
         processed_today=processed_today,
-        last_run=last_run.start_time if last_run else None,
+        last_run=last_run,
         errors=None
     )
 
 
 # ============= Transaction Queries =============
-@router.post("/transactions/search", response_model=List[TransactionResponse])
-async def search_transactions(
-    filters: TransactionFilter,
-    limit: int = 100,
-    offset: int = 0,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Search transactions with filters
-    """
-    query = db.query(Transaction)
-    
+def _filter_transactions(query, filters: TransactionFilter):
+    """Apply TransactionFilter criteria to a query over Transaction"""
     if filters.start_date:
         query = query.filter(Transaction.transaction_date >= filters.start_date)
     if filters.end_date:
@@ -287,76 +281,109 @@ async def search_transactions(
         query = query.filter(Transaction.transaction_amount >= filters.min_amount)
     if filters.max_amount:
         query = query.filter(Transaction.transaction_amount <= filters.max_amount)
+    return query
+
+
+def _json_default(value):
+    """orjson fallback for Numeric/MoneyCents values (Decimal); everything else is native"""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+class DecimalORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also writes Decimal values, as JSON numbers.
+
+    Lets endpoints return result rows as plain dicts without converting
+    each money column first.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content, default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+@router.post("/transactions/search", response_model=List[TransactionResponse], response_class=DecimalORJSONResponse)
+async def search_transactions(
+    filters: TransactionFilter,
+    limit: int = 100,
+    offset: int = 0,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Search transactions with filters
+    """
+    # Select only the response columns and skip ORM identity-map bookkeeping
+    field_names = list(TransactionResponse.model_fields)
+    query = db.query(*[getattr(Transaction, name) for name in field_names])
+    query = _filter_transactions(query, filters)
     
-    transactions = query.limit(limit).offset(offset).all()
-    return transactions
+    rows = query.limit(limit).offset(offset).all()
+    
+    # Rows are our own typed columns: return the response directly so FastAPI
+    # doesn't validate and re-serialize every row against response_model
+    # (kept for the OpenAPI schema), as get_transaction_summary does. orjson
+    # writes enums as their values and datetimes as ISO strings.
+    return DecimalORJSONResponse(content=[row._asdict() for row in rows])
+
+
+def _enum_key(member) -> str:
+    """Plain-string dict key for a grouped enum column (NULL groups as 'unknown')"""
+    return member.value if member is not None else "unknown"
 
 
 @router.post("/transactions/summary", response_model=TransactionSummary)
 async def get_transaction_summary(
     filters: TransactionFilter,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get summary statistics for transactions
-    """
-    from sqlalchemy import func
     
-    query = db.query(Transaction)
-    
-    # Apply filters (same as search)
-    if filters.start_date:
-        query = query.filter(Transaction.transaction_date >= filters.start_date)
-    if filters.end_date:
-        query = query.filter(Transaction.transaction_date <= filters.end_date)
-    # ... apply other filters
+    One pass over the filtered rows: GROUPING SETS returns a row per payment
+    type, location type and source plus the grand total row, and GROUPING()
+    says which set each row belongs to.
+    """
+    from sqlalchemy import func, text
     
-    # Get totals
-    totals = db.query(
-        func.count(Transaction.id).label("count"),
-        func.sum(Transaction.transaction_amount).label("amount"),
-        func.sum(Transaction.settle_amount).label("settle_amount")
-    ).filter(query.whereclause).first() if query.whereclause is not None else db.query(
+    query = db.query(
+        Transaction.payment_type,
+        Transaction.location_type,
+        Transaction.source,
+        func.grouping(Transaction.payment_type).label("g_payment"),
+        func.grouping(Transaction.location_type).label("g_location"),
+        func.grouping(Transaction.source).label("g_source"),
         func.count(Transaction.id).label("count"),
         func.sum(Transaction.transaction_amount).label("amount"),
-        func.sum(Transaction.settle_amount).label("settle_amount")
-    ).first()
+        func.sum(Transaction.settle_amount).label("settle_amount"),
+        func.min(Transaction.transaction_date).label("min_date"),
+        func.max(Transaction.transaction_date).label("max_date")
+    )
+    query = _filter_transactions(query, filters).group_by(
+        text("GROUPING SETS ((payment_type), (location_type), (source), ())")
+    )
     
-    # Group by payment type
+    totals = None
     by_payment = {}
-    payment_groups = db.query(
-        Transaction.payment_type,
-        func.sum(Transaction.transaction_amount).label("amount")
-    ).group_by(Transaction.payment_type).all()
-    for pg in payment_groups:
-        by_payment[pg.payment_type] = float(pg.amount or 0)
-    
-    # Group by location type
     by_location = {}
-    location_groups = db.query(
-        Transaction.location_type,
-        func.sum(Transaction.transaction_amount).label("amount")
-    ).group_by(Transaction.location_type).all()
-    for lg in location_groups:
-        by_location[lg.location_type] = float(lg.amount or 0)
-    
-    # Group by source
     by_source = {}
-    source_groups = db.query(
-        Transaction.source,
-        func.sum(Transaction.transaction_amount).label("amount")
-    ).group_by(Transaction.source).all()
-    for sg in source_groups:
-        by_source[sg.source] = float(sg.amount or 0)
-    
-    # Get date range
-    date_range = db.query(
-        func.min(Transaction.transaction_date).label("min_date"),
-        func.max(Transaction.transaction_date).label("max_date")
-    ).first()
+    for row in query.all():
+        if not row.g_payment:
+            by_payment[_enum_key(row.payment_type)] = float(row.amount or 0)
+        elif not row.g_location:
+            by_location[_enum_key(row.location_type)] = float(row.amount or 0)
+        elif not row.g_source:
+            by_source[_enum_key(row.source)] = float(row.amount or 0)
+        else:
+            totals = row
     
-    return TransactionSummary(
+    # Built from our own aggregates: hand orjson the dict directly rather than
+    # having FastAPI re-validate the model and run jsonable_encoder over it
+    summary = TransactionSummary.model_construct(
         total_count=totals.count or 0,
         total_amount=float(totals.amount or 0),
         total_settle_amount=float(totals.settle_amount or 0),
@@ -364,10 +391,98 @@ async def get_transaction_summary(
         by_location_type=by_location,
         by_source=by_source,
         date_range={
-            "start": date_range.min_date,
-            "end": date_range.max_date
+            "start": totals.min_date,
+            "end": totals.max_date
         }
     )
+    return ORJSONResponse(content=summary.model_dump())
+
+
+# ============= Revenue Summaries =============
+# app.v_daily_summary is an indexed view (scripts/create_daily_summary_view.sql):
+# one stored row per day/source/payment type/org code, maintained by SQL Server
+# on insert. Both endpoints pivot a few hundred of those rows instead of
+# scanning transactions. Enum columns hold member names; amounts are cents.
+DAILY_SUMMARY_SQL = """
+    SELECT summary_date, source, payment_type, org_code, total_cents, transaction_count
+    FROM app.v_daily_summary WITH (NOEXPAND)
+    WHERE summary_date >= :start_date AND summary_date < :end_date
+"""
+
+
+@router.get("/summary/daily", response_model=List[DailySummary])
+async def get_daily_summary(
+    start_date: datetime,
+    end_date: Optional[datetime] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Revenue per day by source and payment method (end date exclusive)
+    """
+    from sqlalchemy import text
+    
+    end_date = end_date or start_date + timedelta(days=1)
+    rows = db.execute(
+        text(DAILY_SUMMARY_SQL),
+        {"start_date": start_date.date(), "end_date": end_date.date()}
+    )
+    
+    days = {}
+    for row in rows:
+        day = days.get(row.summary_date)
+        if day is None:
+            day = days[row.summary_date] = DailySummary(
+                date=datetime.combine(row.summary_date, datetime.min.time()),
+                total_revenue=0.0, transaction_count=0,
+                by_source={}, by_payment_method={}
+            )
+        amount = row.total_cents / 100
+        source = DataSourceType[row.source].value
+        payment = PaymentType[row.payment_type].value
+        day.total_revenue += amount
+        day.transaction_count += row.transaction_count
+        day.by_source[source] = day.by_source.get(source, 0.0) + amount
+        day.by_payment_method[payment] = day.by_payment_method.get(payment, 0.0) + amount
+    
+    return [days[d] for d in sorted(days)]
+
+
+@router.get("/summary/monthly", response_model=List[MonthlySummary])
+async def get_monthly_summary(
+    year: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Revenue per month of a year by source and org code
+    """
+    from sqlalchemy import text
+    
+    rows = db.execute(
+        text(DAILY_SUMMARY_SQL),
+        {"start_date": datetime(year, 1, 1).date(), "end_date": datetime(year + 1, 1, 1).date()}
+    )
+    
+    months = {}
+    for row in rows:
+        month = months.get(row.summary_date.month)
+        if month is None:
+            month = months[row.summary_date.month] = MonthlySummary(
+                year=year, month=row.summary_date.month,
+                total_revenue=0.0, transaction_count=0,
+                by_source={}, by_org_code={}
+            )
+        amount = row.total_cents / 100
+        source = DataSourceType[row.source].value
+        # by_org_code is keyed by str; org_code is an int column (0 is a real code)
+        org_code = str(row.org_code) if row.org_code is not None else "unassigned"
+        month.total_revenue += amount
+        month.transaction_count += row.transaction_count
+        month.by_source[source] = month.by_source.get(source, 0.0) + amount
+        month.by_org_code[org_code] = month.by_org_code.get(org_code, 0.0) + amount
+    
+    return [months[m] for m in sorted(months)]
 
 
 # ============= Bulk Operations =============
@@ -6,10 +6,10 @@ from datetime import datetime
 import threading
 import queue
 import asyncio
-import json
-from starlette.responses import StreamingResponse
+import orjson
+from starlette.responses import StreamingResponse, Response
 
-from app.db.session import get_db, get_traffic_db
+from app.db.session import get_db, get_read_db, get_traffic_db
 from app.api.dependencies import get_current_active_user
 from app.models.database import User, UserRole, UploadedFile, ETLProcessingLog, DataSourceType
 from app.models.schemas import (
@@ -20,9 +20,16 @@ from app.models.schemas import (
 )
 from app.utils.etl_processor import ETLProcessor, DataLoader
 from app.utils import etl_cache
+from app.config import settings
 
 router = APIRouter()
 
+# uploaded_files.data_source_type holds enum NAMEs (older rows may hold values);
+# map either to the value FileStatusResponse expects, in SQL
+DATA_SOURCE_VALUE_SQL = "CASE uf.data_source_type {} ELSE uf.data_source_type END".format(
+    " ".join(f"WHEN '{m.name}' THEN '{m.value}'" for m in DataSourceType)
+)
+
 
 @router.get("/{file_id}/process-etl/stream")
 async def stream_process_etl(
@@ -70,6 +77,10 @@ async def stream_process_etl(
 
     def run_etl():
         try:
+            # No-op while the lookups are current; rebuilds them once expired
+            # or when the last build could not reach Traffic/OPMS
+            if settings.enable_etl_cache:
+                etl_cache.initialize_etl_cache(db, traffic_db)
             processor = ETLProcessor(db, traffic_db=traffic_db, progress_callback=progress_cb)
             if file_record.data_source_type == DataSourceType.COIN_COLLECTION:
                 result = processor.process_coin_collector(file_id)
@@ -100,16 +111,17 @@ async def stream_process_etl(
                 await asyncio.sleep(0.1)
                 continue
 
-            # Format as SSE data event (JSON payload)
+            # Format as SSE data event (JSON payload); orjson handles the
+            # datetimes/enums in progress payloads and returns bytes directly
             try:
-                data = json.dumps(item)
+                data = orjson.dumps(item)
             except Exception:
-                data = json.dumps({"event": "error", "message": "Failed to serialize progress payload"})
+                data = orjson.dumps({"event": "error", "message": "Failed to serialize progress payload"})
 
-            yield f"data: {data}\n\n"
+            yield b"data: " + data + b"\n\n"
 
         # Ensure final event
-        yield f'data: {json.dumps({"event": "complete"})}\n\n'
+        yield b'data: {"event": "complete"}\n\n'
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -123,7 +135,7 @@ async def get_files_status(
     status_filter: Optional[str] = None,  # 'complete', 'incomplete', 'failed', 'not_started'
     sort_by: str = "id",  # Column to sort by
     sort_order: str = "desc",  # 'asc' or 'desc'
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -187,12 +199,11 @@ async def get_files_status(
         uf.id,
         uf.original_filename,
         uf.file_size,
-        uf.data_source_type,
+        {data_source_value} AS data_source_type,
         uf.upload_date,
         uf.processed_at,
         uf.records_processed,
         uf.description,
-        uf.uploaded_by,
         CASE 
             WHEN MAX(CAST(uf.is_processed As INT)) = 1 AND max(uf.records_processed) = 0 THEN 'complete'
             WHEN uf.records_processed IS NULL THEN 'not_started'
@@ -219,14 +230,14 @@ async def get_files_status(
             THEN 1 ELSE 0 
         END AS needs_etl,
         */
-        CASE
+        CAST(CASE
 			WHEN MAX(CASE WHEN etl.status IN ('complete', 'completed') THEN 1 ELSE 0 END) = 0 THEN 1
 			ELSE 0
-		END As needs_etl,
-        CASE
+		END AS BIT) As needs_etl,
+        CAST(CASE
             WHEN uf.records_processed > 0 AND MAX(CASE WHEN etl.status = 'running' THEN 1 ELSE 0 END) = 0
             THEN 1 ELSE 0
-        END AS can_process
+        END AS BIT) AS can_process
     FROM app.uploaded_files uf
     LEFT JOIN app.etl_processing_log etl ON (uf.id = etl.source_file_id)
     WHERE 1=1
@@ -238,7 +249,9 @@ async def get_files_status(
     ORDER BY uf.{sort_col} {sort_dir}
     OFFSET :skip ROWS
     FETCH NEXT :limit ROWS ONLY
+    FOR JSON PATH, INCLUDE_NULL_VALUES
     """.format(
+        data_source_value=DATA_SOURCE_VALUE_SQL,
         where_fragment=where_fragment,
         having_fragment=having_fragment,
         sort_col=sort_by,
@@ -254,7 +267,8 @@ async def get_files_status(
         {"skip": skip, "limit": limit}
     )
     
-    rows = result.fetchall()
+    # SQL Server splits long FOR JSON output across several rows
+    items_json = "".join(row[0] for row in result) or "[]"
     
     # Get total count for pagination
     if having_clauses:
@@ -284,57 +298,16 @@ async def get_files_status(
     count_query = text(count_query_string)
     total = db.execute(count_query).scalar()
     
-    # Convert rows to response objects
-    items = []
-    for row in rows:
-        # Normalize data_source_type: DB may return enum NAME (e.g. 'PAYMENTS_INSIDER_PAYMENTS')
-        # or the enum value (e.g. 'pi_payments'). Pydantic expects the DataSourceType value.
-        dst = row.data_source_type
-        try:
-            if dst is None:
-                normalized_dst = None
-            elif isinstance(dst, DataSourceType):
-                normalized_dst = dst
-            elif isinstance(dst, str):
-                # If DB returned the enum member name, map via __members__
-                if dst in DataSourceType.__members__:
-                    normalized_dst = DataSourceType[dst]
-                else:
-                    # Otherwise assume it's the enum value
-                    normalized_dst = DataSourceType(dst)
-            else:
-                normalized_dst = DataSourceType(str(dst))
-        except Exception:
-            # Fallback: pass raw value (Pydantic will raise if invalid)
-            normalized_dst = dst
-
-        items.append(FileStatusResponse(
-            id=row.id,
-            original_filename=row.original_filename,
-            file_size=row.file_size,
-            data_source_type=normalized_dst,
-            upload_date=row.upload_date,
-            description=row.description,
-            processed_at=row.processed_at,
-            records_processed=row.records_processed,
-            status=row.status,
-            records_created=row.records_created,
-            records_failed=row.records_failed,
-            error_message=row.error_message,
-            percent_complete=row.percent_complete,
-            needs_etl=bool(row.needs_etl),
-            can_process=bool(row.can_process)
-        ))
-    
     total_pages = (total + limit - 1) // limit if limit > 0 else 0
     
-    return FileStatusListResponse(
-        total=total,
-        items=items,
-        page=skip // limit + 1 if limit > 0 else 1,
-        page_size=limit,
-        total_pages=total_pages
+    # Items arrive from SQL Server already in FileStatusResponse shape; splice
+    # them into the envelope rather than building a model per row
+    page = skip // limit + 1 if limit > 0 else 1
+    content = (
+        f'{{"total":{total},"items":{items_json},"page":{page},'
+        f'"page_size":{limit},"total_pages":{total_pages}}}'
     )
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("/{file_id}/load-to-staging", response_model=ProcessETLResponse)
@@ -384,8 +357,8 @@ async def load_file_to_staging(
                 detail=f"No loader available for data source type: {file_record.data_source_type}"
             )
         
-        # Load to staging
-        records_loaded = load_function(file_record.file_path, file_id)
+        # Load to staging (off the event loop; see uploads.upload_file)
+        records_loaded = await asyncio.to_thread(load_function, file_record.file_path, file_id)
         
         return ProcessETLResponse(
             success=True,
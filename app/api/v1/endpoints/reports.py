@@ -4,7 +4,7 @@ from sqlalchemy import text
 from typing import Optional
 from datetime import datetime
 
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.api.dependencies import get_current_active_user, require_role
 from app.models.database import User, UserRole
 
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/reports", tags=["reports"])
 async def settlement_report(
     start_date: Optional[str] = '2025-11-05',
     end_date: Optional[str] = '2025-11-05',
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.MANAGER, UserRole.ADMIN]))
 ):
     """Return aggregated settlement totals grouped by location_type, org_code and payment_type.
@@ -124,7 +124,7 @@ async def settlement_report(
 async def settle_by_source(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.MANAGER, UserRole.ADMIN]))
 ):
     """Return a pivoted table (daily rows) of counts by transaction source.
@@ -211,7 +211,7 @@ async def settle_by_source(
 async def settle_rollup_report(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.MANAGER, UserRole.ADMIN]))
 ):
     """Return hierarchical settlement report using ROLLUP for drill-down display.
@@ -311,7 +311,7 @@ async def settle_rollup_report(
 
 @router.get('/revenue/filters')
 async def revenue_filter_options(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.MANAGER, UserRole.ADMIN]))
 ):
     """Return distinct values for all filter dropdowns."""
@@ -356,7 +356,7 @@ async def revenue_report(
     device_type: Optional[str] = None,
     facility_type: Optional[str] = None,
     facility_name: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.MANAGER, UserRole.ADMIN]))
 ):
     """Return revenue data grouped by period with optional filters.
@@ -482,7 +482,7 @@ async def revenue_report(
 
 @router.get('/revenue-landing')
 async def revenue_landing_data(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role([UserRole.REVENUE, UserRole.MANAGER, UserRole.ADMIN]))
 ):
     """Return all data needed for the Revenue section landing page.
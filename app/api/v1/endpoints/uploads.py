@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, status, Form
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from typing import Optional
+import asyncio
 import hashlib
+import orjson
+from decimal import Decimal
 from pathlib import Path
 import os
 import shutil
 from datetime import datetime
-from app.db.session import get_db
-from app.models.database import User, UploadedFile, UserRole, DataSourceType
+from app.db.session import get_db, get_read_db
+from app.models.database import User, UploadedFile, UserRole, DataSourceType, STAGING_MODELS_BY_SOURCE
 from app.models.schemas import UploadedFileCreate, UploadedFileResponse, UploadedFileWithUser
 from app.api.dependencies import get_current_active_user, require_role
 from app.config import settings
@@ -18,7 +23,7 @@ from app.utils.functions import extract_date_from_filename
 router = APIRouter()
 
 
-async def calculate_upload_hash(file: UploadFile, algorithm: str = "sha256") -> str:
+async def calculate_upload_hash(file: UploadFile, algorithm: str = "sha256") -> bytes:
     """
     Calculate hash from FastAPI UploadFile object
     
@@ -27,18 +32,17 @@ async def calculate_upload_hash(file: UploadFile, algorithm: str = "sha256") ->
         algorithm: Hash algorithm to use
     
     Returns:
-        Hexadecimal hash string
+        Raw digest bytes (32 for sha256)
     """
-    hash_obj = hashlib.new(algorithm)
-    
-    # Read file in chunks
-    while chunk := await file.read(65536):
-        hash_obj.update(chunk)
+    # hashlib.file_digest hashes straight from the spooled file's buffer in
+    # C (OpenSSL, SHA-NI where available); run it off the event loop
+    await file.seek(0)
+    hash_obj = await asyncio.to_thread(hashlib.file_digest, file.file, algorithm)
     
     # Reset file pointer so it can be read again for saving
     await file.seek(0)
     
-    return hash_obj.hexdigest()
+    return hash_obj.digest()
 
 
 @router.post("/upload", response_model=UploadedFileResponse, status_code=status.HTTP_201_CREATED)
@@ -67,7 +71,9 @@ async def upload_file(
     file_hash = await calculate_upload_hash(file)
 
     # Check if file with this hash already exists
-    existing_file = db.query(UploadedFile).filter(
+    existing_file = db.query(UploadedFile).options(
+        selectinload(UploadedFile.uploader)
+    ).filter(
         UploadedFile.file_hash == file_hash
     ).first()
 
@@ -139,11 +145,13 @@ async def upload_file(
         # Get data from newly uploaded file -> need id
         uploaded_file_result = db.query(UploadedFile).filter(UploadedFile.original_filename == file.filename).first()
 
-        # Load data from file to staging tables
+        # Load data from file to staging tables. Parsing and cleaning the
+        # report is CPU-bound pandas work; run it in a worker thread so the
+        # event loop keeps serving other requests meanwhile
         data_loader = DataLoader(db, data_source_type)
         
         print('Beginning data load...')
-        data_loader.load(uploaded_file_record.file_path, uploaded_file_result.id)
+        await asyncio.to_thread(data_loader.load, uploaded_file_record.file_path, uploaded_file_result.id)
         print("Data load complete.")
         return uploaded_file_record
         
@@ -174,7 +182,7 @@ async def list_uploaded_files(
     """
     List uploaded files with optional filtering by data source type
     """
-    query = db.query(UploadedFile)
+    query = db.query(UploadedFile).options(selectinload(UploadedFile.uploader))
     
     # Filter by data source type if provided
     if data_source_type:
@@ -196,7 +204,9 @@ async def get_uploaded_file(
     """
     Get details of a specific uploaded file
     """
-    file_record = db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
+    file_record = db.query(UploadedFile).options(
+        selectinload(UploadedFile.uploader)
+    ).filter(UploadedFile.id == file_id).first()
     
     if not file_record:
         raise HTTPException(
@@ -207,6 +217,62 @@ async def get_uploaded_file(
     return file_record
 
 
+# Rows fetched from the driver per round trip while streaming an export
+STAGING_EXPORT_BATCH_SIZE = 1000
+
+
+def _json_default(value):
+    """orjson fallback for the money columns (Decimal); everything else is native"""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+@router.get("/uploads/{file_id}/staging")
+def export_staging_rows(
+    file_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """
+    Stream a file's staging rows as newline-delimited JSON (one row per line)
+    
+    Rows are fetched and written in batches of STAGING_EXPORT_BATCH_SIZE, so
+    memory stays flat and the first rows go out before the query finishes,
+    however large the file.
+    """
+    data_source_type = db.query(UploadedFile.data_source_type).filter(
+        UploadedFile.id == file_id
+    ).scalar()
+    if data_source_type is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+    
+    model = STAGING_MODELS_BY_SOURCE.get(data_source_type)
+    if model is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No staging table for data source type {data_source_type.value}"
+        )
+    
+    stmt = (
+        select(model.__table__)
+        .where(model.source_file_id == file_id)
+        .order_by(model.id)
+        .execution_options(stream_results=True, yield_per=STAGING_EXPORT_BATCH_SIZE)
+    )
+    
+    def generate():
+        for partition in db.execute(stmt).mappings().partitions():
+            yield b"".join(
+                orjson.dumps(dict(row), default=_json_default) + b"\n" for row in partition
+            )
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.delete("/uploads/{file_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_uploaded_file(
     file_id: int,
@@ -4,6 +4,7 @@ Provides CRUD operations for user accounts including password resets
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import List, Optional
@@ -12,7 +13,7 @@ from datetime import datetime
 from app.db.session import get_db
 from app.api.dependencies import require_role, get_current_active_user
 from app.models.database import User, UserRole
-from app.models.schemas import UserCreate, UserResponse, UserUpdate, PasswordReset
+from app.models.schemas import UserCreate, UserResponse, UserUpdate, PasswordReset, pydantic_from_row
 from app.utils.auth import get_password_hash
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -35,7 +36,7 @@ def validate_password(password: str) -> tuple[bool, str]:
     return True, ""
 
 
-@router.get("", response_model=List[UserResponse])
+@router.get("", response_model=List[UserResponse], response_class=ORJSONResponse)
 async def list_users(
     search: Optional[str] = None,
     role: Optional[str] = None,
@@ -51,8 +52,10 @@ async def list_users(
     - role: Filter by role
     - is_active: Filter by active status
     """
+    # Column names match UserResponse fields; role is the lowercase enum value
     query = """
-        SELECT employee_id, username, email, first_name, last_name, role, is_active, created_at 
+        SELECT employee_id AS id, username, email, first_name, last_name,
+               LOWER(role) AS role, CAST(is_active AS BIT) AS is_active, created_at
         FROM pt.employees 
         WHERE 1=1
     """
@@ -80,19 +83,15 @@ async def list_users(
     
     results = db.execute(text(query), params).fetchall()
     
-    return [
-        UserResponse(
-            id=r.employee_id,
-            username=r.username,
-            email=r.email,
-            first_name=r.first_name,
-            last_name=r.last_name,
-            role=UserRole(r.role.lower()) if isinstance(r.role, str) else r.role,
-            is_active=bool(r.is_active),
-            created_at=r.created_at
-        )
+    # Rows come from our own table: build them without validation and return
+    # the JSON directly, so response_model (kept for the OpenAPI schema) doesn't
+    # validate every row either. role goes through UserRole so an unknown
+    # value still fails, and is stored as its value as use_enum_values would.
+    users = [
+        pydantic_from_row(UserResponse, r._mapping, role=UserRole(r.role).value, is_active=bool(r.is_active))
         for r in results
     ]
+    return ORJSONResponse(content=[user.model_dump(mode="json") for user in users])
 
 
 @router.get("/{user_id}", response_model=UserResponse)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from typing import List
 import os
 
 
@@ -15,13 +16,31 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = Field(default=480, alias="ACCESS_TOKEN_EXPIRE_MINUTES")
     secret_password: str = Field(default="", alias="SECRET_PASSWORD")
 
+    # Database connection pool settings (applied to every engine in app.db.session)
+    db_pool_size: int = Field(default=20, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, alias="DB_MAX_OVERFLOW")
+    db_pool_recycle: int = Field(default=3600, alias="DB_POOL_RECYCLE")
+    db_read_replica: bool = Field(default=False, alias="DB_READ_REPLICA")  # Route get_read_db to a readable secondary
+
     # File upload settings
     upload_dir: str = Field(default="./uploads", alias="UPLOAD_DIR")
     max_upload_size_mb: int = Field(default=50, alias="MAX_UPLOAD_SIZE_MB")
     
     # Application settings
     environment: str = Field(default="development", alias="ENVIRONMENT")
-    
+    debug: bool = Field(default=False, alias="DEBUG")  # Re-render page templates per request
+    enable_etl_cache: bool = Field(default=False, alias="ENABLE_ETL_CACHE")  # Load ETL lookup caches at startup
+    etl_cache_file: str = Field(
+        default=os.path.join(os.path.expanduser("~"), ".cache", "parking_division", "etl_cache.json"),
+        alias="ETL_CACHE_FILE"
+    )  # JSON snapshot of the built ETL lookups, reused across restarts; its directory must be private (0700)
+    etl_cache_ttl_hours: float = Field(default=24, alias="ETL_CACHE_TTL_HOURS")  # 0 disables the snapshot and expiry
+    etl_cache_retry_seconds: float = Field(default=60, alias="ETL_CACHE_RETRY_SECONDS")  # Retry delay after a failed lookup load
+    cors_origins: List[str] = Field(
+        default=["http://localhost:8001", "http://127.0.0.1:8001"],
+        alias="CORS_ORIGINS"
+    )  # JSON list in the environment, e.g. '["https://parking.example.org"]'
+
     class Config:
         env_file = ".env"
         case_sensitive = False
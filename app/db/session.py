@@ -4,12 +4,22 @@ from sqlalchemy import MetaData, create_engine
 from sqlalchemy.orm import sessionmaker, Session
 #from sqlalchemy.engine import URL
 from typing import Generator
+from app.config import settings
 #from app.models import database
 
 # Import your existing db_manager
 #from db_manager import ConnectionManager
 #cnxn = ConnectionManager()
 
+# Pool settings shared by every engine. pool_pre_ping replaces connections the
+# SQL Server side dropped while idle; pool_recycle retires them before that happens.
+engine_kwargs = dict(
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,
+    pool_recycle=settings.db_pool_recycle,
+)
+
 
 # Get the engine using your existing connection system
 #engine = cnxn.get_engine('PUReporting')
@@ -20,7 +30,18 @@ connection_string = (
     "?driver=ODBC+Driver+17+for+SQL+Server"
     "&trusted_connection=yes"
 )
-engine = create_engine(connection_string)
+# fast_executemany: pyodbc sends every Core executemany (and pandas to_sql) as
+# one parameter array per batch instead of one round trip per row
+engine = create_engine(connection_string, fast_executemany=True, **engine_kwargs)
+
+# Read-only engine for analytics/list endpoints. With DB_READ_REPLICA on, the
+# ApplicationIntent=ReadOnly keyword lets the availability group listener
+# route these connections to a readable secondary, keeping report scans off
+# the primary that ETL writes to. Off, it is simply the primary engine.
+if settings.db_read_replica:
+    read_engine = create_engine(connection_string + "&ApplicationIntent=ReadOnly", **engine_kwargs)
+else:
+    read_engine = engine
 
 
 # Additional engine for external/secondary data sources (Traffic)
@@ -33,7 +54,7 @@ connection_string = (
     "?driver=ODBC+Driver+17+for+SQL+Server"
     "&trusted_connection=yes"
 )
-traffic_engine = create_engine(connection_string)
+traffic_engine = create_engine(connection_string, **engine_kwargs)
 
 # Connect to AIMS database using ConnectionManager
 # This is used for the Enforcement stats endpoint which queries AIMS directly.
@@ -44,10 +65,11 @@ connection_string = (
     f"mssql+pyodbc://AIMS_RW:{pw3}@{server3}/{database3}"
     "?driver=ODBC+Driver+17+for+SQL+Server"
 )
-aims_engine = create_engine(connection_string)
+aims_engine = create_engine(connection_string, **engine_kwargs)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocalReadOnly = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 SessionLocalTraffic = sessionmaker(autocommit=False, autoflush=False, bind=traffic_engine)
 SessionLocalAims = sessionmaker(autocommit=False, autoflush=False, bind=aims_engine)
 
@@ -74,6 +96,21 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_read_db() -> Generator[Session, None, None]:
+    """
+    Dependency that provides a session for read-only queries.
+
+    Bound to the readable secondary when DB_READ_REPLICA is enabled, so only
+    use it for endpoints that never write (reports, summaries, lists). Data
+    can trail the primary by the replication delay.
+    """
+    db = SessionLocalReadOnly()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def get_traffic_db() -> Generator[Session, None, None]:
     """
     Dependency that provides a database session bound to the Traffic engine.
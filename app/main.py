@@ -2,47 +2,87 @@ from datetime import datetime, timedelta
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, FileResponse, PlainTextResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
+from fastapi.middleware.gzip import GZipMiddleware
+from sqlalchemy import text, bindparam
 from app.api.v1.api import api_router
 from app.db.session import init_db, SessionLocalTraffic, SessionLocal
 from app.config import settings
 from app.schema_viz.webapp import app as schema_viz_app
-#from app.utils import etl_cache
+from app.utils import etl_cache
 from app.utils.etl_processor import ETLProcessor
 import os
+from pathlib import Path
+import queue
+import asyncio
 import logging
+import logging.handlers
 
 logger = logging.getLogger(__name__)
 
-# Ensure basic logging is configured so logger.info/DEBUG messages appear
-if not logging.getLogger().handlers:
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
-    )
+# Package paths, resolved once at import
+_HERE = Path(__file__).resolve().parent
+STATIC_DIR = _HERE / "static"
+TEMPLATES_DIR = _HERE / "templates"
+
+log_listener = None
+
+
+def _configure_logging():
+    """Configure root and uvicorn logging once per worker, at startup rather than import.
+
+    Records go through a QueueHandler; a QueueListener thread does the actual
+    stream I/O so logging calls never block the event loop.
+    """
+    global log_listener
+    if not logging.getLogger().handlers:
+        log_queue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        logging.basicConfig(
+            level=logging.INFO,
+            handlers=[logging.handlers.QueueHandler(log_queue)]
+        )
+        log_listener.start()
+
+    # Make sure uvicorn loggers are at INFO level as well
+    logging.getLogger("uvicorn.error").setLevel(logging.INFO)
+    logging.getLogger("uvicorn.access").setLevel(logging.INFO)
 
-# Make sure uvicorn loggers are at INFO level as well
-logging.getLogger("uvicorn.error").setLevel(logging.INFO)
-logging.getLogger("uvicorn.access").setLevel(logging.INFO)
 
 # Create FastAPI application
 app = FastAPI(
     title="Parking Division Operations & Revenue Tracking API",
     description="API for tracking parking division operations, revenue, and data uploads",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware configuration
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure this appropriately for production
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
+
+class GZipExceptEventStreams(GZipMiddleware):
+    """GZip responses, except server-sent event streams which must reach the client per event"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress page HTML and JSON payloads; the report pages compress 5-10x
+app.add_middleware(GZipExceptEventStreams, minimum_size=512, compresslevel=5)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -51,62 +91,176 @@ app.include_router(api_router, prefix="/api/v1")
 app.mount("/admin/schema", schema_viz_app)
 
 # Serve static files (for the web interface)
-static_dir = os.path.join(os.path.dirname(__file__), "static")
-os.makedirs(static_dir, exist_ok=True)
-app.mount("/static", StaticFiles(directory=static_dir), name="static")
+if not STATIC_DIR.is_dir():
+    STATIC_DIR.mkdir(parents=True)
+app.mount("/static", StaticFiles(directory=str(STATIC_DIR), check_dir=False, html=True), name="static")
 
 # Setup templates directory
-templates_dir = os.path.join(os.path.dirname(__file__), "templates")
-templates = Jinja2Templates(directory=templates_dir)
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+
+# Page templates take no per-request context, so each one is rendered once at
+# startup and served from memory as bytes.
+PAGE_TEMPLATES = [
+    "dashboard.html",
+    "revenue_landing.html", "upload.html", "file_status.html", "cash_variance.html",
+    "reports.html", "settle_report.html", "settle_by_source.html", "revenue_report.html",
+    "operations_landing.html", "schedule_manager.html", "schedule_editor.html",
+    "schedule_view.html", "time_off_requests.html", "special_events.html",
+    "cityworks_landing.html", "cityworks.html", "cityworks_detail.html",
+    "enforcement_landing.html", "admin_landing.html", "admin.html", "tdm_landing.html",
+    "analytics_landing.html",
+]
+app.state.static_html = {}
+
+
+def _render_static_pages():
+    """Render every page template once and cache the encoded HTML on app.state"""
+    app.state.static_html = {
+        name: templates.get_template(name).render().encode("utf-8")
+        for name in PAGE_TEMPLATES
+    }
+
+
+def _page(name: str) -> HTMLResponse:
+    """Return a pre-rendered page.
+
+    In debug mode the template is rendered on every request instead, so edits
+    show up without a restart (Jinja's auto_reload picks up mtime changes).
+    """
+    if settings.debug or name not in app.state.static_html:
+        return HTMLResponse(content=templates.get_template(name).render())
+    return HTMLResponse(content=app.state.static_html[name])
+
+
+def _static_page(name: str) -> FileResponse:
+    """Serve a template that contains no Jinja markup straight from disk"""
+    return FileResponse(TEMPLATES_DIR / name, media_type="text/html")
+
+
+# fact_transaction.staging_table -> ETLProcessor method that loads a day of it.
+# Checked on every startup for yesterday's date.
+STARTUP_ETL_SOURCES = {
+    "zms_cash_regular": "process_zms_cash",
+}
+# _seed_etl steps that failed on this startup; /readyz reports 503 while any are listed
+app.state.startup_etl_errors = []
+
+
+def _seed_etl():
+    """Build lookup caches and make sure yesterday's ZMS cash has been loaded.
+
+    Runs in a worker thread after startup so the server can answer liveness
+    probes (and serve pages) while the ETL bootstrap is still working. Each
+    step logs its own failure and records it in app.state.startup_etl_errors
+    so one failed step doesn't skip the rest.
+    """
+    # Build the Traffic/OPMS lookup caches used by the ETL (opt-in, see ENABLE_ETL_CACHE).
+    # A failure here must not stop the ZMS bootstrap below; the streaming ETL
+    # retries the build before each run.
+    if settings.enable_etl_cache:
+        try:
+            with SessionLocal() as primary_db, SessionLocalTraffic() as traffic_db:
+                etl_cache.initialize_etl_cache(primary_db, traffic_db)
+        except Exception as e:
+            logger.error(f"Error initializing ETL lookup caches: {e}", exc_info=True)
+            app.state.startup_etl_errors.append("lookup caches")
+
+    # Keep an empty monthly partition ahead of incoming transactions so month
+    # boundaries never split a populated partition (no-op until
+    # scripts/partition_transactions_by_month.sql has been applied)
+    try:
+        with SessionLocal() as primary_db:
+            primary_db.execute(text(
+                "IF OBJECT_ID('app.create_next_month_partition', 'P') IS NOT NULL "
+                "EXEC app.create_next_month_partition"
+            ))
+            primary_db.commit()
+    except Exception as e:
+        logger.error(f"Error creating next transactions partition: {e}", exc_info=True)
+        app.state.startup_etl_errors.append("next partition")
+
+    # Load yesterday's data for each STARTUP_ETL_SOURCES entry not already in fact_transaction
+    try:
+        with SessionLocal() as primary_db:
+            # Bind as a date so SQL Server compares settle_date without an implicit conversion
+            yesterday_date = (datetime.now() - timedelta(days=1)).date()
+            # Count what is already loaded for every startup source in one round trip
+            result = primary_db.execute(
+                text("""
+                    SELECT staging_table, count(*) FROM PUReporting.app.fact_transaction
+                    WHERE staging_table IN :staging_tables
+                    AND settle_date = :process_date
+                    GROUP BY staging_table
+                    """).bindparams(bindparam("staging_tables", expanding=True)),
+                {"staging_tables": list(STARTUP_ETL_SOURCES), "process_date": yesterday_date}
+            )
+            record_counts = {staging_table: count for staging_table, count in result}
+
+            processor = None
+            for staging_table, method_name in STARTUP_ETL_SOURCES.items():
+                if record_counts.get(staging_table):
+                    logger.info(f"{staging_table} data already processed for {yesterday_date}")
+                    continue
+                processor = processor or ETLProcessor(db = primary_db)
+                success = getattr(processor, method_name)(process_date=yesterday_date)
+                logger.info(f"Processed {success['records_processed']} records for {staging_table} with {success['records_failed']} failures.")
+
+    except Exception as e:
+        logger.error(f"Error during startup ETL: {e}", exc_info=True)
+        app.state.startup_etl_errors.append("startup sources")
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and ETL caches on startup"""
+    _configure_logging()
+    _render_static_pages()
     init_db()
-    print("Database initialized successfully")
-    
-    # Initialize ETL lookup caches
-    try:
-        # Open primary and traffic DB sessions and provide them to cache initializer
-        #traffic_db = SessionLocalTraffic()
-        primary_db = SessionLocal()
-        try:
-            yesterday_date = datetime.strftime(datetime.now() - timedelta(days=1), '%Y-%m-%d')
-            # Check if ETL cache for ZMS Cash Regular data is populated; if not, process it
-            result = primary_db.execute(text("""
-                                    SELECT count(*) FROM PUReporting.app.fact_transaction
-                                    WHERE staging_table = 'zms_cash_regular'
-                                    AND settle_date = :process_date
-                                    """), {"process_date": yesterday_date})
-            record_count = result.scalar()
-            if record_count and record_count > 0:
-                print(f"ZMS Cash Regular data already processed for {yesterday_date}")
-            else:
-                processor = ETLProcessor(db = primary_db)
-                success = processor.process_zms_cash(process_date=yesterday_date)
-                print(f"Processed {success['records_processed']} records for zms_cash_regular with {success['records_failed']} failures.")
-
-        finally:
-            # Ensure both sessions are closed
-            #traffic_db.close()
-            primary_db.close()
-        
-    except Exception as e:
-        logger.error(f"Error during ETL cache initialization: {e}", exc_info=True)
-        print(f"Warning: Could not initialize ETL caches: {e}")
+    logger.info("Database initialized successfully")
+
+    app.state.startup_etl_errors = []
+    app.state.etl_task = asyncio.create_task(asyncio.to_thread(_seed_etl))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush any queued log records before the worker exits"""
+    if log_listener is not None:
+        log_listener.stop()
+
+
+# ── Probes ───────────────────────────────────────────────────────────────────
+
+@app.get("/healthz", response_class=PlainTextResponse, include_in_schema=False)
+async def healthz():
+    """Liveness probe – no DB or template work"""
+    return PlainTextResponse("ok")
+
+
+@app.get("/readyz", response_class=PlainTextResponse, include_in_schema=False)
+async def readyz():
+    """Readiness probe – 503 until the startup ETL bootstrap has finished, and
+    after it if any of its steps failed"""
+    etl_task = getattr(app.state, "etl_task", None)
+    if etl_task is None or not etl_task.done():
+        return PlainTextResponse("warming up", status_code=503)
+    if app.state.startup_etl_errors:
+        return PlainTextResponse(
+            "startup ETL failed: " + ", ".join(app.state.startup_etl_errors), status_code=503
+        )
+    return PlainTextResponse("ok")
 
 
 @app.get("/")
 async def root(request: Request):
     """Serve the login page"""
-    return templates.TemplateResponse(context={"request": request}, name="index.html")
+    return _static_page("index.html")
 
 
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard_page(request: Request):
     """Main dashboard – post-login hub"""
-    return templates.TemplateResponse(name="dashboard.html", context={"request": request})
+    return _page("dashboard.html")
 
 
 # ── Revenue Section ──────────────────────────────────────────────────────────
@@ -114,42 +268,42 @@ async def dashboard_page(request: Request):
 @app.get("/revenue", response_class=HTMLResponse)
 async def revenue_landing_page(request: Request):
     """Revenue section landing page"""
-    return templates.TemplateResponse(name="revenue_landing.html", context={"request": request})
+    return _page("revenue_landing.html")
 
 @app.get("/revenue/upload", response_class=HTMLResponse)
 async def upload_page(request: Request):
     """File upload page"""
-    return templates.TemplateResponse(name="upload.html", context={"request": request})
+    return _page("upload.html")
 
 @app.get("/revenue/files/status", response_class=HTMLResponse)
 async def file_status_page(request: Request):
     """File status dashboard"""
-    return templates.TemplateResponse(name="file_status.html", context={"request": request})
+    return _page("file_status.html")
 
 @app.get("/revenue/cash-variance", response_class=HTMLResponse)
 async def cash_variance_page(request: Request):
     """Cash variance entry page"""
-    return templates.TemplateResponse(name="cash_variance.html", context={"request": request})
+    return _page("cash_variance.html")
 
 @app.get("/revenue/reports", response_class=HTMLResponse)
 async def reports_page(request: Request):
     """Reports hub"""
-    return templates.TemplateResponse(name="reports.html", context={"request": request})
+    return _page("reports.html")
 
 @app.get("/revenue/reports/settle", response_class=HTMLResponse)
 async def settle_report_page(request: Request):
     """Settlement report"""
-    return templates.TemplateResponse(name="settle_report.html", context={"request": request})
+    return _page("settle_report.html")
 
 @app.get("/revenue/reports/sources", response_class=HTMLResponse)
 async def settle_by_source_page(request: Request):
     """Settled-by-source pivot report"""
-    return templates.TemplateResponse(name="settle_by_source.html", context={"request": request})
+    return _page("settle_by_source.html")
 
 @app.get("/revenue/reports/revenue", response_class=HTMLResponse)
 async def revenue_report_page(request: Request):
     """Revenue by period report"""
-    return templates.TemplateResponse(name="revenue_report.html", context={"request": request})
+    return _page("revenue_report.html")
 
 
 # ── Operations Section ───────────────────────────────────────────────────────
@@ -157,32 +311,32 @@ async def revenue_report_page(request: Request):
 @app.get("/operations", response_class=HTMLResponse)
 async def operations_landing_page(request: Request):
     """Operations section landing page"""
-    return templates.TemplateResponse(name="operations_landing.html", context={"request": request})
+    return _page("operations_landing.html")
 
 @app.get("/operations/schedule", response_class=HTMLResponse)
 async def schedule_manager_page(request: Request):
     """Schedule week manager — select or create a week"""
-    return templates.TemplateResponse(name="schedule_manager.html", context={"request": request})
+    return _page("schedule_manager.html")
 
 @app.get("/operations/schedule/edit", response_class=HTMLResponse)
 async def schedule_editor_page(request: Request):
     """Schedule editor — define shifts and manage assignments for a week"""
-    return templates.TemplateResponse(name="schedule_editor.html", context={"request": request})
+    return _page("schedule_editor.html")
 
 @app.get("/operations/schedule/view", response_class=HTMLResponse)
 async def schedule_view_page(request: Request):
     """Personal schedule viewer — employee looks up their own (or another's) schedule"""
-    return templates.TemplateResponse(name="schedule_view.html", context={"request": request})
+    return _page("schedule_view.html")
 
 @app.get("/operations/time-off", response_class=HTMLResponse)
 async def time_off_page(request: Request):
     """Time-off request management — submit and review requests"""
-    return templates.TemplateResponse(name="time_off_requests.html", context={"request": request})
+    return _page("time_off_requests.html")
 
 @app.get("/operations/special-events", response_class=HTMLResponse)
 async def special_events_page(request: Request):
     """Special events — log city events that affect parking operations"""
-    return templates.TemplateResponse(name="special_events.html", context={"request": request})
+    return _page("special_events.html")
 
 
 # ── Cityworks Section ────────────────────────────────────────────────────────
@@ -190,17 +344,17 @@ async def special_events_page(request: Request):
 @app.get("/cityworks", response_class=HTMLResponse)
 async def cityworks_landing_page(request: Request):
     """Cityworks section landing page"""
-    return templates.TemplateResponse(name="cityworks_landing.html", context={"request": request})
+    return _page("cityworks_landing.html")
 
 @app.get("/cityworks/work-orders", response_class=HTMLResponse)
 async def cityworks_work_orders_page(request: Request):
     """Cityworks work orders list"""
-    return templates.TemplateResponse(name="cityworks.html", context={"request": request})
+    return _page("cityworks.html")
 
 @app.get("/cityworks/work-orders/detail", response_class=HTMLResponse)
 async def cityworks_detail_page(request: Request):
     """Cityworks work order detail/processing"""
-    return templates.TemplateResponse(name="cityworks_detail.html", context={"request": request})
+    return _page("cityworks_detail.html")
 
 
 # ── Enforcement Section ──────────────────────────────────────────────────────
@@ -208,7 +362,7 @@ async def cityworks_detail_page(request: Request):
 @app.get("/enforcement", response_class=HTMLResponse)
 async def enforcement_landing_page(request: Request):
     """Enforcement section landing page"""
-    return templates.TemplateResponse(name="enforcement_landing.html", context={"request": request})
+    return _page("enforcement_landing.html")
 
 
 # ── Admin Section ────────────────────────────────────────────────────────────
@@ -216,12 +370,12 @@ async def enforcement_landing_page(request: Request):
 @app.get("/admin", response_class=HTMLResponse)
 async def admin_landing_page(request: Request):
     """Admin section landing page"""
-    return templates.TemplateResponse(name="admin_landing.html", context={"request": request})
+    return _page("admin_landing.html")
 
 @app.get("/admin/config", response_class=HTMLResponse)
 async def admin_config_page(request: Request):
     """Admin configuration page"""
-    return templates.TemplateResponse(name="admin.html", context={"request": request})
+    return _page("admin.html")
 
 
 # ── TDM Section ──────────────────────────────────────────────────────────────
@@ -229,7 +383,7 @@ async def admin_config_page(request: Request):
 @app.get("/tdm", response_class=HTMLResponse)
 async def tdm_landing_page(request: Request):
     """TDM section landing page"""
-    return templates.TemplateResponse(name="tdm_landing.html", context={"request": request})
+    return _page("tdm_landing.html")
 
 
 # ── Data & Analytics Section ─────────────────────────────────────────────────
@@ -237,17 +391,17 @@ async def tdm_landing_page(request: Request):
 @app.get("/analytics", response_class=HTMLResponse)
 async def analytics_landing_page(request: Request):
     """Data & Analytics section landing page"""
-    return templates.TemplateResponse(name="analytics_landing.html", context={"request": request})
+    return _page("analytics_landing.html")
 
 @app.get("/analytics/efficiency-gains", response_class=HTMLResponse)
 async def analytics_efficiency_gains(request: Request):
     """Parking Division Efficiency Gains report"""
-    return templates.TemplateResponse(name="parking_division_efficiency_gains_v3.html", context={"request": request})
+    return _static_page("parking_division_efficiency_gains_v3.html")
 
 @app.get("/analytics/gis-capacity", response_class=HTMLResponse)
 async def analytics_gis_capacity(request: Request):
     """GIS & Cityworks Capacity Story report"""
-    return templates.TemplateResponse(name="gis_cityworks_capacity_story_v3.html", context={"request": request})
+    return _static_page("gis_cityworks_capacity_story_v3.html")
 
 
 if __name__ == "__main__":
@@ -1,37 +1,140 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Text, Numeric, JSON, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, SmallInteger, String, CHAR, DateTime, Date, Time, Boolean, ForeignKey, Enum, Text, Numeric, LargeBinary, JSON, Float, Computed, cast, try_cast, insert, select, Index, CheckConstraint
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
+from sqlalchemy.types import TypeDecorator
 from app.db.session import Base
 import enum
-from datetime import datetime
+import re
+from datetime import datetime, time as dt_time
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from collections import namedtuple
+from itertools import chain, islice
 
 
 
+# Fallback for time strings the fast paths below don't recognize
+# (e.g. "9 AM", "9:05PM "): hour, optional minute/second, optional AM/PM
+_TIME_RE = re.compile(r"^(\d{1,2})(?::(\d{2})(?::(\d{2}))?)?\s*([AaPp][Mm])?$")
+
+
+def _match_time(t):
+    m = _TIME_RE.match(t)
+    if not m:
+        return None
+    hour, minute, second, suffix = m.groups()
+    hour = int(hour)
+    if suffix:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if suffix.upper() == 'PM' else 0)
+    try:
+        return dt_time(hour, int(minute or 0), int(second or 0))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=8192)
 def parse_time_string(t):
+    """Parse a staging-file time string into a datetime.time, or None.
+
+    Supported formats (add more if needed):
+        9:05:32 AM, 9:05 AM   (12-hour, optional seconds)
+        14:37:55, 14:37       (24-hour, optional seconds)
+        143755, 1437          (24-hour, no separators)
+
+    Fields are sliced and converted with int() directly; this runs once per
+    staging row, where strptime's format/locale handling dominates. Anything
+    else goes through the precompiled _TIME_RE once. Results are memoized:
+    a batch repeats the same few thousand time values.
+    """
     if not t:
         return None
     
     t = t.strip()
 
-    # Supported formats (add more if needed)
-    formats = [
-        "%I:%M:%S %p",  # 9:05:32 AM
-        "%I:%M %p",     # 9:05 AM
-        "%H:%M:%S",     # 14:37:55
-        "%H:%M",        # 14:37
-        "%H%M%S",       # 143755
-        "%H%M",         # 1437
-    ]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(t, fmt).time()
-        except ValueError:
-            continue
-
-    # Fallback: can't parse
-    return None
+    try:
+        suffix = t[-2:].upper()
+        if suffix in ('AM', 'PM'):
+            parts = t[:-2].rstrip().split(':')
+            if len(parts) not in (2, 3):
+                return _match_time(t)
+            hour = int(parts[0])
+            if not 1 <= hour <= 12:
+                return None
+            hour = hour % 12 + (12 if suffix == 'PM' else 0)
+        elif ':' in t:
+            parts = t.split(':')
+            if len(parts) not in (2, 3):
+                return None
+            hour = int(parts[0])
+        elif len(t) in (4, 6) and t.isdigit():
+            parts = [t[0:2], t[2:4], t[4:6]] if len(t) == 6 else [t[0:2], t[2:4]]
+            hour = int(parts[0])
+        else:
+            return _match_time(t)
+
+        minute = int(parts[1])
+        second = int(parts[2]) if len(parts) == 3 else 0
+        return dt_time(hour, minute, second)
+    except (ValueError, IndexError):
+        # Fallback: can't parse
+        return None
+
+
+def combine_date_time_sql(date_col, time_col):
+    """SQL counterpart of parse_time_string + datetime.combine for hybrid expressions.
+
+    TRY_CAST yields NULL for time strings SQL Server can't read, matching the
+    Python side returning None.
+    """
+    return try_cast(func.concat(cast(date_col, Date), ' ', time_col), DateTime)
+
+
+CENT = Decimal("0.01")
+
+
+class MoneyCents(TypeDecorator):
+    """Dollar amount stored as a BIGINT number of cents.
+
+    Python code keeps reading and writing Decimal dollars; the database column
+    is an 8-byte integer instead of a 9-byte DECIMAL(10,2), and SUMs run on
+    integers. BIGINT rather than INT because SQL Server types SUM(int) as int,
+    which would overflow past $21.4M in a summary. Raw SQL that reads the
+    column must divide by 100.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int((Decimal(str(value)).quantize(CENT, ROUND_HALF_UP) * 100).to_integral_value())
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(value).scaleb(-2)
+
+
+def string_enum(enum_class, by_value=False):
+    """Enum column stored as plain VARCHAR(32), with no CHECK constraint.
+
+    The fixed length means adding a member never changes the column DDL.
+    Bound strings are still validated against the members in Python.
+    Columns store member names unless by_value is set; use that for tables
+    that raw SQL writes with `.value` (e.g. cash_variance.bag_type).
+    """
+    return Enum(
+        enum_class,
+        native_enum=False,
+        create_constraint=False,
+        length=32,
+        validate_strings=True,
+        values_callable=(lambda e: [m.value for m in e]) if by_value else None,
+    )
+
 
 class UserRole(str, enum.Enum):
     """User role enumeration"""
@@ -60,18 +163,29 @@ class PaymentType(str, enum.Enum):
     """Payment type enumeration"""
     VISA = "visa"
     MASTERCARD = "mastercard"
-    MC = 'mastercard'
     AMEX = "amex"
     CHECK = "check"
     DEBIT = "debit"
     DISCOVER = "discover"
-    DISC = 'discover'
     CASH = "cash"
     MOBILE = "mobile"
     PARK_SMARTER = 'park_smarter'
     TEXT_TO_PAY = 'text_to_pay'
-    TEXT = 'text'
-    OTHER = "other"  
+    OTHER = "other"
+
+    @classmethod
+    def _missing_(cls, value):
+        """Resolve source-report spellings (e.g. 'MC', 'Text') to a canonical member"""
+        return _PAYMENT_TYPE_ALIASES.get(str(value).strip().lower())
+
+
+_PAYMENT_TYPE_ALIASES = {
+    "mc": PaymentType.MASTERCARD,
+    "disc": PaymentType.DISCOVER,
+    "text": PaymentType.TEXT_TO_PAY,
+    **{m.value: m for m in PaymentType},
+}
+
 
 class BagType(str, enum.Enum):
     """Bag type enumeration for cash variance entries"""
@@ -111,7 +225,7 @@ class User(Base):
     last_name = Column(String(50))
     full_name = Column(String(100))
     hashed_password = Column(String(255), nullable=False)
-    role = Column(Enum(UserRole), nullable=False, default=UserRole.VIEWER)
+    role = Column(string_enum(UserRole, by_value=True), nullable=False, default=UserRole.VIEWER)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
@@ -224,33 +338,51 @@ class UploadedFile(Base):
     Add them back once all staging models are properly defined.
     """
     __tablename__ = "uploaded_files"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (
+        # Upload/status dashboards: filter by source (and processed flag),
+        # newest first; also serves plain data_source_type lookups
+        Index("ix_uploaded_files_dashboard", "data_source_type", "is_processed", text("upload_date DESC")),
+        # Files still waiting on the ETL
+        Index("ix_uploaded_files_unprocessed", "id", mssql_where=text("is_processed = 0")),
+        # processing_errors is NVARCHAR(MAX) JSON (SQL Server has no binary JSON
+        # type); guaranteeing it parses lets JSON_VALUE/OPENJSON run without
+        # TRY_ guards, and a JSON_VALUE computed column can be indexed if the
+        # admin UI ever filters by error type
+        CheckConstraint("processing_errors IS NULL OR ISJSON(processing_errors) = 1",
+                        name="ck_uploaded_files_processing_errors_json"),
+        {"schema": "app"},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
     original_filename = Column(String(255), nullable=False)
     file_path = Column(String(500), nullable=False)
     file_size = Column(Integer, nullable=False)
-    file_hash = Column(String(64), unique=True, index=True)
+    file_hash = Column(LargeBinary(32), unique=True, index=True)  # Raw SHA-256 digest
     
     # Data source type
-    data_source_type = Column(Enum(DataSourceType), nullable=False, index=True)
+    data_source_type = Column(string_enum(DataSourceType), nullable=False)
     
     # Foreign key to pt.employees instead of app.users
     uploaded_by = Column(Integer, ForeignKey("pt.employees.employee_id"), nullable=False)
     
+    # Read by UploadedFileResponse, so it loads with the row (deferring it would
+    # lazy-load one SELECT per file when a list is serialized)
     description = Column(Text)
     upload_date = Column(DateTime(timezone=True), server_default=func.now())
     is_processed = Column(Boolean, default=False, nullable=False)
     processed_at = Column(DateTime(timezone=True))
     records_processed = Column(Integer)
-    processing_errors = Column(JSON)  # Store any errors encountered
+    processing_errors = deferred(Column(JSON))  # Errors encountered; no response schema reads it, so loaded only on access
     
     # Relationship to Employee (aliased as User)
     # Define the relationship HERE, not in Employee class
+    # raise_on_sql: callers must selectinload(UploadedFile.uploader) so a
+    # list of files can't lazy-load one employee per row
     uploader = relationship("Employee", 
                            foreign_keys=[uploaded_by],
-                           backref="uploaded_files")
+                           backref="uploaded_files",
+                           lazy="raise_on_sql")
     
     @property
     def uploaded_by_user(self):
@@ -264,20 +396,202 @@ class UploadedFile(Base):
         """
         return self.uploader
     
-    windcave_records = relationship("WindcaveStaging", back_populates="source_file")
-    payments_insider_sales_records = relationship("PaymentsInsiderSalesStaging", back_populates="source_file")
-    payments_insider_payments_records = relationship("PaymentsInsiderPaymentsStaging", back_populates="source_file")
-    ips_records = relationship("IPSStaging", back_populates="source_file")
-    ips_cc_records = relationship("IPSCreditCardStaging", back_populates="source_file")
-    ips_mobile_records = relationship("IPSMobileStaging", back_populates="source_file")
-    ips_cash_records = relationship("IPSCashStaging", back_populates="source_file")
-    ips_coin_collector_records = relationship("IPSCoinCollectorStaging", back_populates="source_file")
+    def get_staging(self, session, limit=None, columns=None, yield_per=None):
+        """Staging rows loaded from this file, as an explicit SELECT on its staging model.
+
+        Replaces per-table relationship collections: nothing is mapped on the
+        instance, so no attribute access can trigger a staging table scan.
+
+        columns (names on the staging model) selects just those columns and
+        returns plain Row tuples, with no ORM instances or identity-map
+        entries. yield_per streams the result in batches of that size as an
+        iterator instead of fetching every row with .all().
+        """
+        model = STAGING_MODELS_BY_SOURCE.get(self.data_source_type)
+        if model is None:
+            return []
+        if columns is not None:
+            stmt = select(*(getattr(model, name) for name in columns))
+        else:
+            stmt = select(model)
+        stmt = stmt.where(model.source_file_id == self.id).order_by(model.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        if yield_per is not None:
+            stmt = stmt.execution_options(yield_per=yield_per)
+        result = session.execute(stmt)
+        if columns is None:
+            result = result.scalars()
+        return result if yield_per is not None else result.all()
+
 
 # ============= Staging Tables =============
 
+def pending_rows_index(tablename):
+    """
+    Composite index for the ETL scans on a staging table.
+
+    The SQL templates select `source_file_id = :file_id AND processed_to_final = 0`
+    and the processor counts rows per source_file_id; leading with
+    source_file_id serves both as an index seek.
+    """
+    return Index(f"ix_{tablename}_pending", "source_file_id", "processed_to_final")
+
+
+def unprocessed_rows_index(tablename):
+    """
+    Filtered index over only the rows the ETL has not promoted yet.
+
+    Finding files with pending rows (no source_file_id given) would otherwise
+    scan the whole pending index, which is almost entirely processed rows;
+    this one stays the size of the backlog.
+    """
+    return Index(f"ix_{tablename}_unprocessed", "source_file_id",
+                 mssql_where=text("processed_to_final = 0"))
+
+
+STAGING_INSERT_BATCH_SIZE = 10000
+
+
+@lru_cache(maxsize=None)
+def staging_row_type(model):
+    """
+    namedtuple class for one parsed staging row (e.g. WindcaveRow).
+
+    Fields are the model's insertable columns in table order (no id or
+    loaded_at). A row costs what a tuple costs, against a dict or an
+    instrumented ORM instance per row, and bulk_copy passes it to the
+    driver as-is.
+    """
+    fields = [c.name for c in model.__table__.columns if c.name not in ("id", "loaded_at")]
+    return namedtuple(model.__name__.replace("Staging", "") + "Row", fields)
+
+
+@lru_cache(maxsize=None)
+def staging_datetime_columns(model):
+    """Names of a staging model's DateTime columns (loaded_at excluded), in table order."""
+    return tuple(
+        c.name for c in model.__table__.columns
+        if isinstance(c.type, DateTime) and c.name != "loaded_at"
+    )
+
+
+def _batches(rows, batch_size):
+    """Yield lists of up to batch_size rows from any iterable (list or generator)."""
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def bulk_load(session, model, rows, batch_size=STAGING_INSERT_BATCH_SIZE):
+    """
+    Insert row dicts (or staging_row_type tuples) into a model's table.
+
+    Uses a Core insert against the Table (one executemany per batch) so no
+    ORM instances or unit-of-work bookkeeping are created per row. rows may
+    be a generator; only one batch is held at a time.
+    Returns the number of rows inserted.
+    """
+    stmt = staging_insert(model)
+    count = 0
+    for batch in _batches(rows, batch_size):
+        if hasattr(batch[0], "_asdict"):
+            batch = [row._asdict() for row in batch]
+        session.execute(stmt, batch)
+        count += len(batch)
+    return count
+
+
+@lru_cache(maxsize=None)
+def staging_insert(model):
+    """The Core INSERT for a model's table, built once and reused by every bulk_load batch."""
+    return insert(model.__table__)
+
+
+@lru_cache(maxsize=None)
+def _copy_statement(model, columns, dialect):
+    """
+    The raw INSERT text and per-column bind converters bulk_copy sends for
+    a model and column tuple.
+
+    Built once per (model, columns, dialect), so repeat loads of a report
+    skip the identifier quoting and type inspection.
+    """
+    table = model.__table__
+    preparer = dialect.identifier_preparer
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        preparer.format_table(table),
+        ", ".join(preparer.quote(c) for c in columns),
+        ", ".join("?" for _ in columns),
+    )
+
+    # The raw cursor bypasses SQLAlchemy, so apply TypeDecorator conversions
+    # (e.g. MoneyCents) here; plain types go to pyodbc untouched.
+    converters = tuple(
+        table.c[c].type.process_bind_param if isinstance(table.c[c].type, TypeDecorator) else None
+        for c in columns
+    )
+    return sql, converters
+
+
+def bulk_copy(session, model, rows, batch_size=STAGING_INSERT_BATCH_SIZE):
+    """
+    Stream row dicts (or staging_row_type tuples) into a model's table using
+    the driver's bulk path.
+
+    On SQL Server (pyodbc) rows are sent as column-ordered tuples through a raw
+    cursor with fast_executemany, which ships each batch as one parameter array
+    instead of a round trip per row. This is the SQL Server counterpart of a
+    Postgres COPY. rows may be a generator (see frame_to_rows), so a file is
+    never materialized as rows more than one batch at a time.
+    Other dialects fall back to bulk_load.
+    Runs on the session's connection, so it commits/rolls back with the session.
+    """
+    bind = session.get_bind()
+    if bind.dialect.name != "mssql" or bind.dialect.driver != "pyodbc":
+        return bulk_load(session, model, rows, batch_size)
+
+    batches = _batches(rows, batch_size)
+    first = next(batches, None)
+    if first is None:
+        return 0
+
+    as_tuples = hasattr(first[0], "_fields")
+    if as_tuples:
+        columns = tuple(first[0]._fields)
+    else:
+        columns = tuple(c.name for c in model.__table__.columns if c.name in first[0])
+    sql, converters = _copy_statement(model, columns, bind.dialect)
+
+    if any(converters):
+        def to_params(row):
+            values = row if as_tuples else [row.get(c) for c in columns]
+            return tuple(
+                conv(v, bind.dialect) if conv else v
+                for v, conv in zip(values, converters)
+            )
+    elif as_tuples:
+        def to_params(row):
+            return row
+    else:
+        def to_params(row):
+            return tuple(row.get(c) for c in columns)
+
+    count = 0
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.fast_executemany = True
+        for batch in chain([first], batches):
+            cursor.executemany(sql, [to_params(row) for row in batch])
+            count += len(batch)
+    finally:
+        cursor.close()
+    return count
+
+
 class WindcaveStaging(Base):
     __tablename__ = "windcave_staging"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (pending_rows_index("windcave_staging"), unprocessed_rows_index("windcave_staging"), {"schema": "app"})
 
     id = Column(Integer, primary_key=True, index=True)
     source_file_id = Column(Integer, ForeignKey("uploaded_files.id"), nullable=False)
@@ -286,45 +600,41 @@ class WindcaveStaging(Base):
     settlement_date = Column(DateTime)
     group_account = Column(String(24))
     type = Column(String(5))
-    authorized = Column(Integer)
+    authorized = Column(SmallInteger)  # 0/1 flag
     reference = Column(String(20))
     auth_code = Column(String(12))
-    cur = Column(String(5))
+    cur = Column(CHAR(3))  # ISO 4217 currency code
     amount = Column(Float)
     card_num = Column(String(12))
     card_type = Column(String(20))
     card_holder_name = Column(String(50))
     dpstxnref = Column(String(20))
     txnref = Column(String(32))
-    reco = Column(Integer)
+    reco = Column(SmallInteger)  # 0/1 flag
     responsetext = Column(String(24))
-    billingid = Column(Integer)
-    dpsbillingid = Column(Integer)
+    billingid = Column(BigInteger)
+    dpsbillingid = Column(BigInteger)
     txndata1 = Column(String(20))
     txndata2 = Column(String(20))
     txndata3 = Column(String(20))
     username = Column(String(20))
     caid = Column(String(24))
-    catid = Column(Integer)
-    merch_corp_ref = Column(Integer)
-    order_number = Column(Integer)
+    catid = Column(BigInteger)
+    merch_corp_ref = Column(BigInteger)
+    order_number = Column(BigInteger)
     device_id = Column(String(20))
-    voided = Column(Integer)
+    voided = Column(SmallInteger)  # 0/1 flag
     cardnumber2 = Column(String(32))
     
     loaded_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_to_final = Column(Boolean, default=False)
     transaction_id = Column(Integer, ForeignKey("transactions.id"))
 
-    source_file = relationship("UploadedFile", back_populates="windcave_records")
-    final_transaction = relationship("Transaction", back_populates="windcave_source")
-
-
 
 class PaymentsInsiderSalesStaging(Base):
     """Staging table for Payments Insider credit card transactions"""
     __tablename__ = "payments_insider_sales_staging"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (pending_rows_index("payments_insider_sales_staging"), unprocessed_rows_index("payments_insider_sales_staging"), {"schema": "app"})
     
     id = Column(Integer, primary_key=True, index=True)
     source_file_id = Column(Integer, ForeignKey("uploaded_files.id"), nullable=False)
@@ -338,17 +648,17 @@ class PaymentsInsiderSalesStaging(Base):
     transaction_type = Column(String(20))
     void_ind = Column(String(3))
     settled_amount = Column(Numeric(10,2))
-    settled_currency = Column(String(5))
+    settled_currency = Column(CHAR(3))
     settled_date = Column(DateTime)
     transaction_amount = Column(Numeric(10,2))
-    transaction_currency = Column(String(5))
+    transaction_currency = Column(CHAR(3))
     transaction_date = Column(DateTime)
-    transaction_time = Column(String(8))
+    transaction_time = Column(Time)
     authorization_code = Column(String(12))
     gbok__batch_id = Column(String(12))
     terminal_id = Column(String(24))
     exchange_type = Column(String(12))
-    durbin_regulated = Column(String(1))
+    durbin_regulated = Column(CHAR(1))
     roc_text = Column(String(10))
     invoice = Column(String(50))
     ticket_number = Column(String(20))
@@ -365,30 +675,29 @@ class PaymentsInsiderSalesStaging(Base):
     transaction_id = Column(Integer, ForeignKey("transactions.id"))
     matching_report_id = Column(Integer)  # ID of matching sales/payments report
     
-    # Relationships
-    source_file = relationship("UploadedFile", back_populates="payments_insider_sales_records")
-    final_transaction = relationship("Transaction", back_populates="pi_sales_source")
-
     # Calculate datetime from date and time fields
     @hybrid_property
     def transaction_datetime(self):
         from datetime import datetime
         
-        time_value = parse_time_string(self.transaction_time)
-        if self.transaction_date and time_value:
-            return datetime.combine(self.transaction_date, time_value)
+        if self.transaction_date and self.transaction_time:
+            return datetime.combine(self.transaction_date, self.transaction_time)
+
+    @transaction_datetime.expression
+    def transaction_datetime(cls):
+        return cast(cast(cls.transaction_date, Date), DateTime) + cast(cls.transaction_time, DateTime)
 
 class PaymentsInsiderPaymentsStaging(Base):
     """Staging table for Payments Insider credit card transaction payments"""
     __tablename__ = "payments_insider_payments_staging"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (pending_rows_index("payments_insider_payments_staging"), unprocessed_rows_index("payments_insider_payments_staging"), {"schema": "app"})
     
     id = Column(Integer, primary_key=True, index=True)
     source_file_id = Column(Integer, ForeignKey("uploaded_files.id"), nullable=False)
     
     # Raw fields from PI reports - adjust based on actual columns
     payment_amount = Column(Numeric(10,2))
-    currency = Column(String(3))
+    currency = Column(CHAR(3))
     transaction_amount = Column(Numeric(10,2))
     payment_no = Column(String(20))
     payment_date = Column(DateTime)
@@ -424,16 +733,12 @@ class PaymentsInsiderPaymentsStaging(Base):
     processed_to_final = Column(Boolean, default=False)
     transaction_id = Column(Integer, ForeignKey("transactions.id"))
     matching_report_id = Column(Integer)  # ID of matching sales/payments report
-    
-    # Relationships
-    source_file = relationship("UploadedFile", back_populates="payments_insider_payments_records")
-    final_transaction = relationship("Transaction", back_populates="pi_payments_source")
 
 
 class IPSStaging(Base):
     """Staging table for IPS coin, credit, and mobile/app transactions"""
     __tablename__ = "ips_staging"
-    __table_args__ = {"schema":"app"}
+    __table_args__ = (pending_rows_index("ips_staging"), unprocessed_rows_index("ips_staging"), {"schema": "app"})
     id = Column(Integer, primary_key=True, index=True)
     source_file_id = Column(Integer, ForeignKey("uploaded_files.id"), nullable=False)
 
@@ -472,10 +777,6 @@ class IPSStaging(Base):
     loaded_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_to_final = Column(Boolean, default=False)
 
-    # Relationships
-    source_file = relationship("UploadedFile", back_populates="ips_records")
-    #final_transaction = relationship("Transaction", back_populates="ips_source")
-
     # Calculate datetime from date and time fields
     @hybrid_property
     def transaction_datetime(self):
@@ -484,12 +785,16 @@ class IPSStaging(Base):
         time_value = parse_time_string(self.time)
         if self.date and time_value:
             return datetime.combine(self.date, time_value)
+
+    @transaction_datetime.expression
+    def transaction_datetime(cls):
+        return combine_date_time_sql(cls.date, cls.time)
         
 
 class IPSCreditCardStaging(Base):
     """Staging table for IPS credit card transactions"""
     __tablename__ = "ips_cc_staging"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (pending_rows_index("ips_cc_staging"), unprocessed_rows_index("ips_cc_staging"), {"schema": "app"})
     
     id = Column(Integer, primary_key=True, index=True)
     source_file_id = Column(Integer, ForeignKey("uploaded_files.id"), nullable=False)
@@ -514,16 +819,12 @@ class IPSCreditCardStaging(Base):
     loaded_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_to_final = Column(Boolean, default=False)
     transaction_id = Column(Integer, ForeignKey("transactions.id"))
-    
-    # Relationships
-    source_file = relationship("UploadedFile", back_populates="ips_cc_records")
-    final_transaction = relationship("Transaction", back_populates="ips_cc_source")
 
 
 class IPSMobileStaging(Base):
     """Staging table for IPS mobile payment transactions"""
     __tablename__ = "ips_mobile_staging"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (pending_rows_index("ips_mobile_staging"), unprocessed_rows_index("ips_mobile_staging"), {"schema": "app"})
     
     id = Column(Integer, primary_key=True, index=True)
     source_file_id = Column(Integer, ForeignKey("uploaded_files.id"), nullable=False)
@@ -551,38 +852,34 @@ class IPSMobileStaging(Base):
     loaded_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_to_final = Column(Boolean, default=False)
     transaction_id = Column(Integer, ForeignKey("transactions.id"))
-    
-    # Relationships
-    source_file = relationship("UploadedFile", back_populates="ips_mobile_records")
-    final_transaction = relationship("Transaction", back_populates="ips_mobile_source")
 
 
 class IPSCashStaging(Base):
     """Staging table for IPS cash transactions (coins in meters)"""
     __tablename__ = "ips_cash_staging"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (pending_rows_index("ips_cash_staging"), unprocessed_rows_index("ips_cash_staging"), {"schema": "app"})
     
     id = Column(Integer, primary_key=True, index=True)
     source_file_id = Column(Integer, ForeignKey("uploaded_files.id"), nullable=False)
     
     # Raw fields from IPS Cash reports
     collection_date = Column(DateTime)
-    collection_time = Column(String(11))
+    collection_time = Column(Time)
     zone = Column(String(24))
     area = Column(String(50))
     sub_area = Column(String(50))
     pole_ser_no = Column(String(24))
     terminal = Column(String(12))
     meter_type = Column(String(12))
-    pennies = Column(Numeric(10,2))
-    nickels = Column(Numeric(10,2))
-    dimes = Column(Numeric(10,2))
-    quarters = Column(Numeric(10,2))
-    dollars = Column(Numeric(10,2))
+    pennies = Column(MoneyCents)
+    nickels = Column(MoneyCents)
+    dimes = Column(MoneyCents)
+    quarters = Column(MoneyCents)
+    dollars = Column(MoneyCents)
     coin_total = Column(Integer)
-    coin_revenue = Column(Numeric(10,2))
+    coin_revenue = Column(MoneyCents)
     unrecognized_coins = Column(Integer)
-    invalid_coin_revenue = Column(Numeric(10,2))
+    invalid_coin_revenue = Column(MoneyCents)
     coin_reversal_count = Column(Integer)
     
     # Processing metadata
@@ -590,24 +887,23 @@ class IPSCashStaging(Base):
     processed_to_final = Column(Boolean, default=False)
     transaction_id = Column(Integer, ForeignKey("transactions.id"))
     
-    # Relationships
-    source_file = relationship("UploadedFile", back_populates="ips_cash_records")
-    final_transaction = relationship("Transaction", back_populates="ips_cash_source")
-
     # Calculate datetime from date and time fields
     @hybrid_property
     def transaction_datetime(self):
         from datetime import datetime
         
-        time_value = parse_time_string(self.collection_time)
-        if self.collection_date and time_value:
-            return datetime.combine(self.collection_date, time_value)
+        if self.collection_date and self.collection_time:
+            return datetime.combine(self.collection_date, self.collection_time)
+
+    @transaction_datetime.expression
+    def transaction_datetime(cls):
+        return cast(cast(cls.collection_date, Date), DateTime) + cast(cls.collection_time, DateTime)
 
 
 class IPSCoinCollectorStaging(Base):
     """Staging table for IPS coin collection transactions (coins in meters)"""
     __tablename__ = "ips_coin_collector_staging"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (pending_rows_index("ips_coin_collector_staging"), unprocessed_rows_index("ips_coin_collector_staging"), {"schema": "app"})
     
     id = Column(Integer, primary_key=True, index=True)
     source_file_id = Column(Integer, ForeignKey("uploaded_files.id"), nullable=False)
@@ -637,10 +933,6 @@ class IPSCoinCollectorStaging(Base):
     loaded_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_to_final = Column(Boolean, default=False)
     
-    # Relationships
-    source_file = relationship("UploadedFile", back_populates="ips_coin_collector_records")
-    #final_transaction = relationship("Transaction", back_populates="ips_coin_collector_source")
-
     # Calculate datetime from date and time fields
     @hybrid_property
     def transaction_datetime(self):
@@ -649,6 +941,10 @@ class IPSCoinCollectorStaging(Base):
         time_value = parse_time_string(self.time)
         if self.date and time_value:
             return datetime.combine(self.date, time_value)
+
+    @transaction_datetime.expression
+    def transaction_datetime(cls):
+        return combine_date_time_sql(cls.date, cls.time)
         
 
 
@@ -662,17 +958,14 @@ class SQLCashStaging(Base):
     # Fields from your SQL query results
     transaction_date = Column(DateTime)
     amount = Column(Numeric(10, 2))
-    location = Column(String(255))
-    terminal_id = Column(String(100))
-    reference = Column(String(255))
+    location = Column(String(50))
+    terminal_id = Column(String(24))
+    reference = Column(String(32))
     
     # Processing metadata
     loaded_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_to_final = Column(Boolean, default=False)
     transaction_id = Column(Integer, ForeignKey("transactions.id"))
-    
-    # Relationships
-    final_transaction = relationship("Transaction", back_populates="sql_cash_source")
 
 
 # ============= UPDATED/NEW Transaction Model (Normalized Final Table) =============
@@ -680,33 +973,60 @@ class Transaction(Base):
     """
     Normalized transactions table - the final destination for all payment data
     This replaces your existing Transaction model
+
+    In the database this table is RANGE partitioned by month on
+    transaction_date (see scripts/partition_transactions_by_month.sql);
+    filter on transaction_date wherever possible so scans are pruned. That
+    script keys the table on (id, transaction_date) and drops the staging
+    tables' transaction_id foreign keys so old months can be switched out.
     """
     __tablename__ = "transactions"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (
+        # Reports filter by source and a transaction_date range; INCLUDE lets
+        # the amount/payment-type sums be answered from the index alone.
+        Index("ix_transactions_source_date", "source", "transaction_date",
+              mssql_include=["transaction_amount", "payment_type"]),
+        # The other TransactionFilter equality filters, each followed by the
+        # date range so equality + range is a single seek
+        Index("ix_transactions_payment_type_date", "payment_type", "transaction_date",
+              mssql_include=["transaction_amount"]),
+        Index("ix_transactions_location_type_date", "location_type", "transaction_date",
+              mssql_include=["transaction_amount"]),
+        Index("ix_transactions_terminal_date", "device_terminal_id", "transaction_date"),
+        Index("ix_transactions_org_code_date", "org_code", "transaction_date"),
+        # Audit trail lookups (get_staging_record and the reverse direction)
+        Index("ix_transactions_staging_lookup", "staging_table", "staging_record_id"),
+        {"schema": "app"},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
     # Core transaction fields (required)
-    transaction_date = Column(DateTime, nullable=False, index=True)
-    transaction_amount = Column(Numeric(10, 2), nullable=False)
+    transaction_date = Column(DateTime, nullable=False)
+    transaction_amount = Column(MoneyCents, nullable=False)
     
     # Settlement fields (nullable for cash transactions)
     settle_date = Column(DateTime, index=True)  # NULL for cash, same as transaction_date
-    settle_amount = Column(Numeric(10, 2))  # May differ from transaction_amount due to fees
+    settle_amount = Column(MoneyCents)  # May differ from transaction_amount due to fees
+    # Settlement date reports should filter on: settle_date, or transaction_date
+    # for cash. Persisted so it can be indexed (SQL Server has no expression indexes)
+    effective_settle_date = Column(
+        DateTime, Computed("COALESCE(settle_date, transaction_date)", persisted=True), index=True
+    )
     
     # Source and location information
-    source = Column(Enum(DataSourceType), nullable=False, index=True)
-    location_type = Column(Enum(LocationType), nullable=False)
-    location_name = Column(String(255))
-    location_sub_area = Column(String(100))
-    device_terminal_id = Column(String(100), index=True)
+    source = Column(string_enum(DataSourceType), nullable=False)
+    location_type = Column(string_enum(LocationType), nullable=False)
+    location_name = Column(String(50))  # Widths follow the widest staging source column
+    location_sub_area = Column(String(50))
+    device_terminal_id = Column(String(24))
     
     # Payment information
-    payment_type = Column(Enum(PaymentType), nullable=False)
+    payment_type = Column(string_enum(PaymentType), nullable=False)
     
     # Additional fields for tracking
-    reference_number = Column(String(255))  # Original transaction reference
-    org_code = Column(Integer, index=True)  # Retrieved from terminal_id lookup
+    reference_number = Column(String(32))  # Original transaction reference
+    org_code = Column(Integer)  # Retrieved from terminal_id lookup
     
     # Audit trail - which staging record(s) created this transaction
     staging_table = Column(String(50))  # Which staging table this came from
@@ -715,23 +1035,52 @@ class Transaction(Base):
     # Processing metadata
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
-    
-    # Relationships back to staging tables (for audit trail)
-    windcave_source = relationship("WindcaveStaging", back_populates="final_transaction", uselist=False)
-    pi_sales_source = relationship("PaymentsInsiderSalesStaging", back_populates="final_transaction", uselist=False)
-    pi_payments_source = relationship("PaymentsInsiderPaymentsStaging", back_populates="final_transaction", uselist=False)
-    ips_cc_source = relationship("IPSCreditCardStaging", back_populates="final_transaction", uselist=False)
-    ips_mobile_source = relationship("IPSMobileStaging", back_populates="final_transaction", uselist=False)
-    ips_cash_source = relationship("IPSCashStaging", back_populates="final_transaction", uselist=False)
-    #ips_coin_collection_source = relationship("IPSCoinCollectorStaging", back_populates="final_transaction", uselist=False)
-    sql_cash_source = relationship("SQLCashStaging", back_populates="final_transaction", uselist=False)
+
+
+# Staging model for each Transaction.staging_table value
+STAGING_MODELS = {
+    model.__tablename__: model
+    for model in (
+        WindcaveStaging, PaymentsInsiderSalesStaging, PaymentsInsiderPaymentsStaging,
+        IPSStaging, IPSCreditCardStaging, IPSMobileStaging, IPSCashStaging,
+        IPSCoinCollectorStaging, SQLCashStaging,
+    )
+}
+
+
+# Staging model each file's rows load into, by UploadedFile.data_source_type
+STAGING_MODELS_BY_SOURCE = {
+    DataSourceType.WINDCAVE: WindcaveStaging,
+    DataSourceType.PAYMENTS_INSIDER_SALES: PaymentsInsiderSalesStaging,
+    DataSourceType.PAYMENTS_INSIDER_PAYMENTS: PaymentsInsiderPaymentsStaging,
+    DataSourceType.IPS: IPSStaging,
+    DataSourceType.IPS_CC: IPSCreditCardStaging,
+    DataSourceType.IPS_MOBILE: IPSMobileStaging,
+    DataSourceType.IPS_CASH: IPSCashStaging,
+    DataSourceType.COIN_COLLECTION: IPSCoinCollectorStaging,
+}
+
+
+def get_staging_record(session, txn):
+    """Load the staging row a Transaction was created from (one primary-key SELECT), or None."""
+    model = STAGING_MODELS.get(txn.staging_table)
+    if model is None or txn.staging_record_id is None:
+        return None
+    return session.get(model, txn.staging_record_id)
 
 
 # ============= Optional: ETL Processing Log =============
 class ETLProcessingLog(Base):
     """Track ETL processing runs"""
     __tablename__ = "etl_processing_log"
-    __table_args__ = {"schema": "app"}
+    __table_args__ = (
+        # "Recent runs" lookups; start_time rises with the identity key, so
+        # inserts always append to the end of this index
+        Index("ix_etl_processing_log_start_time", "start_time"),
+        # Runs in flight; only a handful of rows ever match
+        Index("ix_etl_processing_log_running", "source_table", mssql_where=text("status = 'running'")),
+        {"schema": "app"},
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     source_table = Column(String(50), nullable=False)
@@ -744,6 +1093,10 @@ class ETLProcessingLog(Base):
     records_failed = Column(Integer)
     status = Column(String(20))  # 'running', 'completed', 'incomplete', 'failed'
     error_message = Column(Text)
+    records_per_sec = Column(Float, Computed(
+        "CAST(records_processed * 1000.0 / NULLIF(DATEDIFF_BIG(millisecond, start_time, end_time), 0) AS FLOAT)",
+        persisted=True
+    ))  # NULL until the run has an end_time
     
     # Relationship
     source_file = relationship("UploadedFile")
@@ -764,7 +1117,7 @@ class CashVariance(Base):
     date = Column(DateTime, nullable=False, index=True)
     cashier_number = Column(String(50), nullable=False, index=True)
     bag_number = Column(String(50), nullable=False, index=True)
-    bag_type = Column(Enum(BagType), nullable=False, default=BagType.REGULAR)
+    bag_type = Column(string_enum(BagType, by_value=True), nullable=False, default=BagType.REGULAR)
 
     # Location and device references (nullable, populated from dropdowns)
     location_id = Column(Integer, nullable=True)  # References dim_location
@@ -5,6 +5,19 @@ from enum import Enum
 from app.models.database import UserRole, DataSourceType, LocationType, PaymentType, UserRole, BagType
 
 
+def pydantic_from_row(model, row_mapping, **values):
+    """Build a response model from a database row without validating it.
+
+    For trusted reads from our own tables, where the column types already
+    match the schema; ingress (Create/Update schemas) keeps full validation.
+    Columns the model doesn't declare are ignored. values replace row columns
+    that still need the coercion validation would have done (e.g. an enum).
+    """
+    fields = {k: row_mapping[k] for k in model.model_fields if k in row_mapping}
+    fields.update(values)
+    return model.model_construct(**fields)
+
+
 # ============= User Schemas =============
 
 class UserBase(BaseModel):
@@ -83,7 +96,8 @@ class UserResponse(BaseModel):
             return self.last_name
         return None
     
-    model_config = ConfigDict(from_attributes=True)
+    # Keep role as its plain string value; skips Enum wrapping on serialization
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
 class PasswordReset(BaseModel):
@@ -265,7 +279,7 @@ class TransactionBase(BaseModel):
     device_terminal_id: str
     payment_type: PaymentType
     reference_number: Optional[str]
-    org_code: Optional[str]
+    org_code: Optional[int]  # Matches Transaction.org_code (INT)
 
 
 class TransactionCreate(TransactionBase):
@@ -280,7 +294,9 @@ class TransactionResponse(TransactionBase):
     created_at: datetime
     updated_at: Optional[datetime]
     
-    model_config = ConfigDict(from_attributes=True)
+    # Search results can be thousands of rows; store enum fields as their
+    # plain string values so serialization skips Enum wrapping
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
 class TransactionFilter(BaseModel):
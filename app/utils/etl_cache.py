@@ -5,193 +5,442 @@ This module handles initialization and caching of lookup tables used by the ETL
 Caches are built once on application startup and reused across requests to avoid repeated DB queries.
 """
 
-import pandas as pd
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, List, Mapping, Any
+from sqlalchemy import text
 from sqlalchemy.orm import Session
+from app.config import settings
+import json
 import logging
+import os
+import stat
+import sys
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from types import MappingProxyType
 
 
 logger = logging.getLogger(__name__)
 
-# Global cache storage
-_etl_cache: Dict[str, Any] = {
-    'org_code_cache': None,
-    'location_from_charge_code': None,
-    'charge_code_from_housing_id': {},
-    'charge_code_from_terminal_id': {},
-    'garage_from_station': {},
-    'is_initialized': False
+# One row of the org code lookup query (field order matches its SELECT list)
+OrgCodeRow = namedtuple('OrgCodeRow', [
+    'source', 'Device_ID', 'TerminalID', 'DateAssigned', 'DateRemoved',
+    'ChargeCode', 'Location', 'Precedence'
+])
+
+# Bump when the shape of anything in the snapshot changes
+_SNAPSHOT_VERSION = 4
+
+
+def _empty_cache() -> Dict[str, Any]:
+    """The cache layout, defined once for both module load and reset_cache()"""
+    return {
+        'org_code_cache': None,
+        'location_from_charge_code': None,
+        'charge_code_from_housing_id': {},
+        'charge_code_from_terminal_id': {},
+        'garage_from_station': {},
+        'is_initialized': False,
+        # time.time() after which initialize_etl_cache rebuilds: the TTL for a
+        # complete build, ETL_CACHE_RETRY_SECONDS for one where a load failed
+        'expires_at': None
+    }
+
+
+# Global cache storage. Builds fill a fresh dict and rebind this name once
+# complete, so readers never see a half-populated cache; _cache_lock keeps
+# two builds (or a build and a reset) from interleaving.
+_etl_cache: Dict[str, Any] = _empty_cache()
+_cache_lock = threading.RLock()
+
+
+# Lookup dicts that are read-only once built; _save_snapshot persists these
+# and org_code_cache
+_LOOKUP_KEYS = (
+    'location_from_charge_code', 'charge_code_from_housing_id',
+    'charge_code_from_terminal_id', 'garage_from_station'
+)
+
+
+def _freeze_lookups(cache: Dict[str, Any]):
+    """Intern string keys and wrap each lookup dict in a read-only MappingProxyType.
+
+    Interned keys let lookups with interned strings short-circuit on identity;
+    the proxy keeps ETL code from mutating a shared cache. Call after the
+    snapshot is written (it serializes the plain dicts).
+    """
+    for key in _LOOKUP_KEYS:
+        lookup = cache.get(key)
+        if lookup is None or isinstance(lookup, MappingProxyType):
+            continue
+        cache[key] = MappingProxyType({
+            sys.intern(k) if isinstance(k, str) else k: v for k, v in lookup.items()
+        })
+
+
+def _is_trusted(st: os.stat_result) -> bool:
+    """True if a snapshot file or its directory is owned by this process's
+    user and writable by no one else (ownership isn't checked on Windows)"""
+    if hasattr(os, 'getuid') and st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _snapshot_dir(create: bool = False) -> Optional[str]:
+    """The snapshot's directory; None if it is missing or another user could
+    have written to it. With create, a missing directory is made 0700 first."""
+    directory = os.path.dirname(os.path.abspath(settings.etl_cache_file))
+    if create:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    try:
+        st = os.stat(directory)
+    except FileNotFoundError:
+        return None
+    if not _is_trusted(st):
+        logger.warning(f"Not using ETL cache snapshot: {directory} is writable by other users")
+        return None
+    return directory
+
+
+# Tags for the values the lookup queries return that JSON has no type for,
+# so _load_snapshot gets back the same types the databases returned
+_SNAPSHOT_TYPES = {
+    '__datetime__': datetime.fromisoformat,
+    '__date__': date.fromisoformat,
+    '__decimal__': Decimal,
 }
 
 
-def initialize_etl_cache(db: Session, traffic_db: Optional[Session] = None) -> bool:
+def _json_default(value):
+    """Encode a non-JSON value as a one-key {tag: string} object"""
+    if isinstance(value, datetime):  # before date: datetime is a date subclass
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'__decimal__': str(value)}
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _json_object_hook(obj: Dict[str, Any]) -> Any:
+    """Decode the tagged objects written by _json_default"""
+    if len(obj) == 1:
+        (tag, value), = obj.items()
+        if tag in _SNAPSHOT_TYPES:
+            return _SNAPSHOT_TYPES[tag](value)
+    return obj
+
+
+def _load_snapshot() -> Optional[Dict[str, Any]]:
+    """Return the on-disk lookups if the snapshot is trusted and within its TTL.
+
+    The snapshot is plain JSON, so a planted file can at worst supply wrong
+    lookups, and it is only read when this user owns it and its directory
+    and neither is writable by anyone else. Lookups are stored as [key,
+    value] pairs so integer charge-code keys survive the round trip. Never
+    creates the directory, so a read-only snapshot path is fine.
+    """
+    path = settings.etl_cache_file
+    if settings.etl_cache_ttl_hours <= 0 or not os.path.exists(path):
+        return None
+    try:
+        if _snapshot_dir() is None:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            st = os.fstat(f.fileno())
+            if not stat.S_ISREG(st.st_mode) or not _is_trusted(st):
+                logger.warning(f"Ignoring ETL cache snapshot {path}: not owned by this user or writable by others")
+                return None
+            expires_at = st.st_mtime + settings.etl_cache_ttl_hours * 3600
+            if time.time() >= expires_at:
+                return None
+            raw = json.load(f, object_hook=_json_object_hook)
+        if raw.get('version') != _SNAPSHOT_VERSION:
+            return None
+
+        org_code_rows = raw['org_code_cache']
+        if org_code_rows is not None:
+            org_code_rows = [OrgCodeRow(*values) for values in org_code_rows]
+        snapshot = {'org_code_cache': org_code_rows, 'expires_at': expires_at}
+        for key in _LOOKUP_KEYS:
+            pairs = raw[key]
+            snapshot[key] = None if pairs is None else {k: v for k, v in pairs}
+        return snapshot
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable ETL cache snapshot {path}: {e}")
+        return None
+
+
+def _save_snapshot(cache: Dict[str, Any]):
+    """Write the built lookups to disk as JSON.
+
+    The file is created 0600 in a 0700 directory and moved into place
+    atomically, so concurrent workers never read a partial file.
+    """
+    if settings.etl_cache_ttl_hours <= 0:
+        return
+    path = settings.etl_cache_file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        if _snapshot_dir(create=True) is None:
+            return
+        snapshot = {
+            'version': _SNAPSHOT_VERSION,
+            'org_code_cache': cache['org_code_cache'],
+        }
+        for key in _LOOKUP_KEYS:
+            lookup = cache[key]
+            snapshot[key] = None if lookup is None else list(lookup.items())
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+        with open(fd, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, default=_json_default)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Could not write ETL cache snapshot {path}: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def initialize_etl_cache(db: Session, traffic_db: Optional[Session] = None, force_refresh: bool = False) -> bool:
     """
     Initialize ETL lookup caches on application startup.
     
+    The built lookups are also written to settings.etl_cache_file; while that
+    snapshot is younger than ETL_CACHE_TTL_HOURS, startup loads it instead of
+    querying the Traffic and OPMS databases.
+    
+    Calling again is cheap while the cache is current. After the TTL, or
+    ETL_CACHE_RETRY_SECONDS after a build where a lookup failed to load, the
+    next call rebuilds it.
+    
     Args:
         db: Primary application database session (PUReporting)
         traffic_db: Optional Traffic database session for org code lookups
+        force_refresh: Rebuild from the databases even if the cache is already
+            initialized or a fresh snapshot exists. The current lookups keep
+            serving until the rebuilt ones are swapped in.
         
     Returns:
         bool: True if initialization succeeded, False otherwise
     """
     global _etl_cache
     
-    try:
-        logger.info("Initializing ETL lookup caches...")
-        
-        # Initialize org code cache
-        org_code_df = _load_org_code_cache(traffic_db)
-        garage_from_station = _load_garage_cache(db)
+    with _cache_lock:
+        if _etl_cache['is_initialized'] and not force_refresh and not _is_expired(_etl_cache):
+            logger.debug("ETL cache already initialized, skipping")
+            return True
         
-        if org_code_df is not None:
-            _etl_cache['org_code_cache'] = org_code_df
-            logger.info(f"Loaded org code cache with {len(org_code_df)} records")
-
-            charge_code_from_housing_id = {a:b for a,b in zip(org_code_df['Device_ID'], org_code_df['ChargeCode']) if a != None}
-            charge_code_from_terminal_id = {a:b for a,b in zip(org_code_df['TerminalID'], org_code_df['ChargeCode']) if a != None}
-
-            charge_code_from_terminal_id['0010050008031494050786'] = 82088
-            charge_code_from_terminal_id['0010050008031494050908'] = 82074
-
-            location_from_charge_code = {a:b for a,b in zip(org_code_df['ChargeCode'], org_code_df['Location']) if a != None}
-            location_from_charge_code[82044] = 'Capitol Square North'
-            location_from_charge_code[82045] = 'Overture Center'
-            location_from_charge_code[82047] = 'Wilson Street'
-            location_from_charge_code[82048] = 'Lake/Frances'
-            location_from_charge_code[82050] = 'State Street Capitol'
-            location_from_charge_code[82164] = 'Livingston'
-            location_from_charge_code[82172] = 'Over/Short/Helpline'
-            location_from_charge_code[82055] = 'Blair Lot'
-            location_from_charge_code[82057] = 'Wingra Lot'
-            location_from_charge_code[82074] = 'Multi-Space Meters'
-            location_from_charge_code[82088] = 'Single Space Meters'
-            location_from_charge_code[82224] = 'Buckeye Lot'
-            location_from_charge_code[82225] = 'Evergreen Lot'
-            location_from_charge_code[82935] = 'Meter Over/Short'
-
-                        
-            # Save dicts to the class
-            _etl_cache['charge_code_from_housing_id'] = charge_code_from_housing_id
-            _etl_cache['charge_code_from_terminal_id'] = charge_code_from_terminal_id
-            _etl_cache['location_from_charge_code'] = location_from_charge_code
-            _etl_cache['garage_from_station'] = garage_from_station
-            
-            
-            
-        else:
-            logger.warning("Could not load org code cache from Traffic DB")
+        try:
+            new_cache = _build_cache(db, traffic_db, use_snapshot=not force_refresh)
+        except Exception as e:
+            logger.error(f"Error initializing ETL caches: {e}", exc_info=True)
+            return False
         
-        _etl_cache['is_initialized'] = True
+        _etl_cache = new_cache
         logger.info("ETL cache initialization completed successfully")
         return True
+
+
+def _is_expired(cache: Dict[str, Any]) -> bool:
+    """True once a cache's expires_at has passed (a failed load is never cached for good)"""
+    return cache['expires_at'] is not None and time.time() >= cache['expires_at']
+
+
+def _build_cache(db: Session, traffic_db: Optional[Session], use_snapshot: bool) -> Dict[str, Any]:
+    """Build a complete, frozen cache dict without touching the live _etl_cache"""
+    cache = _empty_cache()
+    
+    if use_snapshot:
+        snapshot = _load_snapshot()
+        if snapshot is not None:
+            cache.update(snapshot)
+            _freeze_lookups(cache)
+            cache['is_initialized'] = True
+            logger.info(f"Loaded ETL lookup caches from {settings.etl_cache_file}")
+            return cache
+    
+    logger.info("Initializing ETL lookup caches...")
+    
+    # The org code (Traffic) and garage (OPMS) queries hit different servers;
+    # run them concurrently so startup waits for the slower one only. Each
+    # session is used by exactly one worker thread.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        org_code_future = executor.submit(_load_org_code_cache, traffic_db)
+        garage_future = executor.submit(_load_garage_cache, db)
+        org_code_rows = org_code_future.result()
+        garage_from_station = garage_future.result()
+    
+    if org_code_rows is not None:
+        cache['org_code_cache'] = org_code_rows
+        logger.info(f"Loaded org code cache with {len(org_code_rows)} records")
+
+        # All three lookups in one pass over the rows. The query is
+        # unordered; a stable sort on Precedence puts the override rows
+        # last so they replace the rows they patch.
+        charge_code_from_housing_id = {}
+        charge_code_from_terminal_id = {}
+        location_from_charge_code = {}
+        for r in sorted(org_code_rows, key=attrgetter('Precedence')):
+            if r.Device_ID is not None:
+                charge_code_from_housing_id[r.Device_ID] = r.ChargeCode
+            if r.TerminalID is not None:
+                charge_code_from_terminal_id[r.TerminalID] = r.ChargeCode
+            if r.ChargeCode is not None:
+                location_from_charge_code[r.ChargeCode] = r.Location
         
-    except Exception as e:
-        logger.error(f"Error initializing ETL caches: {e}", exc_info=True)
-        _etl_cache['is_initialized'] = False
-        return False
+        cache['charge_code_from_housing_id'] = charge_code_from_housing_id
+        cache['charge_code_from_terminal_id'] = charge_code_from_terminal_id
+        cache['location_from_charge_code'] = location_from_charge_code
+    else:
+        logger.warning("Could not load org code cache from Traffic DB")
+    
+    if garage_from_station is not None:
+        cache['garage_from_station'] = garage_from_station
+    
+    if org_code_rows is not None and garage_from_station is not None:
+        # Only complete builds are persisted and kept for the full TTL
+        _save_snapshot(cache)
+        if settings.etl_cache_ttl_hours > 0:
+            cache['expires_at'] = time.time() + settings.etl_cache_ttl_hours * 3600
+    else:
+        # A failed load (e.g. Traffic was down) is retried soon, not kept empty for good
+        cache['expires_at'] = time.time() + settings.etl_cache_retry_seconds
+    _freeze_lookups(cache)
+    
+    cache['is_initialized'] = True
+    return cache
 
 
-def _load_org_code_cache(traffic_db: Optional[Session]) -> Optional[pd.DataFrame]:
+def refresh_cache(db: Session, traffic_db: Optional[Session] = None) -> bool:
     """
-    Load organization code lookup table from Traffic database.
+    Rebuild the caches from the databases and swap them in.
     
-    Returns:
-        DataFrame with columns: TerminalID, ChargeCode, DateAssigned, DateRemoved, Facility_Name
-        or None if unable to load
+    Lookups keep answering from the previous cache while the rebuild runs;
+    if it fails, the previous cache stays in place.
     """
-    if traffic_db is None:
-        logger.warning("Traffic DB session not available for org code cache")
-        return None
-    
-    try:
-        org_lookup_tbl = pd.read_sql("""
-            with ucds as (
-                SELECT
-                    'EMV Reader' source, Device_ID, a.TerminalID, b.ChargeCode, a.Facility_Name_Abr, a.Facility_Name_Full, a.DateRemoved
-                FROM data_admin8.PU_PARCS_EQUIP a
-                INNER JOIN data_admin8.PU_PARCS_UCD b On (b.HousingID=a.Device_ID)
-                WHERE 
-                    a.TerminalID IS NOT NULL 
-                    AND a.DateREmoved IS NULL
-                    AND b.ChargeCode IS NOT NULL
-            ), cc_terminals as (
-                SELECT 'CC Terminal' source, DeviceID, TerminalID, DateAssigned, DateRemoved, ChargeCode FROM [Traffic].[data_admin8].PU_CC_TERMINAL_HISTORY WHERE ChargeCode IS NOT NULL --AND DateRemoved IS NULL
-            )
-            SELECT 
-                source, ucds.Device_ID, CONCAT('0010050008016090',CAST(ucds.TerminalID As varchar)) TerminalID, '1900-01-01' as DateAssigned, DATEADD(day, 365, GETDATE()) as DateRemoved, ucds.ChargeCode,
-                CASE
-                    WHEN Device_ID = 'E164' THEN 'Capitol Square North'
-                    WHEN Device_ID LIKE '_1_' THEN 'Overture Center'
-                    WHEN Device_ID LIKE '_2_' THEN 'State Street Capitol'
-                    WHEN Device_ID LIKE '_4_' THEN 'Lake/Frances'
-                    WHEN Device_ID LIKE '_5_' THEN 'Lake/Frances'
-                    WHEN Device_ID LIKE '_6_' THEN 'Capitol Square North'
-                    WHEN Device_ID LIKE '_7_' THEN 'Wilson Street'
-                    WHEN Device_ID LIKE '_8_' THEN 'Livingston'
-                    WHEN Device_ID LIKE '_9_' THEN 'Shop'
-                    ELSE NULL
-                END As Location
-            FROM ucds 
-            UNION
-            SELECT
-                source, NULL, cc_terminals.TerminalID, COALESCE(cc_terminals.DateAssigned, '1900-01-01') DateAssigned, COALESCE(cc_terminals.DateRemoved, '2050-01-01') DateRemoved, cc_terminals.ChargeCode,
-                CASE
-                    WHEN cc_terminals.ChargeCode IN (82001, 82044) THEN 'Capitol Square North'
-                    WHEN cc_terminals.ChargeCode IN (82002, 82045) THEN 'Overture Center'
-                    WHEN cc_terminals.ChargeCode IN (82004, 82047) THEN 'Wilson Street'
-                    WHEN cc_terminals.ChargeCode IN (82005, 82048) THEN 'Lake/Frances'
-                    WHEN cc_terminals.ChargeCode IN (82007, 82050) THEN 'State Street Capitol'
-                    WHEN cc_terminals.ChargeCode IN (82162, 82164) THEN 'Livingston'
-                    WHEN cc_terminals.ChargeCode IN (82172) THEN 'Shop'
-                    ELSE NULL
-                END As Location
-            FROM cc_terminals
-            ORDER BY TerminalID
-            """, traffic_db.get_bind())
-        
-        return org_lookup_tbl if not org_lookup_tbl.empty else None        
-    except Exception as e:
-        logger.error(f"Error loading org code cache: {e}")
-        return None
+    return initialize_etl_cache(db, traffic_db, force_refresh=True)
 
 
-def _load_location_cache(traffic_db: Optional[Session]) -> Optional[Dict[str, str]]:
+# Module-level TextClause constants: compiled once by SQLAlchemy, and the
+# identical text lets SQL Server reuse its cached plan on a refresh
+_ORG_CODE_SQL = text("""
+    with ucds as (
+        SELECT
+            'EMV Reader' source, Device_ID, a.TerminalID, b.ChargeCode, a.Facility_Name_Abr, a.Facility_Name_Full, a.DateRemoved
+        FROM data_admin8.PU_PARCS_EQUIP a
+        INNER JOIN data_admin8.PU_PARCS_UCD b On (b.HousingID=a.Device_ID)
+        WHERE 
+            a.TerminalID IS NOT NULL 
+            AND a.DateREmoved IS NULL
+            AND b.ChargeCode IS NOT NULL
+    ), cc_terminals as (
+        SELECT 'CC Terminal' source, DeviceID, TerminalID, DateAssigned, DateRemoved, ChargeCode FROM [Traffic].[data_admin8].PU_CC_TERMINAL_HISTORY WHERE ChargeCode IS NOT NULL --AND DateRemoved IS NULL
+    ), location_overrides as (
+        -- Charge code locations that win over the CASE mappings below
+        SELECT * FROM (VALUES
+            (82044, 'Capitol Square North'),
+            (82045, 'Overture Center'),
+            (82047, 'Wilson Street'),
+            (82048, 'Lake/Frances'),
+            (82050, 'State Street Capitol'),
+            (82164, 'Livingston'),
+            (82172, 'Over/Short/Helpline'),
+            (82055, 'Blair Lot'),
+            (82057, 'Wingra Lot'),
+            (82074, 'Multi-Space Meters'),
+            (82088, 'Single Space Meters'),
+            (82224, 'Buckeye Lot'),
+            (82225, 'Evergreen Lot'),
+            (82935, 'Meter Over/Short')
+        ) v (ChargeCode, Location)
+    ), terminal_overrides as (
+        -- Terminals whose charge code wins over their history rows
+        SELECT * FROM (VALUES
+            ('0010050008031494050786', 82088),
+            ('0010050008031494050908', 82074)
+        ) v (TerminalID, ChargeCode)
+    )
+    SELECT 
+        source, ucds.Device_ID, CONCAT('0010050008016090',CAST(ucds.TerminalID As varchar)) TerminalID, '1900-01-01' as DateAssigned, DATEADD(day, 365, GETDATE()) as DateRemoved, ucds.ChargeCode,
+        COALESCE(o.Location, CASE
+            WHEN Device_ID = 'E164' THEN 'Capitol Square North'
+            WHEN Device_ID LIKE '_1_' THEN 'Overture Center'
+            WHEN Device_ID LIKE '_2_' THEN 'State Street Capitol'
+            WHEN Device_ID LIKE '_4_' THEN 'Lake/Frances'
+            WHEN Device_ID LIKE '_5_' THEN 'Lake/Frances'
+            WHEN Device_ID LIKE '_6_' THEN 'Capitol Square North'
+            WHEN Device_ID LIKE '_7_' THEN 'Wilson Street'
+            WHEN Device_ID LIKE '_8_' THEN 'Livingston'
+            WHEN Device_ID LIKE '_9_' THEN 'Shop'
+            ELSE NULL
+        END) As Location,
+        0 As Precedence
+    FROM ucds 
+    LEFT JOIN location_overrides o On (o.ChargeCode=ucds.ChargeCode)
+    UNION ALL
+    SELECT
+        source, NULL, cc_terminals.TerminalID, COALESCE(cc_terminals.DateAssigned, '1900-01-01') DateAssigned, COALESCE(cc_terminals.DateRemoved, '2050-01-01') DateRemoved, cc_terminals.ChargeCode,
+        COALESCE(o.Location, CASE
+            WHEN cc_terminals.ChargeCode IN (82001, 82044) THEN 'Capitol Square North'
+            WHEN cc_terminals.ChargeCode IN (82002, 82045) THEN 'Overture Center'
+            WHEN cc_terminals.ChargeCode IN (82004, 82047) THEN 'Wilson Street'
+            WHEN cc_terminals.ChargeCode IN (82005, 82048) THEN 'Lake/Frances'
+            WHEN cc_terminals.ChargeCode IN (82007, 82050) THEN 'State Street Capitol'
+            WHEN cc_terminals.ChargeCode IN (82162, 82164) THEN 'Livingston'
+            WHEN cc_terminals.ChargeCode IN (82172) THEN 'Shop'
+            ELSE NULL
+        END) As Location,
+        0 As Precedence
+    FROM cc_terminals
+    LEFT JOIN location_overrides o On (o.ChargeCode=cc_terminals.ChargeCode)
+    UNION ALL
+    SELECT
+        'Terminal Override', NULL, t.TerminalID, '1900-01-01', DATEADD(day, 365, GETDATE()), t.ChargeCode, o.Location, 1
+    FROM terminal_overrides t
+    LEFT JOIN location_overrides o On (o.ChargeCode=t.ChargeCode)
+    UNION ALL
+    SELECT
+        'Location Override', NULL, NULL, '1900-01-01', DATEADD(day, 365, GETDATE()), o.ChargeCode, o.Location, 1
+    FROM location_overrides o
+""").execution_options(stream_results=True, yield_per=1000)
+
+
+def _load_org_code_cache(traffic_db: Optional[Session]) -> Optional[List[OrgCodeRow]]:
     """
-    Load location/facility name lookup from charge codes.
+    Load organization code lookup table from Traffic database.
     
     Returns:
-        Dictionary mapping ChargeCode -> Facility_Name_Full
-        or None if unable to load
+        List of OrgCodeRow tuples, or None if unable to load. Manual
+        location/terminal overrides are applied in the query itself.
     """
     if traffic_db is None:
-        logger.warning("Traffic DB session not available for location cache")
+        logger.warning("Traffic DB session not available for org code cache")
         return None
     
     try:
-        query = """
-        SELECT DISTINCT
-            b.ChargeCode,
-            a.Facility_Name_Full
-        FROM data_admin8.PU_PARCS_EQUIP a
-        INNER JOIN data_admin8.PU_PARCS_UCD b ON (b.HousingID = a.Device_ID)
-        WHERE b.ChargeCode IS NOT NULL AND a.Facility_Name_Full IS NOT NULL
-        """
-        
-        df = pd.read_sql(query, traffic_db.get_bind())
-        
-        if df.empty:
-            return None
-        
-        # Create mapping: ChargeCode -> Facility_Name_Full
-        location_map = dict(zip(df['ChargeCode'], df['Facility_Name_Full']))
-        return location_map
+        # Streamed in batches of 1000: rows become OrgCodeRow tuples as they
+        # arrive instead of the whole result being buffered as Row objects first
+        result = traffic_db.execute(_ORG_CODE_SQL)
         
+        return [OrgCodeRow(**r) for r in result.mappings()] or None
     except Exception as e:
-        logger.error(f"Error loading location cache: {e}")
+        logger.error(f"Error loading org code cache: {e}")
         return None
 
 
+_GARAGE_SQL = text("""
+    SELECT 
+        Location.TxnT2StationAdddress as station,
+        pa.ParkingName as garage
+    FROM Opms.dbo.Location
+    INNER JOIN Opms.dbo.ParkingAdmin pa On (Location.Id_Parking=pa.Id_Parking)
+""")
+
+
 def _load_garage_cache(db: Optional[Session]) -> Optional[Dict[str, str]]:
     """
     Load mapping from station address to garage name from the primary DB.
@@ -202,48 +451,68 @@ def _load_garage_cache(db: Optional[Session]) -> Optional[Dict[str, str]]:
         return None
 
     try:
-        query = """
-            SELECT 
-                Location.TxnT2StationAdddress as station,
-                pa.ParkingName as garage
-            FROM Opms.dbo.Location
-            INNER JOIN Opms.dbo.ParkingAdmin pa On (Location.Id_Parking=pa.Id_Parking)
-        """
-        df = pd.read_sql(query, db.get_bind())
-        if df.empty:
-            return None
-        return {a: b for a, b in zip(df['station'], df['garage']) if a is not None}
+        garage_map = {row[0]: row[1] for row in db.execute(_GARAGE_SQL) if row[0] is not None}
+        return garage_map or None
     except Exception as e:
         logger.error(f"Error loading garage cache: {e}")
         return None
 
 
-def get_org_code_cache() -> Optional[pd.DataFrame]:
+def get_org_code_cache() -> Optional[List[OrgCodeRow]]:
     """
     Get the cached org code lookup table.
     
     Returns:
-        DataFrame with organization code mappings or None if not initialized
+        List of OrgCodeRow tuples or None if not initialized
     """
     return _etl_cache.get('org_code_cache')
 
 
-def get_charge_code_from_housing_id() -> Dict[str, int]:
+def get_org_code_cache_df():
+    """
+    The cached org code lookup table as a pandas DataFrame, built on demand.
+    
+    When pyarrow is installed (the optional "arrow" extra) the columns are
+    Arrow-backed (pd.ArrowDtype), built column-wise from the tuples, which
+    skips the per-cell object columns of the plain constructor. Without it
+    the plain DataFrame constructor is used.
+    
+    Returns:
+        DataFrame with one column per OrgCodeRow field, or None if not initialized
+    """
+    rows = _etl_cache.get('org_code_cache')
+    if rows is None:
+        return None
+    import pandas as pd
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return pd.DataFrame(rows, columns=OrgCodeRow._fields)
+    columns = list(zip(*rows)) or [()] * len(OrgCodeRow._fields)
+    table = pa.table({name: pa.array(col) for name, col in zip(OrgCodeRow._fields, columns)})
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+# The lookup getters index _etl_cache directly: _empty_cache() guarantees every
+# key, so no default dict is built per call. In per-row loops, bind the
+# returned mapping to a local once (cc_map = get_charge_code_from_terminal_id())
+# and call cc_map.get(tid) in the loop.
+def get_charge_code_from_housing_id() -> Mapping[str, int]:
     """Return mapping of housing/device id -> charge code"""
-    return _etl_cache.get('charge_code_from_housing_id', {})
+    return _etl_cache['charge_code_from_housing_id']
 
 
-def get_charge_code_from_terminal_id() -> Dict[str, int]:
+def get_charge_code_from_terminal_id() -> Mapping[str, int]:
     """Return mapping of terminal id -> charge code"""
-    return _etl_cache.get('charge_code_from_terminal_id', {})
+    return _etl_cache['charge_code_from_terminal_id']
 
 
-def get_garage_from_station() -> Dict[str, str]:
+def get_garage_from_station() -> Mapping[str, str]:
     """Return mapping of station address -> garage name"""
-    return _etl_cache.get('garage_from_station', {})
+    return _etl_cache['garage_from_station']
 
 
-def get_location_from_charge_code() -> Optional[Dict[str, str]]:
+def get_location_from_charge_code() -> Optional[Mapping[str, str]]:
     """
     Get the cached location/facility name lookup.
     
@@ -268,9 +537,6 @@ def reset_cache():
     Reset all cached lookups. Useful for testing or manual cache refresh.
     """
     global _etl_cache
-    _etl_cache = {
-        'org_code_cache': None,
-        'location_from_charge_code': None,
-        'is_initialized': False
-    }
+    with _cache_lock:
+        _etl_cache = _empty_cache()
     logger.info("ETL cache reset")
@@ -3,47 +3,265 @@ ETL Processing Functions for Data Lake
 Transforms data from staging tables to normalized transactions table
 """
 
-from datetime import datetime, timedelta
-from typing import Optional, Dict, List, Any, Callable
+from datetime import datetime, timedelta, time
+from typing import Optional, Dict, List, Any, Callable, Iterable, Iterator
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
-from sqlalchemy import Table, MetaData, select, insert, text
+from sqlalchemy import select, insert, text
 from sqlalchemy.ext.hybrid import hybrid_property
 import numpy as np
 import pandas as pd
 from app.utils import etl_cache
 from pathlib import Path
+from functools import lru_cache
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from openpyxl import load_workbook
 import os
 from app.models.database import (
     Transaction, DataSourceType, LocationType, PaymentType,
     WindcaveStaging, PaymentsInsiderPaymentsStaging, PaymentsInsiderSalesStaging, 
     IPSCreditCardStaging, IPSMobileStaging, IPSCashStaging, IPSCoinCollectorStaging, 
-    SQLCashStaging, IPSStaging, ETLProcessingLog, UploadedFile
+    SQLCashStaging, IPSStaging, ETLProcessingLog, UploadedFile, parse_time_string, bulk_copy, staging_row_type, staging_datetime_columns,
+    STAGING_INSERT_BATCH_SIZE
 )
 
+
+# DataSourceType -> (SQL template source key, staging table). Built once at
+# import; the ETL resolves a file's templates and table with one dict lookup.
+SOURCE_STAGING_TABLES = {
+    DataSourceType.WINDCAVE: ("windcave", "windcave_staging"),
+    DataSourceType.PAYMENTS_INSIDER_PAYMENTS: ("payments_insider_payments", "payments_insider_payments_staging"),
+    DataSourceType.PAYMENTS_INSIDER_SALES: ("payments_insider_sales", "payments_insider_sales_staging"),
+    DataSourceType.IPS: ("ips", "ips_staging"),
+    DataSourceType.IPS_CC: ("ips_cc", "ips_cc_staging"),
+    DataSourceType.IPS_MOBILE: ("ips_mobile", "ips_mobile_staging"),
+    DataSourceType.IPS_CASH: ("ips_cash", "ips_cash_staging"),
+    DataSourceType.COIN_COLLECTION: ("coin_collection", "ips_coin_collector_staging"),
+    # Add other mappings if/when needed
+}
+
+# Source types promoted by process_all_staging_tables (those with a main SQL template)
+TEMPLATED_SOURCE_TYPES = (
+    DataSourceType.WINDCAVE, DataSourceType.PAYMENTS_INSIDER_SALES,
+    DataSourceType.IPS, DataSourceType.IPS_CC,
+    DataSourceType.IPS_MOBILE, DataSourceType.IPS_CASH,
+)
+
+# Columns each staging table's loader coerces to nullable Int64 (see DataLoader._finalize_frame)
+_PAYMENTS_INSIDER_INT_COLUMNS = ('store_number', 'store_numbe', 'pos_entry', 'roc_text', 'case_id')
+STAGING_INT_COLUMNS = {
+    WindcaveStaging: ('authorized', 'reco', 'billingid', 'dpsbillingid',
+                      'catid', 'merch_corp_ref', 'order_number', 'voided'),
+    PaymentsInsiderSalesStaging: _PAYMENTS_INSIDER_INT_COLUMNS,
+    PaymentsInsiderPaymentsStaging: _PAYMENTS_INSIDER_INT_COLUMNS,
+    IPSStaging: ('transaction_hour', 'vendor_id', 'unrecognized_coins'),
+    IPSCreditCardStaging: ('batch_number',),
+    IPSMobileStaging: ('space_name', 'prid'),
+    IPSCashStaging: ('coin_total', 'unrecognized_coins', 'coin_reversal_count'),
+    IPSCoinCollectorStaging: ('coin_count', 'bill_count'),
+}
+
+# Inspections written back to Traffic per UPDATE in process_coin_collector
+PCI_UPDATE_BATCH_SIZE = 500
+
+
+@lru_cache(maxsize=None)
+def pci_update_statement(batch_size: int):
+    """The PCI write-back UPDATE for a batch of `batch_size` inspections.
+
+    Cached per size: every full batch reuses one TextClause, so SQLAlchemy
+    doesn't rebuild it and SQL Server sees identical text for its plan cache.
+    """
+    values = ", ".join(f"(:by{i}, :dt{i}, :tid{i})" for i in range(batch_size))
+    return text(f"""
+        UPDATE t
+        SET pciInspectedBy = v.pciInspectedBy, pciInspectedDate = v.pciInspectedDate
+        FROM data_admin8.PU_METERS_TERMINALS t
+        INNER JOIN (VALUES {values}) v (pciInspectedBy, pciInspectedDate, ipsTerminalID)
+            On (v.ipsTerminalID = t.ipsTerminalID)""")
+
+
+# Rows per DataFrame when a report is read in chunks (see read_report)
+REPORT_CHUNK_SIZE = 20000
+
+
+def read_report(file_path: str, **read_kwargs) -> Iterator[pd.DataFrame]:
+    """Yield an uploaded report as DataFrames of up to REPORT_CHUNK_SIZE rows.
+
+    A loader only ever holds one chunk (and its staging rows) in memory.
+    .xlsx files are streamed with openpyxl's read-only reader (see
+    iter_xlsx_frames); legacy .xls files still go through pd.read_excel as a
+    single frame. read_kwargs (dtype, etc.) apply to every reader.
+    """
+    if file_path.endswith('.xlsx'):
+        yield from iter_xlsx_frames(file_path, **read_kwargs)
+    elif file_path.endswith('.xls'):
+        yield pd.read_excel(file_path, **read_kwargs)
+    else:
+        yield from pd.read_csv(file_path, chunksize=REPORT_CHUNK_SIZE, **read_kwargs)
+
+
+def iter_xlsx_frames(file_path: str, dtype: Optional[Dict[str, Any]] = None) -> Iterator[pd.DataFrame]:
+    """Yield the first sheet of an .xlsx file as DataFrames, REPORT_CHUNK_SIZE rows at a time.
+
+    openpyxl's read-only mode parses the sheet XML as a stream instead of
+    building the whole workbook first, the way pd.read_excel does. The first
+    row is the header. As with pd.read_excel, rows are padded or cut to the
+    header's width, and dtype columns given as str keep their nulls. Rows with
+    no values are skipped; read-only sheets yield formatted blank rows (often
+    thousands after the data) as all-None tuples.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [f"Unnamed: {i}" if name is None else str(name) for i, name in enumerate(header)]
+
+        def to_frame(batch):
+            df = pd.DataFrame.from_records(batch, columns=columns)
+            for col, col_type in (dtype or {}).items():
+                if col in df.columns:
+                    df[col] = df[col].where(df[col].isna(), df[col].astype(col_type))
+            return df
+
+        width = len(columns)
+        padding = (None,) * width
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            if len(row) != width:
+                row = (row + padding)[:width]
+            batch.append(row)
+            if len(batch) == REPORT_CHUNK_SIZE:
+                yield to_frame(batch)
+                batch = []
+        if batch:
+            yield to_frame(batch)
+    finally:
+        workbook.close()
+
+
+def parse_datetimes(df: pd.DataFrame, model):
+    """Parse the model's DateTime columns in place; unparseable values become NaT.
+
+    Only the columns the table stores as DateTime are touched, instead of
+    every file column whose name mentions a date.
+    """
+    for col in staging_datetime_columns(model):
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors="coerce")
+
+
+def to_time_of_day(value) -> Optional[time]:
+    """Coerce a raw time cell to datetime.time for the TIME staging columns.
+
+    CSV reports give strings ("9:05:32 AM"); Excel reports may already give
+    datetime.time values. Anything else (NaN, blanks) becomes None.
+    """
+    if isinstance(value, time):
+        return value
+    if isinstance(value, str):
+        return parse_time_string(value)
+    return None
+
+
+def strip_float_suffix(series: pd.Series) -> pd.Series:
+    """Drop a trailing '.0' (or any decimal part) that Excel adds to numeric IDs; nulls pass through."""
+    return series.where(series.isna(), series.astype(str).str.split('.', n=1).str[0])
+
+
+def parse_money(series: pd.Series) -> pd.Series:
+    """'$1,234.50' style strings (or numbers) to float, vectorized; nulls stay NaN."""
+    return pd.to_numeric(series.astype(str).str.replace(r'[$,]', '', regex=True).where(series.notna()))
+
+
+def to_whole_number(series: pd.Series) -> pd.Series:
+    """Numeric-like values truncated to nullable integers (Int64)."""
+    return np.trunc(pd.to_numeric(series)).astype('Int64')
+
+
+def strip_strings(series: pd.Series) -> pd.Series:
+    """Strip whitespace from the string values of an object column; other values are kept."""
+    try:
+        stripped = series.str.strip()
+    except AttributeError:
+        # Column holds no strings at all (e.g. only datetimes and None)
+        return series
+    return stripped.where(stripped.notna(), series)
+
+
+@lru_cache(maxsize=1024)
+def normalize_column_name(name) -> str:
+    """A report header as a staging column name: 'Card Type' -> 'card_type'."""
+    return str(name).strip().lower().replace(" ", "_").replace("/", "").replace("\n", "").replace(".", "")
+
+
+def normalize_columns(columns) -> List[str]:
+    """Normalize every header in one pass over plain strings.
+
+    Replaces a chain of Index.str calls that built a new Index per step;
+    chunked reads repeat the same headers, so each name is only computed once.
+    """
+    return [normalize_column_name(c) for c in columns]
+
+
+def frame_to_rows(df: pd.DataFrame, model) -> Iterator[tuple]:
+    """Yield a cleaned staging DataFrame as staging_row_type(model) tuples.
+
+    Columns are aligned to the table in one vectorized step; columns the file
+    lacks become None and extra file columns are dropped. The frame becomes
+    one object array (numpy scalars boxed to the Python values pyodbc
+    requires) and NaN, NaT and pd.NA are set to None with a single mask
+    assignment, so loaders leave nulls as they are. Rows are produced one
+    batch at a time as bulk_copy consumes them, so no per-row dicts or ORM
+    instances, and never the whole file as Python rows at once.
+    """
+    Row = staging_row_type(model)
+    frame = df.reindex(columns=Row._fields)
+    values = frame.to_numpy(dtype=object)
+    values[frame.isna().to_numpy()] = None
+    for start in range(0, len(values), STAGING_INSERT_BATCH_SIZE):
+        yield from map(Row._make, values[start:start + STAGING_INSERT_BATCH_SIZE].tolist())
+
+
 class ETLProcessor:
     """Main ETL processor for transforming staging data to final transactions"""
     
     def __init__(self, db: Session, traffic_db: Optional[Session] = None, 
-                 org_code_cache: Optional[pd.DataFrame] = None,
+                 org_code_cache: Optional[List[tuple]] = None,
                  location_from_charge_code: Optional[Dict] = None,
-                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 session_factory: Optional[Callable[[], Session]] = None):
         """
         ETLProcessor can accept two session objects:
         - db: primary application DB session (PUReporting)
-        - traffic_db: optional session bound to the Traffic engine
-
-        If `traffic_db` is provided, `get_org_code` will query the Traffic
-        database tables (`PU_PARCS_UCD` and `PU_REVENUE_CREDITCARDTERMINALS`) and
-        return the matching org_code. If not provided, the method falls back to
-        the default behavior (placeholder/None).
+        - traffic_db: optional session bound to the Traffic engine (used by
+          process_coin_collector to write back PCI inspections)
         
         Optional pre-initialized caches can be passed in:
-        - org_code_cache: DataFrame from cache with org code lookup data
+        - org_code_cache: Org code lookup rows (etl_cache.OrgCodeRow tuples)
         - location_from_charge_code: Dict mapping charge codes to location names
+        
+        When not passed, both are taken from etl_cache, which loads the whole
+        Traffic org code table in one query at startup; the processor never
+        looks org codes up per record.
+        
+        session_factory (e.g. app.db.session.SessionLocal) lets
+        process_all_staging_tables give each concurrent source its own session.
         """
         self.db = db
         self.traffic_db = traffic_db
+        self.org_code_cache = org_code_cache if org_code_cache is not None else etl_cache.get_org_code_cache()
+        self.location_from_charge_code = (
+            location_from_charge_code if location_from_charge_code is not None
+            else etl_cache.get_location_from_charge_code()
+        )
+        self.progress_callback = progress_callback
+        self.session_factory = session_factory
 
     def _report_progress(self, payload: Dict[str, Any]):
         """Invoke progress callback if provided. Swallow any exceptions from callback."""
@@ -104,6 +322,13 @@ class ETLProcessor:
             if not main_sql:
                 raise ValueError(f"No main SQL template found for {source_key}")
             
+            # Main templates OUTPUT the staging ids they insert into #etl_inserted,
+            # so the processed flags can be set without re-reading fact_transaction
+            self.db.execute(text(
+                "DROP TABLE IF EXISTS #etl_inserted; "
+                "CREATE TABLE #etl_inserted (staging_record_id INT NOT NULL);"
+            ))
+
             # Execute main SQL: insert successful records into fact_transaction
             result = self.db.execute(text(main_sql), {"file_id": file_id})
             created_count = result.rowcount
@@ -128,19 +353,12 @@ class ETLProcessor:
                 #self.db.execute(text(update_sql), {"file_id": file_id})
             #else:
             # Default: mark all records with created transactions as processed
-            if source_key == 'payments_insider_payments':
+            if "#etl_inserted" in main_sql:
                 default_update = f"""
-                    UPDATE p
-                    SET p.processed_to_final = 1, p.loaded_at = GETDATE()
-                    FROM app.payments_insider_payments_staging p
-                    INNER JOIN app.payments_insider_sales_staging s On (p.card_number=s.card_number and p.authorization_code=s.authorization_code)
-                    WHERE 
-                        p.source_file_id = 342
-                        AND s.id IN (
-                            SELECT staging_record_id
-                            FROM app.fact_transaction
-                            WHERE staging_table = 'payments_insider_sales_staging' AND source_file_id = s.source_file_id
-                            );
+                    UPDATE s
+                    SET processed_to_final = 1, loaded_at = GETDATE()
+                    FROM app.{staging_table} s
+                    WHERE s.id IN (SELECT staging_record_id FROM #etl_inserted);
                 """
             else:
                 default_update = f"""
@@ -154,6 +372,7 @@ class ETLProcessor:
                     );
                 """
             self.db.execute(text(default_update), {"staging_table": staging_table, "file_id": file_id})
+            self.db.execute(text("DROP TABLE IF EXISTS #etl_inserted;"))
             
             # Get total record count
             total_count = self.db.execute(
@@ -161,7 +380,7 @@ class ETLProcessor:
                 {"file_id": file_id}
             ).scalar()
             
-            self.db.commit()
+            # _complete_log commits the inserts and the log entry together
             self._complete_log(log, processed=total_count, created=created_count, updated=0, failed=failed_count)
             
             return {
@@ -180,19 +399,84 @@ class ETLProcessor:
 
     def _get_source_key_and_staging_table(self, data_source_type: DataSourceType) -> tuple:
         """Map DataSourceType to a short source key and staging table name."""
-        mapping = {
-            DataSourceType.WINDCAVE: ("windcave", "windcave_staging"),
-            DataSourceType.PAYMENTS_INSIDER_PAYMENTS: ("payments_insider_payments", "payments_insider_payments_staging"),
-            DataSourceType.PAYMENTS_INSIDER_SALES: ("payments_insider_sales", "payments_insider_sales_staging"),
-            DataSourceType.IPS: ("ips", "ips_staging"),
-            DataSourceType.IPS_CC: ("ips_cc", "ips_cc_staging"),
-            DataSourceType.IPS_MOBILE: ("ips_mobile", "ips_mobile_staging"),
-            DataSourceType.IPS_CASH: ("ips_cash", "ips_cash_staging"),
-            DataSourceType.COIN_COLLECTION: ("coin_collection", "ips_coin_collector_staging"),
-            # Add other mappings if/when needed
-        }
-        return mapping.get(data_source_type, ("unknown", ""))
-    
+        return SOURCE_STAGING_TABLES.get(data_source_type, ("unknown", ""))
+
+    def process_pending(self, data_source_type: DataSourceType, file_id: Optional[int] = None) -> Dict[str, Any]:
+        """Promote one file, or every file with unprocessed staging rows, for a source type.
+
+        Each file goes through process_file: one INSERT ... SELECT per template
+        and one UPDATE of the processed flags, committed together. Nothing here
+        loops over staging rows.
+        """
+        source_key, staging_table = self._get_source_key_and_staging_table(data_source_type)
+        if not staging_table:
+            raise ValueError(f"No staging table mapped for source type: {data_source_type}")
+
+        if file_id is not None:
+            file_ids = [file_id]
+        else:
+            file_ids = [row[0] for row in self.db.execute(text(
+                f"SELECT DISTINCT source_file_id FROM app.{staging_table} "
+                f"WHERE processed_to_final = 0 ORDER BY source_file_id"
+            ))]
+
+        totals = {"success": True, "files_processed": 0, "records_processed": 0,
+                  "records_created": 0, "records_failed": 0}
+        for fid in file_ids:
+            result = self.process_file(fid, source_key, staging_table)
+            totals["files_processed"] += 1
+            for key in ("records_processed", "records_created", "records_failed"):
+                totals[key] += result[key]
+        return totals
+
+    def process_windcave(self, file_id: Optional[int] = None) -> Dict[str, Any]:
+        return self.process_pending(DataSourceType.WINDCAVE, file_id)
+
+    def process_payments_insider(self, file_id: Optional[int] = None) -> Dict[str, Any]:
+        return self.process_pending(DataSourceType.PAYMENTS_INSIDER_SALES, file_id)
+
+    def process_ips_cash(self, file_id: Optional[int] = None) -> Dict[str, Any]:
+        return self.process_pending(DataSourceType.IPS_CASH, file_id)
+
+    def process_all_staging_tables(self, file_id: Optional[int] = None, parallel: bool = True) -> Dict[str, Dict[str, Any]]:
+        """Run process_pending for every source type that has a main SQL template.
+
+        The sources read disjoint staging tables, so when the processor has a
+        session_factory they run concurrently, each on its own session
+        (Sessions are not thread-safe). parallel=False, or no factory, runs
+        them one after another on self.db.
+        """
+        if parallel and self.session_factory is not None:
+            with ThreadPoolExecutor(max_workers=len(TEMPLATED_SOURCE_TYPES)) as executor:
+                futures = {
+                    data_source_type: executor.submit(self._process_pending_in_new_session, data_source_type, file_id)
+                    for data_source_type in TEMPLATED_SOURCE_TYPES
+                }
+        else:
+            futures = None
+
+        results = {}
+        for data_source_type in TEMPLATED_SOURCE_TYPES:
+            source_key, _ = self._get_source_key_and_staging_table(data_source_type)
+            try:
+                if futures is not None:
+                    results[source_key] = futures[data_source_type].result()
+                else:
+                    results[source_key] = self.process_pending(data_source_type, file_id)
+            except Exception as e:
+                results[source_key] = {"success": False, "error": str(e)}
+        return results
+
+    def _process_pending_in_new_session(self, data_source_type: DataSourceType, file_id: Optional[int]) -> Dict[str, Any]:
+        """process_pending on a fresh session from session_factory; for worker threads"""
+        db = self.session_factory()
+        try:
+            processor = ETLProcessor(db, org_code_cache=self.org_code_cache,
+                                     location_from_charge_code=self.location_from_charge_code)
+            return processor.process_pending(data_source_type, file_id)
+        finally:
+            db.close()
+
 
      
     def process_zms_cash(self, process_date: str = datetime.strftime(datetime.now() - timedelta(1), '%Y-%m-%d')) -> Dict[str, Any]:
@@ -304,22 +588,23 @@ class ETLProcessor:
         recent_inspection['pciInspectedDate'] = pd.to_datetime(recent_inspection['date'])
         recent_inspection['pciInspectedBy'] = recent_inspection['card_name']
 
-        # This is the SQL update statement to use
-        stmt = text("""
-                    UPDATE 
-                        data_admin8.PU_METERS_TERMINALS 
-                    SET pciInspectedBy = :pciInspectedBy, pciInspectedDate = :pciInspectedDate 
-                    WHERE 
-                        ipsTerminalID = :ipsTerminalID""")
-
-        # Loop through each inspection and update the SDE table
+        # Update the SDE table with one UPDATE ... FROM (VALUES ...) per batch
+        # instead of one round-trip per terminal. Three parameters per row keeps
+        # a batch well under SQL Server's 2100-parameter limit.
+        inspections = list(zip(
+            recent_inspection['pciInspectedBy'],
+            recent_inspection['pciInspectedDate'].dt.to_pydatetime(),
+            recent_inspection['ipsTerminalID']
+        ))
         updated_count = 0
-        for index, row in recent_inspection.iterrows():
-            result = self.traffic_db.execute(stmt, {
-                "pciInspectedBy": row['pciInspectedBy'],
-                "pciInspectedDate": row['pciInspectedDate'],
-                "ipsTerminalID": row['ipsTerminalID']
-            })
+        for start in range(0, len(inspections), PCI_UPDATE_BATCH_SIZE):
+            batch = inspections[start:start + PCI_UPDATE_BATCH_SIZE]
+            params = {}
+            for i, (inspected_by, inspected_date, terminal_id) in enumerate(batch):
+                params[f"by{i}"] = inspected_by
+                params[f"dt{i}"] = inspected_date
+                params[f"tid{i}"] = terminal_id
+            result = self.traffic_db.execute(pci_update_statement(len(batch)), params)
             updated_count += result.rowcount
 
         self.traffic_db.commit()
@@ -439,6 +724,47 @@ class DataLoader:
             # Add other mappings as needed
             }
     
+    def _mark_file_processed(self, file_id: int, record_count: int):
+        """Flag the uploaded file as loaded in the current transaction (one UPDATE, no SELECT); the caller commits"""
+        self.db.query(UploadedFile).filter(UploadedFile.id == file_id).update({
+            UploadedFile.is_processed: True,
+            UploadedFile.processed_at: datetime.now(),
+            UploadedFile.records_processed: record_count,
+        }, synchronize_session=False)
+
+    def _finalize_frame(self, df: pd.DataFrame, model, file_id: int) -> pd.DataFrame:
+        """The steps every loader shares: tag rows with the file, parse the
+        table's DateTime columns and coerce its STAGING_INT_COLUMNS to Int64"""
+        # --- Add metadata columns ---
+        df["source_file_id"] = file_id
+        df["processed_to_final"] = False
+
+        # --- Parse the table's DateTime columns ---
+        parse_datetimes(df, model)
+
+        # --- Handle integer columns as nullable Int64 ---
+        for col in STAGING_INT_COLUMNS.get(model, ()):
+            if col in df.columns:
+                df[col] = to_whole_number(df[col])
+        return df
+
+    def _bulk_load(self, model, frames: Iterable[pd.DataFrame], file_id: int) -> int:
+        """Insert cleaned frames into the model's staging table and mark the file processed.
+
+        Frames are converted to staging rows as bulk_copy consumes them, and a
+        single commit covers the rows and the UploadedFile update.
+        """
+        records = chain.from_iterable(frame_to_rows(df, model) for df in frames)
+
+        # --- Bulk insert through the driver's fast path ---
+        record_count = bulk_copy(self.db, model, records)
+
+        # --- Mark the file processed; one commit covers it and its rows ---
+        self._mark_file_processed(file_id, record_count)
+        self.db.commit()
+
+        return record_count
+
     def load(self, file_path: str, file_id: int) -> int:
         """Dispatch the correct load method based on data_source_type"""
         loader_method = self.mapping.get(self.data_source_type)
@@ -449,68 +775,29 @@ class DataLoader:
 
     def load_windcave_csv(self, file_path: str, file_id: int) -> int:
         """Load Windcave CSV to staging table"""
-        
-        if file_path.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path)
-        else:
-            df = pd.read_csv(file_path)
-        
-        # --- Normalize column names ---
-        df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_").str.replace("/","").str.replace('\n','').str.replace('.','')
+        return self._bulk_load(WindcaveStaging, self._windcave_frames(file_path, file_id), file_id)
     
-        # --- Add metadata columns ---
-        df["source_file_id"] = file_id
-        df["processed_to_final"] = False
+    def _windcave_frames(self, file_path: str, file_id: int) -> Iterator[pd.DataFrame]:
+        """Yield the cleaned Windcave report, one read_report chunk at a time"""
+        for df in read_report(file_path):
+            # --- Normalize column names ---
+            df.columns = normalize_columns(df.columns)
+    
+            # --- Convert large integers to string ---
+            df['caid'] = df['caid'].astype(str)
+            df['cardnumber2'] = df['cardnumber2'].astype(str)
 
-        # --- Convert datetimes where possible ---
-        for col in df.columns:
-            if "date" in col or "time" in col:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception:
-                    pass
+            # --- Parse, tag and coerce the table's columns ---
+            df = self._finalize_frame(df, WindcaveStaging, file_id)
 
-        # --- Convert large integers to string ---
-        df['caid'] = df['caid'].astype(str)
-        df['cardnumber2'] = df['cardnumber2'].astype(str)
+            # --- Remove transactions from other agencies ---
+            df = df[df['group_account'].isin(['CityofMadison_Att', 'CityofMadison_Unatt'])]
 
-        # --- Handle integer columns - replace NaN with None ---
-        int_columns = ['authorized', 'reco', 'billingid', 'dpsbillingid', 
-                   'catid', 'merch_corp_ref', 'order_number', 'voided']
-        
-        for col in int_columns:
-            if col in df.columns:
-                # Convert to nullable integer type or replace NaN with None
-                df[col] = df[col].replace({pd.NA: None, np.nan: None})
-                # Convert to int where not None
-                df.loc[df[col].notna(), col] = df[col].loc[df[col].notna()].astype(int)
-        
-        # --- Convert pandas NaN to None for SQL ---
-        df = df.replace({pd.NA: None, np.nan: None, pd.NaT: None})
-        
-        # --- Remove transactions from other agencies ---
-        df = df[df['group_account'].isin(['CityofMadison_Att', 'CityofMadison_Unatt'])]
+            # --- Remove voided transactions ---
+            df = df[(df['voided'] == 0).fillna(False)]
 
-        # --- Remove voided transactions ---
-        df = df[df['voided'] == 0]
+            yield df
 
-        # --- Convert to list of dictionaries ---
-        records = df.to_dict(orient="records")
-
-        # --- Bulk insert using SQLAlchemy ---
-        self.db.execute(insert(WindcaveStaging), records)
-        self.db.commit()
-        
-        # Update file as processed
-        file_record = self.db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
-        if file_record:
-            file_record.is_processed = True
-            file_record.processed_at = datetime.now()
-            file_record.records_processed = len(records)
-            self.db.commit()
-        
-        return len(records)
-    
     def load_payments_insider(self, file_path: str, file_id: int, report_type: Optional[str] = None) -> int:
         """Load Payments Insider report to staging table"""
 
@@ -522,6 +809,8 @@ class DataLoader:
             if 'payments' in self.data_source_type.value.lower():
                 report_type = 'Payments'
         
+        model = PaymentsInsiderSalesStaging if report_type == 'Sales' else PaymentsInsiderPaymentsStaging
+
         # Establish dtypes
         set_dtypes = {'MID':str, 'Merchant ID':str, 'Terminal ID':str, 'GBOK / Batch ID':str, 'Payment No.':str}
         
@@ -532,37 +821,15 @@ class DataLoader:
             df = pd.read_csv(file_path, skiprows=2, dtype=set_dtypes)
 
         # --- Normalize column names ---
-        df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_").str.replace("/","").str.replace('\n','').str.replace('.','')
+        df.columns = normalize_columns(df.columns)
 
-        # --- Add metadata columns ---
-        df["source_file_id"] = file_id
-        df["processed_to_final"] = False
-        
-        # --- Convert datetimes where possible ---
-        for col in df.columns:
-            if "date" in col:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception:
-                    pass
+        # --- Parse time-of-day once at load (TIME column) ---
+        if 'transaction_time' in df.columns:
+            df['transaction_time'] = df['transaction_time'].map(to_time_of_day)
+
+        # --- Parse, tag and coerce the table's columns ---
+        df = self._finalize_frame(df, model, file_id)
 
-        # --- Handle integer columns - replace NaN with None ---
-        int_columns = ['store_number', 'store_numbe', 'pos_entry', 'roc_text', 'case_id']
-        
-        for col in int_columns:
-            if col in df.columns:
-                # Create a mask for non-null values
-                mask = df[col].notna()
-                
-                # Only process if there are non-null values
-                if mask.any():
-                    df.loc[mask, col] = df.loc[mask, col].astype(int)
-                
-                # Replace NaN with None after conversion
-                df[col] = df[col].replace({pd.NA: None, np.nan: None})
-        
-        # --- Convert pandas NaN to None for SQL ---
-        df = df.replace({pd.NA: None, np.nan: None, pd.NaT: None})
         # --- Remove voided transactions (Sales files only) ---
         # Some Payments files do not include a `void_ind` column; guard against that.
         if report_type == 'Sales' and 'void_ind' in df.columns:
@@ -579,29 +846,7 @@ class DataLoader:
         if 'merchant_id' in df.columns:
             df = df[df['merchant_id'] == '8016090345']
 
-        # --- Check if there are any records ---
-        if df.shape[0] > 0:
-            # --- Convert to list of dictionaries ---
-            records = df.to_dict(orient="records")
-
-            # --- Bulk insert using SQLAlchemy ---
-            if report_type == 'Sales':
-                self.db.execute(insert(PaymentsInsiderSalesStaging), records)
-            else:
-                self.db.execute(insert(PaymentsInsiderPaymentsStaging), records)
-            self.db.commit()
-        else:
-            records = []
-
-        # Update file as processed
-        file_record = self.db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
-        if file_record:
-            file_record.is_processed = True
-            file_record.processed_at = datetime.now()
-            file_record.records_processed = len(records)
-            self.db.commit()
-        
-        return len(records)
+        return self._bulk_load(model, [df], file_id)
     
 
     def load_ips(self, file_path: str, file_id: int, convenience_fee: float = 0.45) -> int:
@@ -620,37 +865,19 @@ class DataLoader:
         df = df[df['Date'].notna()]
 
         # --- Normalize column names ---
-        df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_").str.replace("/","").str.replace('\n','').str.replace('.','')
+        df.columns = normalize_columns(df.columns)
         df.rename(columns=({'card_#':'card_number'}), inplace=True)
 
-        # --- Add metadata columns ---
+        # --- Add the convenience fee for remote payments ---
         df.loc[df['transaction_type'] == 'Remote/PBC', 'convenience_fee'] = convenience_fee
-        df["source_file_id"] = file_id
-        df["processed_to_final"] = False
 
         # --- Make sure these columns are floats ---
         for col in ['credit_card', 'smart_card', 'total', 'coin', 'bills']:
             if col in df.columns:
                 df[col] = df[col].astype(float)
 
-        # --- Convert datetimes where possible ---
-        for col in df.columns:
-            if "date" in col:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception:
-                    pass
-
-        # --- Handle integer columns - replace NaN with None ---
-        int_columns = ['transaction_hour', 'vendor_id', 'unrecognized_coins']
-
-        for col in int_columns:
-            if col in df.columns:
-                # Convert to int, replacing NaN with None
-                df[col] = df[col].apply(lambda x: int(float(x)) if pd.notna(x) else None)
-
-        # --- Convert pandas NaN to None for SQL ---
-        df = df.replace({pd.NA: None, np.nan: None, pd.NaT: None})
+        # --- Parse, tag and coerce the table's columns ---
+        df = self._finalize_frame(df, IPSStaging, file_id)
 
         # --- Remove failed transactions / Transactions where no money was paid ---
         df = df[df['total'] > 0]
@@ -658,288 +885,121 @@ class DataLoader:
         # --- Remove .0 from STRING columns only (pole and terminal) ---
         for col in ['pole', 'terminal']:
             if col in df.columns:
-                df[col] = df[col].apply(lambda x: str(x).split('.')[0] if pd.notna(x) else x)
+                df[col] = strip_float_suffix(df[col])
 
         # --- Strip trailing whitespace from all string columns ---
         for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
-
-        
-        # --- Bulk inser using Pandas to_sql ---
-        try:
-            df.to_sql(name='ips_staging', schema='app', con=self.db.bind, if_exists='append', index=False, method=None, chunksize=1000)
-        
-            # Update file as processed
-            file_record = self.db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
-            if file_record:
-                file_record.is_processed = True
-                file_record.processed_at = datetime.now()
-                file_record.records_processed = len(df)
-                self.db.commit()
-        except Exception as e:
-            print(f"Error inserting data: {e}")
+            df[col] = strip_strings(df[col])
 
-        return len(df)
+        return self._bulk_load(IPSStaging, [df], file_id)
         
 
     def load_ips_credit(self, file_path: str, file_id: int, convenience_fee: float = 0.45) -> int:
         """Load IPS data to staging table"""
-        
-        # Determine if Excel or CSV
-        if file_path.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path)
-        else:
-            df = pd.read_csv(file_path)
+        return self._bulk_load(IPSCreditCardStaging, self._ips_credit_frames(file_path, file_id), file_id)
 
-        # --- Check for a sum or total at the bottom of the report and remove it ---
-        df = df[df['Transaction Date Time'].notna()]
+    def _ips_credit_frames(self, file_path: str, file_id: int) -> Iterator[pd.DataFrame]:
+        """Yield the cleaned IPS credit card report, one read_report chunk at a time"""
+        for df in read_report(file_path):
+            # --- Check for a sum or total at the bottom of the report and remove it ---
+            df = df[df['Transaction Date Time'].notna()]
         
-        # --- Normalize column names ---
-        df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_").str.replace("/","").str.replace('\n','').str.replace('.','')
-        df.rename(columns=({'amount_($)':'amount', '$ Paid':'paid', '$0.01':'pennies', '$0.05':'nickels', '$0.10':'dimes', '$0.25':'quarters', '$1.00':'dollars'}), inplace=True)
+            # --- Normalize column names ---
+            df.columns = normalize_columns(df.columns)
+            df.rename(columns=({'amount_($)':'amount', '$ Paid':'paid', '$0.01':'pennies', '$0.05':'nickels', '$0.10':'dimes', '$0.25':'quarters', '$1.00':'dollars'}), inplace=True)
         
-        # --- Make sure these columns are floats
-        for col in ['amount']:
-            df[col] = df[col].astype(float)
+            # --- Make sure these columns are floats
+            for col in ['amount']:
+                df[col] = df[col].astype(float)
             
-        # --- Add metadata columns ---
-        df["source_file_id"] = file_id
-        df["processed_to_final"] = False
-        
-        # --- Convert datetimes where possible ---
-        for col in df.columns:
-            if "date" in col:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception:
-                    pass
-                    
-        # --- Handle integer columns - replace NaN with None ---
-        int_columns = ['batch_number']
-        
-        for col in int_columns:
-            if col in df.columns:
-                # Convert to nullable integer type or replace NaN with None
-                df[col] = df[col].replace({pd.NA: None, np.nan: None})
-                # Convert to int where not None
-                df.loc[df[col].notna(), col] = df[col].loc[df[col].notna()].astype(int)
-                
-        # --- Convert pandas NaN to None for SQL ---
-        df = df.replace({pd.NA: None, np.nan: None, pd.NaT: None})
-
-        # --- Remove .0 from Pole Ser No if present ---
-        df['pole'] = df['pole'].apply(lambda x: str(x).split('.')[0] if pd.notna(x) else x)
-        
-        # --- Convert to list of dictionaries ---
-        records = df.to_dict(orient="records")
-        
-        # --- Bulk insert using SQLAlchemy ---
-        self.db.execute(insert(IPSCreditCardStaging), records)
-        self.db.commit()
+            # --- Remove .0 from Pole Ser No if present ---
+            df['pole'] = strip_float_suffix(df['pole'])
 
-        # Update file as processed
-        file_record = self.db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
-        if file_record:
-            file_record.is_processed = True
-            file_record.processed_at = datetime.now()
-            file_record.records_processed = len(records)
-            self.db.commit()
-        
-        return len(records)
+            # --- Parse, tag and coerce the table's columns ---
+            df = self._finalize_frame(df, IPSCreditCardStaging, file_id)
+
+            yield df
 
     def load_ips_mobile(self, file_path: str, file_id: int, convenience_fee: float = 0.45) -> int:
         """Load IPS data to staging table"""
-        
-        # Determine if Excel or CSV
-        if file_path.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path)
-        else:
-            df = pd.read_csv(file_path)
+        return self._bulk_load(IPSMobileStaging, self._ips_mobile_frames(file_path, file_id, convenience_fee), file_id)
 
-        # --- Check for a sum or total at the bottom of the report and remove it ---
-        df = df[df['Received Date Time'].notna()]
-        df['convenience_fee'] = convenience_fee
+    def _ips_mobile_frames(self, file_path: str, file_id: int, convenience_fee: float) -> Iterator[pd.DataFrame]:
+        """Yield the cleaned IPS mobile report, one read_report chunk at a time"""
+        for df in read_report(file_path):
+            # --- Check for a sum or total at the bottom of the report and remove it ---
+            df = df[df['Received Date Time'].notna()]
+            df['convenience_fee'] = convenience_fee
         
-        # --- Normalize column names ---
-        df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_").str.replace("/","").str.replace('\n','').str.replace('.','')
-        df.rename(columns=({'Amount ($)':'amount', '$_paid':'paid', '$0.01':'pennies', '$0.05':'nickels', '$0.10':'dimes', '$0.25':'quarters', '$1.00':'dollars'}), inplace=True)
+            # --- Normalize column names ---
+            df.columns = normalize_columns(df.columns)
+            df.rename(columns=({'Amount ($)':'amount', '$_paid':'paid', '$0.01':'pennies', '$0.05':'nickels', '$0.10':'dimes', '$0.25':'quarters', '$1.00':'dollars'}), inplace=True)
 
-        # --- Make sure the paid column is a float ---
-        df['paid'] = df['paid'].astype(float)
+            # --- Make sure the paid column is a float ---
+            df['paid'] = df['paid'].astype(float)
         
-        # --- Add metadata columns ---
-        df["source_file_id"] = file_id
-        df["processed_to_final"] = False
+            # --- Remove .0 from Pole Ser No if present ---
+            df['pole'] = strip_float_suffix(df['pole'])
 
-        # --- Convert datetimes where possible ---
-        for col in df.columns:
-            if "date" in col:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception:
-                    pass
-
-        # --- Handle integer columns - replace NaN with None ---
-        int_columns = ['space_name', 'prid']
-        
-        for col in int_columns:
-            if col in df.columns:
-                # Convert to nullable integer type or replace NaN with None
-                df[col] = df[col].replace({pd.NA: None, np.nan: None})
-                # Convert to int where not None
-                df.loc[df[col].notna(), col] = df[col].loc[df[col].notna()].astype(int)
-                
-        # --- Convert pandas NaN to None for SQL ---
-        df = df.replace({pd.NA: None, np.nan: None, pd.NaT: None})
-
-        # --- Remove .0 from Pole Ser No if present ---
-        df['pole'] = df['pole'].apply(lambda x: str(x).split('.')[0] if pd.notna(x) else x)
-        
-        # --- Convert to list of dictionaries ---
-        records = df.to_dict(orient="records")
-        
-        # --- Bulk insert using SQLAlchemy ---
-        self.db.execute(insert(IPSMobileStaging), records)
-        self.db.commit()
+            # --- Parse, tag and coerce the table's columns ---
+            df = self._finalize_frame(df, IPSMobileStaging, file_id)
 
-        # Update file as processed
-        file_record = self.db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
-        if file_record:
-            file_record.is_processed = True
-            file_record.processed_at = datetime.now()
-            file_record.records_processed = len(records)
-            self.db.commit()
-            
-        return len(records)
+            yield df
 
     def load_ips_cash(self, file_path: str, file_id: int) -> int:
         """Load IPS data to staging table"""
-        
-        # Determine if Excel or CSV
-        if file_path.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path, dtype={'Terminal':'str'})
-        else:
-            df = pd.read_csv(file_path, dtype={'Terminal':'str'})
+        return self._bulk_load(IPSCashStaging, self._ips_cash_frames(file_path, file_id), file_id)
 
-        # --- Check for a sum or total at the bottom of the report and remove it ---
-        df = df[df['Collection Date'].notna()]
+    def _ips_cash_frames(self, file_path: str, file_id: int) -> Iterator[pd.DataFrame]:
+        """Yield the cleaned IPS cash collection report, one read_report chunk at a time"""
+        for df in read_report(file_path, dtype={'Terminal':'str'}):
+            # --- Check for a sum or total at the bottom of the report and remove it ---
+            df = df[df['Collection Date'].notna()]
         
-        # --- Normalize column names ---
-        df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_").str.replace("/","").str.replace('\n','').str.replace('.','')
-        df.rename(columns=({'Amount ($)':'amount', '$_paid':'paid', '$001':'pennies', '$005':'nickels', '$010':'dimes', '$025':'quarters', '$100':'dollars'}), inplace=True)
+            # --- Normalize column names ---
+            df.columns = normalize_columns(df.columns)
+            df.rename(columns=({'Amount ($)':'amount', '$_paid':'paid', '$001':'pennies', '$005':'nickels', '$010':'dimes', '$025':'quarters', '$100':'dollars'}), inplace=True)
 
-        # --- Make sure these columns are floats
-        for col in ['pennies', 'nickels', 'dimes', 'quarters', 'dollars']:
-            df[col] = df[col].astype(float)
+            # --- Make sure these columns are floats
+            for col in ['pennies', 'nickels', 'dimes', 'quarters', 'dollars']:
+                df[col] = df[col].astype(float)
         
-        # --- Add metadata columns ---
-        df["source_file_id"] = file_id
-        df["processed_to_final"] = False
+            # --- Parse time-of-day once at load (TIME column) ---
+            df['collection_time'] = df['collection_time'].map(to_time_of_day)
 
-        # --- Convert datetimes where possible ---
-        for col in df.columns:
-            if "date" in col:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception:
-                    pass
-                    
-        # --- Handle integer columns - replace NaN with None ---
-        int_columns = ['coin_total', 'unrecognized_coins', 'coin_reversal_count']
-        
-        for col in int_columns:
-            if col in df.columns:
-                # Convert to nullable integer type or replace NaN with None
-                df[col] = df[col].replace({pd.NA: None, np.nan: None})
-                # Convert to int where not None
-                df.loc[df[col].notna(), col] = df[col].loc[df[col].notna()].astype(int)
-                
-        # --- Convert pandas NaN to None for SQL ---
-        df = df.replace({pd.NA: None, np.nan: None, pd.NaT: None})
-
-        # --- Remove .0 from Pole Ser No if present ---
-        df['pole_ser_no'] = df['pole_ser_no'].apply(lambda x: str(x).split('.')[0] if pd.notna(x) else x)
-        
-        # --- Convert to list of dictionaries ---
-        records = df.to_dict(orient="records")
-        
-        # --- Bulk insert using SQLAlchemy ---
-        self.db.execute(insert(IPSCashStaging), records)
-        self.db.commit()
+            # --- Remove .0 from Pole Ser No if present ---
+            df['pole_ser_no'] = strip_float_suffix(df['pole_ser_no'])
 
-        # --- Update file as processed ---
-        file_record = self.db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
-        if file_record:
-            file_record.is_processed = True
-            file_record.processed_at = datetime.now()
-            file_record.records_processed = len(records)
-            self.db.commit()
-        
-        return len(records)
+            # --- Parse, tag and coerce the table's columns ---
+            df = self._finalize_frame(df, IPSCashStaging, file_id)
 
+            yield df
 
     def load_ips_coin_collection(self, file_path: str, file_id: int) -> int:
         """Load IPS coin collection data to staging table"""
-        
-        # Determine if Excel or CSV
-        if file_path.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(file_path, dtype={'Card Number': 'str', 'Terminal': 'str', 'Pole':'str'})
-        else:
-            df = pd.read_csv(file_path, dtype={'Card Number': 'str', 'Terminal': 'str', 'Pole':'str'})
+        return self._bulk_load(IPSCoinCollectorStaging, self._ips_coin_collection_frames(file_path, file_id), file_id)
 
-        # --- Check for a sum or total at the bottom of the report and remove it ---
-        df = df[df['Date'].notna()]
+    def _ips_coin_collection_frames(self, file_path: str, file_id: int) -> Iterator[pd.DataFrame]:
+        """Yield the cleaned IPS coin collection report, one read_report chunk at a time"""
+        for df in read_report(file_path, dtype={'Card Number': 'str', 'Terminal': 'str', 'Pole':'str'}):
+            # --- Check for a sum or total at the bottom of the report and remove it ---
+            df = df[df['Date'].notna()]
         
-        # --- Normalize column names ---
-        df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_").str.replace("/","").str.replace('\n','').str.replace('.','')
-        df.rename(columns=({'Amount ($)':'amount', '$_paid':'paid', '$001':'pennies', '$005':'nickels', '$010':'dimes', '$025':'quarters', '$100':'dollars'}), inplace=True)
+            # --- Normalize column names ---
+            df.columns = normalize_columns(df.columns)
+            df.rename(columns=({'Amount ($)':'amount', '$_paid':'paid', '$001':'pennies', '$005':'nickels', '$010':'dimes', '$025':'quarters', '$100':'dollars'}), inplace=True)
 
-        # --- Make sure these columns are floats
-        for col in ['collected_coin_amount', 'coin_running_total', 'collected_bill_amount', 'bill_running_total']:
-            df[col] = df[col].apply(lambda x: float(x.replace('$','').replace(',','')) if pd.notna(x) else x)
-            #df[col] = df[col].astype(float)
+            # --- Make sure these columns are floats
+            for col in ['collected_coin_amount', 'coin_running_total', 'collected_bill_amount', 'bill_running_total']:
+                df[col] = parse_money(df[col])
+                #df[col] = df[col].astype(float)
         
-        # --- Add metadata columns ---
-        df["source_file_id"] = file_id
-        df["processed_to_final"] = False
+            # --- Remove $ or comma from coin_count and bill_count if present ---
+            for col in ['coin_count', 'bill_count']:
+                if col in df.columns:
+                    df[col] = parse_money(df[col])
 
-        # --- Convert datetimes where possible ---
-        for col in df.columns:
-            if "date" in col:
-                try:
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                except Exception:
-                    pass
+            # --- Parse, tag and coerce the table's columns ---
+            df = self._finalize_frame(df, IPSCoinCollectorStaging, file_id)
 
-         
-        # --- Handle integer columns - replace NaN with None ---
-        int_columns = ['coin_count', 'bill_count']
-        
-        for col in int_columns:
-            if col in df.columns:
-                # --- Remove $ or comma from coin_count and bill_count if present ---
-                df[col] = df[col].apply(lambda x: int(float(x.replace('$','').replace(',',''))) if pd.notna(x) else x)
-                # Convert to nullable integer type or replace NaN with None
-                df[col] = df[col].replace({pd.NA: None, np.nan: None})
-                # Convert to int where not None
-                df.loc[df[col].notna(), col] = df[col].loc[df[col].notna()].astype(float).astype(int)
-                
-        # --- Convert pandas NaN to None for SQL ---
-        df = df.replace({pd.NA: None, np.nan: None, pd.NaT: None})
-
-        # --- Convert to list of dictionaries ---
-        records = df.to_dict(orient="records")
-        
-        # --- Bulk insert using SQLAlchemy ---
-        self.db.execute(insert(IPSCoinCollectorStaging), records)
-        self.db.commit()
-
-        # --- Update file as processed ---
-        file_record = self.db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
-        if file_record:
-            file_record.is_processed = True
-            file_record.processed_at = datetime.now()
-            file_record.records_processed = len(records)
-            self.db.commit()
-        
-        return len(records)
\ No newline at end of file
+            yield df
@@ -29,8 +29,8 @@ SELECT
     END AS reject_reason_code,
     GETDATE() rejected_at,
     s.pole_ser_no,
-    CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.collection_date AS DATE), 120) + ' ' + s.collection_time) transaction_datetime,
-    s.coin_revenue,
+    (CAST(CAST(s.collection_date AS DATE) AS DATETIME) + CAST(s.collection_time AS DATETIME)) transaction_datetime,
+    s.coin_revenue / 100.0,
     COALESCE(CAST(pm.payment_method_id As VARCHAR(50)), 'NO_PAYMENT_METHOD') payment_method,
     COALESCE(CAST(d.device_id As VARCHAR(50)), 'DEVICE_NOT_FOUND') device_id,
     COALESCE(CAST(ss.settlement_system_id As VARCHAR(50)), 'SETTLEMENT_SYSTEM_NOT_FOUND') settlement_system_id,
@@ -39,8 +39,8 @@ SELECT
 FROM app.ips_cash_staging s
 LEFT JOIN app.dim_device d ON (d.device_terminal_id = s.pole_ser_no)
 LEFT JOIN app.fact_device_assignment da ON (da.device_id = d.device_id 
-                                            AND CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.collection_date AS DATE), 120) + ' ' + s.collection_time) >= da.assign_date 
-                                            AND CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.collection_date AS DATE), 120) + ' ' + s.collection_time) < COALESCE(da.end_date, '9999-12-31'))
+                                            AND (CAST(CAST(s.collection_date AS DATE) AS DATETIME) + CAST(s.collection_time AS DATETIME)) >= da.assign_date 
+                                            AND (CAST(CAST(s.collection_date AS DATE) AS DATETIME) + CAST(s.collection_time AS DATETIME)) < COALESCE(da.end_date, '9999-12-31'))
 LEFT JOIN app.dim_payment_method pm On ('Cash'=pm.payment_method_brand)
 LEFT JOIN app.dim_charge_code cc On (da.location_id=cc.location_id AND 1=cc.program_type_id)
 LEFT JOIN app.dim_settlement_system ss On (ss.system_name='IPS')
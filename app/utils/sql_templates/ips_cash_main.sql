@@ -1,9 +1,26 @@
 -- IPS Cash main SQL. Use file_id parameter.
+INSERT INTO app.fact_transaction (
+    transaction_date,
+    transaction_amount,
+    settle_date,
+    settle_amount,
+    staging_table,
+    source_file_id,
+    staging_record_id,
+    payment_method_id,
+    device_id,
+    settlement_system_id,
+    location_id,
+    program_id,
+    charge_code_id,
+    reference_number
+)
+OUTPUT inserted.staging_record_id INTO #etl_inserted (staging_record_id)
 SELECT
-    CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.collection_date AS DATE), 120) + ' ' + s.collection_time) transaction_date,
-    s.coin_revenue transaction_amount,
-    CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.collection_date AS DATE), 120) + ' ' + s.collection_time) settle_date,
-    s.coin_revenue settle_amount,
+    (CAST(CAST(s.collection_date AS DATE) AS DATETIME) + CAST(s.collection_time AS DATETIME)) transaction_date,
+    s.coin_revenue / 100.0 transaction_amount,
+    (CAST(CAST(s.collection_date AS DATE) AS DATETIME) + CAST(s.collection_time AS DATETIME)) settle_date,
+    s.coin_revenue / 100.0 settle_amount,
     'ips_cash_staging' staging_table,
     s.source_file_id,
     s.id staging_record_id, 
@@ -17,8 +34,8 @@ SELECT
 FROM app.ips_cash_staging s
 INNER JOIN app.dim_device d ON (d.device_terminal_id = s.pole_ser_no)
 INNER JOIN app.fact_device_assignment da ON (da.device_id = d.device_id 
-                                            AND CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.collection_date AS DATE), 120) + ' ' + s.collection_time) >= da.assign_date 
-                                            AND CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.collection_date AS DATE), 120) + ' ' + s.collection_time) < COALESCE(da.end_date, '9999-12-31'))
+                                            AND (CAST(CAST(s.collection_date AS DATE) AS DATETIME) + CAST(s.collection_time AS DATETIME)) >= da.assign_date 
+                                            AND (CAST(CAST(s.collection_date AS DATE) AS DATETIME) + CAST(s.collection_time AS DATETIME)) < COALESCE(da.end_date, '9999-12-31'))
 --INNER JOIN app.dim_payment_method pm On (s.partner_name=pm.payment_method_brand)
 INNER JOIN app.dim_location l On (l.location_id=da.location_id)
 INNER JOIN app.dim_charge_code cc On (da.location_id=cc.location_id AND 1=cc.program_type_id)
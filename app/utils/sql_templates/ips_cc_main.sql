@@ -15,6 +15,7 @@ INSERT INTO app.fact_transaction (
     charge_code_id,
     reference_number
 )
+OUTPUT inserted.staging_record_id INTO #etl_inserted (staging_record_id)
 SELECT
     s.transaction_date_time transaction_date, 
     s.amount transaction_amount, 
@@ -18,6 +18,7 @@ INSERT INTO app.fact_transaction (
     charge_code_id,
     reference_number
 )
+OUTPUT inserted.staging_record_id INTO #etl_inserted (staging_record_id)
 SELECT
     CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.date AS DATE), 120) + ' ' + s.time) transaction_date,
     s.total transaction_amount, 
@@ -1,10 +1,12 @@
 -- SQL to update fact_transaction with settle_date and settle_amount from payments_insider_payments_staging
 -- Assumes that payments_insider_sales_staging has already been processed into fact_transaction
+-- The matched payment ids go to #etl_inserted, so process_file flags exactly those rows
 UPDATE t 
 SET 
     t.settle_date = p.payment_date,
     t.settle_amount = p.transaction_amount,
     t.updated_at = GETDATE()
+OUTPUT p.id INTO #etl_inserted (staging_record_id)
 FROM
     app.fact_transaction t
 INNER JOIN app.payments_insider_sales_staging s On (s.id = t.staging_record_id)
@@ -29,7 +29,7 @@ INSERT INTO app.fact_transaction_reject (
     END AS reject_reason_code,
     GETDATE(),
     s.terminal_id,
-    CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.transaction_date AS DATE), 120) + ' ' + s.transaction_time) transaction_date, 
+    (CAST(CAST(s.transaction_date AS DATE) AS DATETIME) + CAST(s.transaction_time AS DATETIME)) transaction_date, 
     s.transaction_amount, 
     COALESCE(CAST(pm.payment_method_id As VARCHAR(50)), 'NO_PAYMENT_METHOD') payment_method,
     COALESCE(CAST(d.device_id As VARCHAR(50)), 'DEVICE_NOT_FOUND') device_id,
@@ -40,7 +40,7 @@ FROM app.payments_insider_sales_staging s
 LEFT JOIN app.payments_insider_payments_staging p On (s.card_number=p.card_number and s.authorization_code=p.authorization_code)
 LEFT JOIN app.dim_payment_method pm On (s.card_brand=pm.payment_method_brand)
 LEFT JOIN app.dim_device d ON (d.terminal_id = s.terminal_id)
-LEFT JOIN app.fact_device_assignment da ON (da.device_id = d.device_id AND CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.transaction_date AS DATE), 120) + ' ' + s.transaction_time) >= da.assign_date AND CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.transaction_date AS DATE), 120) + ' ' + s.transaction_time) < COALESCE(da.end_date, '9999-12-31'))
+LEFT JOIN app.fact_device_assignment da ON (da.device_id = d.device_id AND (CAST(CAST(s.transaction_date AS DATE) AS DATETIME) + CAST(s.transaction_time AS DATETIME)) >= da.assign_date AND (CAST(CAST(s.transaction_date AS DATE) AS DATETIME) + CAST(s.transaction_time AS DATETIME)) < COALESCE(da.end_date, '9999-12-31'))
 LEFT JOIN app.dim_charge_code cc On (da.location_id=cc.location_id AND cc.program_type_id=CASE WHEN d.device_type = 'Portable CC Reader' THEN 2 ELSE 1 END)
 LEFT JOIN app.dim_settlement_system ss On (ss.system_name='PI')
 WHERE 
@@ -15,8 +15,9 @@ INSERT INTO app.fact_transaction (
     charge_code_id,
     reference_number
 )
+OUTPUT inserted.staging_record_id INTO #etl_inserted (staging_record_id)
 SELECT --DISTINCT --THere was once two transactions with same card and same auth code in the same minute. Both seemed legit, but not sure how to verify.
-    CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.transaction_date AS DATE), 120) + ' ' + s.transaction_time) transaction_date, 
+    (CAST(CAST(s.transaction_date AS DATE) AS DATETIME) + CAST(s.transaction_time AS DATETIME)) transaction_date, 
     s.transaction_amount, 
     p.payment_date settle_date, 
     p.transaction_amount settle_amount, 
@@ -34,7 +35,7 @@ FROM app.payments_insider_sales_staging s
 LEFT JOIN app.payments_insider_payments_staging p On (s.card_number=p.card_number and s.authorization_code=p.authorization_code)
 INNER JOIN app.dim_payment_method pm On (s.card_brand=pm.payment_method_brand)
 INNER JOIN app.dim_device d ON (d.terminal_id = s.terminal_id)
-INNER JOIN app.fact_device_assignment da ON (da.device_id = d.device_id AND CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.transaction_date AS DATE), 120) + ' ' + s.transaction_time) >= da.assign_date AND CONVERT(DATETIME, CONVERT(VARCHAR, CAST(s.transaction_date AS DATE), 120) + ' ' + s.transaction_time) < COALESCE(da.end_date, '9999-12-31'))
+INNER JOIN app.fact_device_assignment da ON (da.device_id = d.device_id AND (CAST(CAST(s.transaction_date AS DATE) AS DATETIME) + CAST(s.transaction_time AS DATETIME)) >= da.assign_date AND (CAST(CAST(s.transaction_date AS DATE) AS DATETIME) + CAST(s.transaction_time AS DATETIME)) < COALESCE(da.end_date, '9999-12-31'))
 INNER JOIN app.dim_charge_code cc On (da.location_id=cc.location_id AND cc.program_type_id=CASE WHEN d.device_type = 'Portable CC Reader' THEN 2 ELSE 1 END)
 INNER JOIN app.dim_settlement_system ss On (ss.system_name='PI')
 WHERE 
@@ -31,10 +31,6 @@ from datetime import datetime
 import pandas as pd
 from sqlalchemy import text
 
-from db_manager import ConnectionManager
-
-cnxn = ConnectionManager()
-
 CUSTOMER_TYPES = ['transient', 'permit', 'employee']
 
 INSERT_COLS = [
@@ -415,6 +411,11 @@ def full_rebuild(garage_id, garage, engine, from_date=None):
 # ── Entry point ───────────────────────────────────────────────────────────────
 
 if __name__ == '__main__':
+    # Only the script entry point needs connections; importing the helpers
+    # (which all take an engine) stays free of side effects
+    from db_manager import ConnectionManager
+    cnxn = ConnectionManager()
+
     reporting_engine = cnxn.get_engine('PUReporting')
 
     garages_df = pd.read_sql(
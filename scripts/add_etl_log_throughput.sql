@@ -0,0 +1,13 @@
+-- SQL Server Migration Script: ETL run throughput and start_time index
+--
+-- Matches ETLProcessingLog in app/models/database.py. records_per_sec is
+-- computed and persisted by SQL Server once end_time is set; the start_time
+-- index serves "most recent runs" queries. (There is no BRIN in SQL Server;
+-- start_time grows with the identity key, so this index only ever appends.)
+
+ALTER TABLE app.etl_processing_log
+    ADD records_per_sec AS CAST(records_processed * 1000.0 / NULLIF(DATEDIFF_BIG(millisecond, start_time, end_time), 0) AS FLOAT) PERSISTED;
+GO
+
+CREATE INDEX ix_etl_processing_log_start_time ON app.etl_processing_log (start_time);
+GO
@@ -0,0 +1,14 @@
+-- SQL Server Migration Script: require valid JSON in uploaded_files.processing_errors
+--
+-- Matches ck_uploaded_files_processing_errors_json in app/models/database.py.
+-- Existing rows that are not valid JSON are wrapped as {"error": "..."} first.
+
+UPDATE app.uploaded_files
+SET processing_errors = (SELECT processing_errors AS error FOR JSON PATH, WITHOUT_ARRAY_WRAPPER)
+WHERE processing_errors IS NOT NULL AND ISJSON(processing_errors) = 0;
+GO
+
+ALTER TABLE app.uploaded_files
+    ADD CONSTRAINT ck_uploaded_files_processing_errors_json
+    CHECK (processing_errors IS NULL OR ISJSON(processing_errors) = 1);
+GO
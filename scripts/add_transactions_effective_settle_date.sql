@@ -0,0 +1,19 @@
+-- SQL Server Migration Script: indexable COALESCE(settle_date, transaction_date)
+--
+-- Matches Transaction.effective_settle_date in app/models/database.py.
+-- settle_date stays NULL for cash; filtering on effective_settle_date
+-- instead of COALESCE(settle_date, transaction_date) makes that predicate
+-- an index seek.
+
+ALTER TABLE app.transactions
+    ADD effective_settle_date AS COALESCE(settle_date, transaction_date) PERSISTED;
+GO
+
+IF EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = 'ps_transactions_month')
+    EXEC (N'CREATE INDEX ix_app_transactions_effective_settle_date
+              ON app.transactions (effective_settle_date)
+              ON ps_transactions_month (transaction_date);');
+ELSE
+    CREATE INDEX ix_app_transactions_effective_settle_date
+        ON app.transactions (effective_settle_date);
+GO
@@ -0,0 +1,36 @@
+-- SQL Server Migration Script: indexed view for daily/monthly revenue summaries
+--
+-- SQL Server's counterpart to a materialized view. The unique clustered index
+-- persists the aggregate, and the engine maintains it as transactions are
+-- inserted, so no nightly refresh job is needed. Read it with
+-- WITH (NOEXPAND) so the stored rows are used rather than the definition.
+-- transaction_amount is BIGINT cents (see MoneyCents).
+--
+-- Indexed views require these SET options on the creating session.
+
+SET ANSI_NULLS ON;
+SET QUOTED_IDENTIFIER ON;
+SET ANSI_PADDING ON;
+SET ANSI_WARNINGS ON;
+SET ARITHABORT ON;
+SET CONCAT_NULL_YIELDS_NULL ON;
+SET NUMERIC_ROUNDABORT OFF;
+GO
+
+CREATE OR ALTER VIEW app.v_daily_summary
+WITH SCHEMABINDING
+AS
+SELECT
+    CAST(transaction_date AS DATE) AS summary_date,
+    source,
+    payment_type,
+    org_code,
+    SUM(transaction_amount) AS total_cents,
+    COUNT_BIG(*) AS transaction_count
+FROM app.transactions
+GROUP BY CAST(transaction_date AS DATE), source, payment_type, org_code;
+GO
+
+CREATE UNIQUE CLUSTERED INDEX ux_v_daily_summary
+    ON app.v_daily_summary (summary_date, source, payment_type, org_code);
+GO
@@ -0,0 +1,14 @@
+-- SQL Server Migration Script: ETL pending-row indexes on the staging tables
+--
+-- Matches pending_rows_index() in app/models/database.py. The ETL templates
+-- filter on (source_file_id = @file_id AND processed_to_final = 0); these
+-- replace full scans of the staging tables with an index seek.
+
+CREATE INDEX ix_windcave_staging_pending ON app.windcave_staging (source_file_id, processed_to_final);
+CREATE INDEX ix_payments_insider_sales_staging_pending ON app.payments_insider_sales_staging (source_file_id, processed_to_final);
+CREATE INDEX ix_payments_insider_payments_staging_pending ON app.payments_insider_payments_staging (source_file_id, processed_to_final);
+CREATE INDEX ix_ips_staging_pending ON app.ips_staging (source_file_id, processed_to_final);
+CREATE INDEX ix_ips_cc_staging_pending ON app.ips_cc_staging (source_file_id, processed_to_final);
+CREATE INDEX ix_ips_mobile_staging_pending ON app.ips_mobile_staging (source_file_id, processed_to_final);
+CREATE INDEX ix_ips_cash_staging_pending ON app.ips_cash_staging (source_file_id, processed_to_final);
+CREATE INDEX ix_ips_coin_collector_staging_pending ON app.ips_coin_collector_staging (source_file_id, processed_to_final);
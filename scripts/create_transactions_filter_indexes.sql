@@ -0,0 +1,32 @@
+-- SQL Server Migration Script: composite indexes for TransactionFilter queries
+--
+-- Matches Transaction.__table_args__ in app/models/database.py. Each index
+-- leads with an equality filter and ends with transaction_date, so
+-- "payment_type = ? AND transaction_date BETWEEN ..." is one range seek.
+-- The terminal/org_code composites replace their single-column indexes.
+
+CREATE INDEX ix_transactions_payment_type_date
+    ON app.transactions (payment_type, transaction_date)
+    INCLUDE (transaction_amount);
+GO
+
+CREATE INDEX ix_transactions_location_type_date
+    ON app.transactions (location_type, transaction_date)
+    INCLUDE (transaction_amount);
+GO
+
+CREATE INDEX ix_transactions_terminal_date
+    ON app.transactions (device_terminal_id, transaction_date);
+GO
+
+CREATE INDEX ix_transactions_org_code_date
+    ON app.transactions (org_code, transaction_date);
+GO
+
+DROP INDEX IF EXISTS IX_transactions_terminal ON app.transactions;
+DROP INDEX IF EXISTS ix_app_transactions_device_terminal_id ON app.transactions;
+DROP INDEX IF EXISTS IX_transactions_org_code ON app.transactions;
+DROP INDEX IF EXISTS ix_app_transactions_org_code ON app.transactions;
+DROP INDEX IF EXISTS IX_transactions_location_type ON app.transactions;
+DROP INDEX IF EXISTS IX_transactions_payment_type ON app.transactions;
+GO
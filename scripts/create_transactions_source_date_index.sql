@@ -0,0 +1,15 @@
+-- SQL Server Migration Script: covering index for transaction reporting
+--
+-- Matches Transaction.__table_args__ in app/models/database.py. One
+-- (source, transaction_date) index with INCLUDEd amount/payment type replaces
+-- the two single-column indexes, so report range scans need no key lookups
+-- and each insert maintains one index instead of two.
+
+CREATE INDEX ix_transactions_source_date
+    ON app.transactions (source, transaction_date)
+    INCLUDE (transaction_amount, payment_type);
+
+DROP INDEX IF EXISTS IX_transactions_date ON app.transactions;
+DROP INDEX IF EXISTS IX_transactions_source ON app.transactions;
+DROP INDEX IF EXISTS ix_app_transactions_transaction_date ON app.transactions;
+DROP INDEX IF EXISTS ix_app_transactions_source ON app.transactions;
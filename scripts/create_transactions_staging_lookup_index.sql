@@ -0,0 +1,8 @@
+-- SQL Server Migration Script: staging audit-trail lookup index
+--
+-- Matches Transaction.__table_args__ in app/models/database.py. Serves
+-- get_staging_record() and "which transaction came from this staging row".
+
+CREATE INDEX ix_transactions_staging_lookup
+    ON app.transactions (staging_table, staging_record_id);
+GO
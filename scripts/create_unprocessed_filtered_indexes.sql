@@ -0,0 +1,24 @@
+-- SQL Server Migration Script: filtered indexes for ETL "not yet processed" scans
+--
+-- Matches unprocessed_rows_index() and the uploaded_files / etl_processing_log
+-- __table_args__ in app/models/database.py. Each index holds only the rows
+-- still waiting, so it stays small however large the tables grow.
+-- (Filtered indexes need ANSI_NULLS / QUOTED_IDENTIFIER ON.)
+
+SET ANSI_NULLS ON;
+SET QUOTED_IDENTIFIER ON;
+GO
+
+CREATE INDEX ix_windcave_staging_unprocessed ON app.windcave_staging (source_file_id) WHERE processed_to_final = 0;
+CREATE INDEX ix_payments_insider_sales_staging_unprocessed ON app.payments_insider_sales_staging (source_file_id) WHERE processed_to_final = 0;
+CREATE INDEX ix_payments_insider_payments_staging_unprocessed ON app.payments_insider_payments_staging (source_file_id) WHERE processed_to_final = 0;
+CREATE INDEX ix_ips_staging_unprocessed ON app.ips_staging (source_file_id) WHERE processed_to_final = 0;
+CREATE INDEX ix_ips_cc_staging_unprocessed ON app.ips_cc_staging (source_file_id) WHERE processed_to_final = 0;
+CREATE INDEX ix_ips_mobile_staging_unprocessed ON app.ips_mobile_staging (source_file_id) WHERE processed_to_final = 0;
+CREATE INDEX ix_ips_cash_staging_unprocessed ON app.ips_cash_staging (source_file_id) WHERE processed_to_final = 0;
+CREATE INDEX ix_ips_coin_collector_staging_unprocessed ON app.ips_coin_collector_staging (source_file_id) WHERE processed_to_final = 0;
+GO
+
+CREATE INDEX ix_uploaded_files_unprocessed ON app.uploaded_files (id) WHERE is_processed = 0;
+CREATE INDEX ix_etl_processing_log_running ON app.etl_processing_log (source_table) WHERE status = 'running';
+GO
@@ -0,0 +1,12 @@
+-- SQL Server Migration Script: composite index for the uploads dashboard
+--
+-- Matches UploadedFile.__table_args__ in app/models/database.py. Serves
+-- "files of this source (not yet processed), newest first" with an ordered
+-- range read, and replaces the single-column data_source_type index.
+
+CREATE INDEX ix_uploaded_files_dashboard
+    ON app.uploaded_files (data_source_type, is_processed, upload_date DESC);
+GO
+
+DROP INDEX IF EXISTS ix_app_uploaded_files_data_source_type ON app.uploaded_files;
+GO
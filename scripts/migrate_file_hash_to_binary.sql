@@ -0,0 +1,25 @@
+-- SQL Server Migration Script: store uploaded_files.file_hash as raw bytes
+--
+--   app.uploaded_files.file_hash   VARCHAR(64) hex -> VARBINARY(32)
+--
+-- Matches UploadedFile.file_hash in app/models/database.py. Halves the width
+-- of the unique index that every upload's duplicate check seeks on.
+
+DROP INDEX IF EXISTS ix_app_uploaded_files_file_hash ON app.uploaded_files;
+GO
+
+ALTER TABLE app.uploaded_files ADD file_hash_bin VARBINARY(32) NULL;
+GO
+
+UPDATE app.uploaded_files
+SET file_hash_bin = CONVERT(VARBINARY(32), file_hash, 2);
+GO
+
+ALTER TABLE app.uploaded_files DROP COLUMN file_hash;
+GO
+
+EXEC sp_rename 'app.uploaded_files.file_hash_bin', 'file_hash', 'COLUMN';
+GO
+
+CREATE UNIQUE INDEX ix_app_uploaded_files_file_hash ON app.uploaded_files (file_hash);
+GO
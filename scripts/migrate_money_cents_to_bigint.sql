@@ -0,0 +1,35 @@
+-- SQL Server Migration Script: widen integer-cent money columns to BIGINT
+--
+-- Follows migrate_money_columns_to_cents.sql. MoneyCents now maps to BIGINT:
+-- SUM() over an INT column is typed INT in SQL Server and overflows once a
+-- summary passes 2^31 cents ($21.4M).
+
+-- ============= ips_cash_staging =============
+ALTER TABLE app.ips_cash_staging ALTER COLUMN pennies BIGINT NULL;
+ALTER TABLE app.ips_cash_staging ALTER COLUMN nickels BIGINT NULL;
+ALTER TABLE app.ips_cash_staging ALTER COLUMN dimes BIGINT NULL;
+ALTER TABLE app.ips_cash_staging ALTER COLUMN quarters BIGINT NULL;
+ALTER TABLE app.ips_cash_staging ALTER COLUMN dollars BIGINT NULL;
+ALTER TABLE app.ips_cash_staging ALTER COLUMN coin_revenue BIGINT NULL;
+ALTER TABLE app.ips_cash_staging ALTER COLUMN invalid_coin_revenue BIGINT NULL;
+GO
+
+-- ============= transactions =============
+-- Indexes that INCLUDE transaction_amount must be rebuilt around the ALTER
+DROP INDEX IF EXISTS ix_transactions_source_date ON app.transactions;
+DROP INDEX IF EXISTS ix_transactions_payment_type_date ON app.transactions;
+DROP INDEX IF EXISTS ix_transactions_location_type_date ON app.transactions;
+GO
+
+ALTER TABLE app.transactions ALTER COLUMN transaction_amount BIGINT NOT NULL;
+ALTER TABLE app.transactions ALTER COLUMN settle_amount BIGINT NULL;
+GO
+
+DECLARE @on NVARCHAR(100) = CASE
+    WHEN EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = 'ps_transactions_month')
+    THEN N' ON ps_transactions_month (transaction_date)' ELSE N'' END;
+
+EXEC (N'CREATE INDEX ix_transactions_source_date ON app.transactions (source, transaction_date) INCLUDE (transaction_amount, payment_type)' + @on);
+EXEC (N'CREATE INDEX ix_transactions_payment_type_date ON app.transactions (payment_type, transaction_date) INCLUDE (transaction_amount)' + @on);
+EXEC (N'CREATE INDEX ix_transactions_location_type_date ON app.transactions (location_type, transaction_date) INCLUDE (transaction_amount)' + @on);
+GO
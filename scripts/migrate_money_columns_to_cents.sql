@@ -0,0 +1,146 @@
+-- SQL Server Migration Script: store money columns as INT cents
+--
+--   app.ips_cash_staging  pennies, nickels, dimes, quarters, dollars,
+--                         coin_revenue, invalid_coin_revenue   DECIMAL(10,2) -> INT
+--   app.transactions      transaction_amount, settle_amount     DECIMAL(10,2) -> INT
+--
+-- Matches MoneyCents in app/models/database.py: the ORM and bulk_copy convert
+-- Decimal dollars to cents on write; raw SQL divides by 100 on read.
+-- Run once; running it twice would multiply the values by 100 again.
+
+-- ============= ips_cash_staging =============
+ALTER TABLE app.ips_cash_staging ADD pennies_cents INT NULL;
+GO
+
+UPDATE app.ips_cash_staging
+SET pennies_cents = CAST(ROUND(pennies * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.ips_cash_staging DROP COLUMN pennies;
+GO
+
+EXEC sp_rename 'app.ips_cash_staging.pennies_cents', 'pennies', 'COLUMN';
+GO
+
+ALTER TABLE app.ips_cash_staging ADD nickels_cents INT NULL;
+GO
+
+UPDATE app.ips_cash_staging
+SET nickels_cents = CAST(ROUND(nickels * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.ips_cash_staging DROP COLUMN nickels;
+GO
+
+EXEC sp_rename 'app.ips_cash_staging.nickels_cents', 'nickels', 'COLUMN';
+GO
+
+ALTER TABLE app.ips_cash_staging ADD dimes_cents INT NULL;
+GO
+
+UPDATE app.ips_cash_staging
+SET dimes_cents = CAST(ROUND(dimes * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.ips_cash_staging DROP COLUMN dimes;
+GO
+
+EXEC sp_rename 'app.ips_cash_staging.dimes_cents', 'dimes', 'COLUMN';
+GO
+
+ALTER TABLE app.ips_cash_staging ADD quarters_cents INT NULL;
+GO
+
+UPDATE app.ips_cash_staging
+SET quarters_cents = CAST(ROUND(quarters * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.ips_cash_staging DROP COLUMN quarters;
+GO
+
+EXEC sp_rename 'app.ips_cash_staging.quarters_cents', 'quarters', 'COLUMN';
+GO
+
+ALTER TABLE app.ips_cash_staging ADD dollars_cents INT NULL;
+GO
+
+UPDATE app.ips_cash_staging
+SET dollars_cents = CAST(ROUND(dollars * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.ips_cash_staging DROP COLUMN dollars;
+GO
+
+EXEC sp_rename 'app.ips_cash_staging.dollars_cents', 'dollars', 'COLUMN';
+GO
+
+ALTER TABLE app.ips_cash_staging ADD coin_revenue_cents INT NULL;
+GO
+
+UPDATE app.ips_cash_staging
+SET coin_revenue_cents = CAST(ROUND(coin_revenue * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.ips_cash_staging DROP COLUMN coin_revenue;
+GO
+
+EXEC sp_rename 'app.ips_cash_staging.coin_revenue_cents', 'coin_revenue', 'COLUMN';
+GO
+
+ALTER TABLE app.ips_cash_staging ADD invalid_coin_revenue_cents INT NULL;
+GO
+
+UPDATE app.ips_cash_staging
+SET invalid_coin_revenue_cents = CAST(ROUND(invalid_coin_revenue * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.ips_cash_staging DROP COLUMN invalid_coin_revenue;
+GO
+
+EXEC sp_rename 'app.ips_cash_staging.invalid_coin_revenue_cents', 'invalid_coin_revenue', 'COLUMN';
+GO
+
+-- ============= transactions =============
+-- The covering report index INCLUDEs transaction_amount; drop it for the swap
+DROP INDEX IF EXISTS ix_transactions_source_date ON app.transactions;
+GO
+
+ALTER TABLE app.transactions ADD transaction_amount_cents INT NULL;
+GO
+
+UPDATE app.transactions
+SET transaction_amount_cents = CAST(ROUND(transaction_amount * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.transactions DROP COLUMN transaction_amount;
+GO
+
+EXEC sp_rename 'app.transactions.transaction_amount_cents', 'transaction_amount', 'COLUMN';
+GO
+
+ALTER TABLE app.transactions ALTER COLUMN transaction_amount INT NOT NULL;
+GO
+
+ALTER TABLE app.transactions ADD settle_amount_cents INT NULL;
+GO
+
+UPDATE app.transactions
+SET settle_amount_cents = CAST(ROUND(settle_amount * 100, 0) AS INT);
+GO
+
+ALTER TABLE app.transactions DROP COLUMN settle_amount;
+GO
+
+EXEC sp_rename 'app.transactions.settle_amount_cents', 'settle_amount', 'COLUMN';
+GO
+
+IF EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = 'ps_transactions_month')
+    EXEC (N'CREATE INDEX ix_transactions_source_date
+              ON app.transactions (source, transaction_date)
+              INCLUDE (transaction_amount, payment_type)
+              ON ps_transactions_month (transaction_date);');
+ELSE
+    CREATE INDEX ix_transactions_source_date
+        ON app.transactions (source, transaction_date)
+        INCLUDE (transaction_amount, payment_type);
+GO
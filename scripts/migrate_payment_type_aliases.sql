@@ -0,0 +1,8 @@
+-- SQL Server Migration Script: retire PaymentType.TEXT
+--
+-- SQLAlchemy stores Enum member names. TEXT was folded into TEXT_TO_PAY
+-- (see PaymentType._missing_ in app/models/database.py); MC and DISC were
+-- value aliases and were always stored as MASTERCARD / DISCOVER.
+
+UPDATE app.transactions SET payment_type = 'TEXT_TO_PAY' WHERE payment_type = 'TEXT';
+GO
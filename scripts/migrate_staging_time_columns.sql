@@ -0,0 +1,36 @@
+-- SQL Server Migration Script: store staging time-of-day columns as TIME
+--
+--   app.payments_insider_sales_staging.transaction_time   NVARCHAR(8)  -> TIME
+--   app.ips_cash_staging.collection_time                  NVARCHAR(11) -> TIME
+--
+-- Loaders now parse these once at load time (parse_time_string), and the SQL
+-- templates combine them with the date column as DATETIME + DATETIME.
+-- Values SQL Server cannot read become NULL, matching parse_time_string.
+
+-- ============= payments_insider_sales_staging =============
+ALTER TABLE app.payments_insider_sales_staging ADD transaction_time_new TIME NULL;
+GO
+
+UPDATE app.payments_insider_sales_staging
+SET transaction_time_new = TRY_CONVERT(TIME, transaction_time);
+GO
+
+ALTER TABLE app.payments_insider_sales_staging DROP COLUMN transaction_time;
+GO
+
+EXEC sp_rename 'app.payments_insider_sales_staging.transaction_time_new', 'transaction_time', 'COLUMN';
+GO
+
+-- ============= ips_cash_staging =============
+ALTER TABLE app.ips_cash_staging ADD collection_time_new TIME NULL;
+GO
+
+UPDATE app.ips_cash_staging
+SET collection_time_new = TRY_CONVERT(TIME, collection_time);
+GO
+
+ALTER TABLE app.ips_cash_staging DROP COLUMN collection_time;
+GO
+
+EXEC sp_rename 'app.ips_cash_staging.collection_time_new', 'collection_time', 'COLUMN';
+GO
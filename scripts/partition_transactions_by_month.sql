@@ -0,0 +1,177 @@
+-- SQL Server Migration Script: monthly RANGE partitioning for app.transactions
+--
+-- transactions is the one fact table every payment source lands in, so it
+-- grows without bound. Partitioning on transaction_date lets date-bounded
+-- report queries touch only the months they ask for, and old months can be
+-- switched out to an archive table instead of deleted row by row.
+--
+-- SQLAlchemy cannot express a partition scheme, so Base.metadata.create_all()
+-- still creates an unpartitioned table; run this script once against an
+-- existing database. Schedule app.create_next_month_partition (SQL Agent job,
+-- monthly) so there is always an empty partition ahead of the data.
+--
+-- SWITCH only accepts a table whose every index is partition-aligned and
+-- that no foreign key references. This script therefore keys the table on
+-- (id, transaction_date), realigns every index, and drops the staging
+-- tables' transaction_id foreign keys (id is IDENTITY, so it stays unique
+-- without them). Indexes added later must also be created
+-- ON ps_transactions_month (transaction_date), as
+-- add_transactions_effective_settle_date.sql does.
+--
+-- app.v_daily_summary is schema-bound to this table: it is dropped here, so
+-- rerun scripts/create_daily_summary_view.sql afterwards, and
+-- app.switch_out_transactions_month drops and rebuilds it around each SWITCH.
+
+-- 0. The indexed view pins the table's schema while it exists
+DROP VIEW IF EXISTS app.v_daily_summary;
+GO
+
+-- 1. Monthly boundaries from the first month on file through next month
+DECLARE @first DATE = (
+    SELECT DATEFROMPARTS(YEAR(MIN(transaction_date)), MONTH(MIN(transaction_date)), 1)
+    FROM app.transactions
+);
+DECLARE @last DATE = DATEADD(MONTH, 1, DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1));
+IF @first IS NULL SET @first = DATEADD(MONTH, -1, @last);
+
+DECLARE @boundaries NVARCHAR(MAX) = N'';
+WHILE @first <= @last
+BEGIN
+    SET @boundaries += CASE WHEN @boundaries = N'' THEN N'' ELSE N', ' END
+        + N'''' + CONVERT(NVARCHAR(10), @first, 23) + N'''';
+    SET @first = DATEADD(MONTH, 1, @first);
+END
+
+EXEC (N'CREATE PARTITION FUNCTION pf_transactions_month (DATETIME) AS RANGE RIGHT FOR VALUES (' + @boundaries + N');');
+GO
+
+CREATE PARTITION SCHEME ps_transactions_month
+    AS PARTITION pf_transactions_month ALL TO ([PRIMARY]);
+GO
+
+-- 2. Drop the foreign keys that reference transactions (they block both the
+--    primary key change and SWITCH), then cluster on the partition key
+DECLARE @fks NVARCHAR(MAX) = N'';
+SELECT @fks += N'ALTER TABLE ' + QUOTENAME(OBJECT_SCHEMA_NAME(parent_object_id)) + N'.'
+    + QUOTENAME(OBJECT_NAME(parent_object_id)) + N' DROP CONSTRAINT ' + QUOTENAME(name) + N';'
+FROM sys.foreign_keys
+WHERE referenced_object_id = OBJECT_ID('app.transactions');
+EXEC (@fks);
+GO
+
+DECLARE @pk SYSNAME = (
+    SELECT name FROM sys.key_constraints
+    WHERE parent_object_id = OBJECT_ID('app.transactions') AND type = 'PK'
+);
+EXEC (N'ALTER TABLE app.transactions DROP CONSTRAINT ' + @pk + N';');
+GO
+
+CREATE CLUSTERED INDEX cx_transactions_transaction_date
+    ON app.transactions (transaction_date, id)
+    ON ps_transactions_month (transaction_date);
+GO
+
+-- A unique index on a partitioned table must contain the partition key
+ALTER TABLE app.transactions
+    ADD CONSTRAINT pk_transactions PRIMARY KEY NONCLUSTERED (id, transaction_date)
+    ON ps_transactions_month (transaction_date);
+GO
+
+-- 3. Rebuild every other index (create_all and the index scripts put them on
+--    [PRIMARY]) in place on the partition scheme, keeping its columns
+DECLARE @indexes NVARCHAR(MAX) = N'';
+SELECT @indexes += N'CREATE ' + CASE WHEN i.is_unique = 1 THEN N'UNIQUE ' ELSE N'' END
+    + N'INDEX ' + QUOTENAME(i.name) + N' ON app.transactions ('
+    + (SELECT STRING_AGG(QUOTENAME(c.name) + CASE WHEN ic.is_descending_key = 1 THEN N' DESC' ELSE N'' END, N', ')
+           WITHIN GROUP (ORDER BY ic.key_ordinal)
+       FROM sys.index_columns ic
+       JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+       WHERE ic.object_id = i.object_id AND ic.index_id = i.index_id AND ic.is_included_column = 0)
+    + N')'
+    + ISNULL(N' INCLUDE (' + (
+        SELECT STRING_AGG(QUOTENAME(c.name), N', ')
+        FROM sys.index_columns ic
+        JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE ic.object_id = i.object_id AND ic.index_id = i.index_id AND ic.is_included_column = 1
+      ) + N')', N'')
+    + CASE WHEN i.has_filter = 1 THEN N' WHERE ' + i.filter_definition ELSE N'' END
+    + N' WITH (DROP_EXISTING = ON) ON ps_transactions_month (transaction_date);'
+FROM sys.indexes i
+WHERE i.object_id = OBJECT_ID('app.transactions')
+  AND i.type = 2  -- nonclustered
+  AND i.is_primary_key = 0
+  AND i.data_space_id <> (SELECT data_space_id FROM sys.partition_schemes WHERE name = 'ps_transactions_month');
+EXEC (@indexes);
+GO
+
+-- 4. Maintenance: add the boundary for the month after next if it is missing
+CREATE OR ALTER PROCEDURE app.create_next_month_partition
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @boundary DATETIME = DATEADD(MONTH, 2, DATEFROMPARTS(YEAR(GETDATE()), MONTH(GETDATE()), 1));
+
+    IF NOT EXISTS (
+        SELECT 1
+        FROM sys.partition_range_values v
+        JOIN sys.partition_functions f ON f.function_id = v.function_id
+        WHERE f.name = 'pf_transactions_month' AND CAST(v.value AS DATETIME) = @boundary
+    )
+    BEGIN
+        ALTER PARTITION SCHEME ps_transactions_month NEXT USED [PRIMARY];
+        ALTER PARTITION FUNCTION pf_transactions_month() SPLIT RANGE (@boundary);
+    END
+END
+GO
+
+EXEC app.create_next_month_partition;
+GO
+
+-- 5. Archival: switch one month out to @target, an empty table with the same
+--    columns and indexes as app.transactions on ps_transactions_month. The
+--    switch itself is metadata only; rebuilding app.v_daily_summary's index
+--    afterwards rescans the remaining months, so run it off-hours.
+SET ANSI_NULLS ON;
+SET QUOTED_IDENTIFIER ON;
+GO
+
+CREATE OR ALTER PROCEDURE app.switch_out_transactions_month
+    @month DATE,
+    @target NVARCHAR(256)  -- schema.table
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    -- Required to rebuild the indexed view (see create_daily_summary_view.sql)
+    SET ANSI_PADDING ON;
+    SET ANSI_WARNINGS ON;
+    SET ARITHABORT ON;
+    SET CONCAT_NULL_YIELDS_NULL ON;
+    SET NUMERIC_ROUNDABORT OFF;
+
+    DECLARE @partition NVARCHAR(10) = CAST($PARTITION.pf_transactions_month(CAST(@month AS DATETIME)) AS NVARCHAR(10));
+    DECLARE @view NVARCHAR(MAX) = OBJECT_DEFINITION(OBJECT_ID('app.v_daily_summary'));
+
+    BEGIN TRANSACTION;
+
+    -- SWITCH is refused while the schema-bound view references the table;
+    -- it is recreated from its own definition once the month is out
+    IF @view IS NOT NULL
+        DROP VIEW app.v_daily_summary;
+
+    EXEC (N'ALTER TABLE app.transactions SWITCH PARTITION ' + @partition
+        + N' TO ' + QUOTENAME(PARSENAME(@target, 2)) + N'.' + QUOTENAME(PARSENAME(@target, 1))
+        + N' PARTITION ' + @partition + N';');
+
+    IF @view IS NOT NULL
+    BEGIN
+        EXEC (@view);
+        -- Same index as scripts/create_daily_summary_view.sql
+        EXEC (N'CREATE UNIQUE CLUSTERED INDEX ux_v_daily_summary
+                  ON app.v_daily_summary (summary_date, source, payment_type, org_code);');
+    END
+
+    COMMIT TRANSACTION;
+END
+GO
@@ -0,0 +1,47 @@
+-- SQL Server Migration Script: right-size string columns
+--
+-- Matches the column widths in app/models/database.py. Fixed-width codes
+-- become CHAR; free-text columns on transactions/sql_cash_staging shrink to
+-- the widest staging column that feeds them (area 50, pole/terminal_id 24,
+-- txnref 32). Smaller declared widths mean smaller memory grants for sorts
+-- and hashes, and an over-long value now fails the insert with
+-- "String or binary data would be truncated" instead of being stored.
+--
+-- Each ALTER fails if existing data is longer than the new width; check with
+--   SELECT MAX(LEN(col)) FROM app.<table>;
+-- before running.
+
+-- ============= windcave_staging =============
+ALTER TABLE app.windcave_staging ALTER COLUMN cur CHAR(3) NULL;
+GO
+
+-- ============= payments_insider_sales_staging =============
+ALTER TABLE app.payments_insider_sales_staging ALTER COLUMN settled_currency CHAR(3) NULL;
+ALTER TABLE app.payments_insider_sales_staging ALTER COLUMN transaction_currency CHAR(3) NULL;
+ALTER TABLE app.payments_insider_sales_staging ALTER COLUMN durbin_regulated CHAR(1) NULL;
+GO
+
+-- ============= payments_insider_payments_staging =============
+ALTER TABLE app.payments_insider_payments_staging ALTER COLUMN currency CHAR(3) NULL;
+GO
+
+-- ============= sql_cash_staging =============
+ALTER TABLE app.sql_cash_staging ALTER COLUMN location VARCHAR(50) NULL;
+ALTER TABLE app.sql_cash_staging ALTER COLUMN terminal_id VARCHAR(24) NULL;
+ALTER TABLE app.sql_cash_staging ALTER COLUMN reference VARCHAR(32) NULL;
+GO
+
+-- ============= transactions =============
+-- device_terminal_id is indexed; the index has to be rebuilt around the ALTER
+DROP INDEX IF EXISTS IX_transactions_terminal ON app.transactions;
+DROP INDEX IF EXISTS ix_app_transactions_device_terminal_id ON app.transactions;
+GO
+
+ALTER TABLE app.transactions ALTER COLUMN location_name VARCHAR(50) NULL;
+ALTER TABLE app.transactions ALTER COLUMN location_sub_area VARCHAR(50) NULL;
+ALTER TABLE app.transactions ALTER COLUMN device_terminal_id VARCHAR(24) NULL;
+ALTER TABLE app.transactions ALTER COLUMN reference_number VARCHAR(32) NULL;
+GO
+
+CREATE INDEX ix_app_transactions_device_terminal_id ON app.transactions (device_terminal_id);
+GO
@@ -0,0 +1,18 @@
+-- SQL Server Migration Script: right-size windcave_staging numeric columns
+--
+-- Matches WindcaveStaging in app/models/database.py.
+-- * Windcave billing/terminal/order identifiers can exceed INT, so they become BIGINT
+-- * authorized / reco / voided only ever hold 0 or 1, so they become SMALLINT
+-- The ETL templates compare voided = 0, which works the same on SMALLINT.
+
+ALTER TABLE app.windcave_staging ALTER COLUMN billingid BIGINT NULL;
+ALTER TABLE app.windcave_staging ALTER COLUMN dpsbillingid BIGINT NULL;
+ALTER TABLE app.windcave_staging ALTER COLUMN catid BIGINT NULL;
+ALTER TABLE app.windcave_staging ALTER COLUMN merch_corp_ref BIGINT NULL;
+ALTER TABLE app.windcave_staging ALTER COLUMN order_number BIGINT NULL;
+GO
+
+ALTER TABLE app.windcave_staging ALTER COLUMN authorized SMALLINT NULL;
+ALTER TABLE app.windcave_staging ALTER COLUMN reco SMALLINT NULL;
+ALTER TABLE app.windcave_staging ALTER COLUMN voided SMALLINT NULL;
+GO
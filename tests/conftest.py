@@ -0,0 +1,149 @@
+"""
+Shared test fixtures
+
+The app modules create their SQL Server engines at import, so importing them
+needs SQLAlchemy, pyodbc and the ODBC driver manager pyodbc links against.
+Fixtures import the app lazily through import_app_module, which skips the
+test where that isn't available, so test modules don't each guard their own
+imports.
+"""
+
+import importlib
+import sqlite3
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+
+def import_app_module(name: str):
+    """Import an app module, skipping the calling test if its dependencies can't load"""
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        # Also catches pyodbc's ImportError when libodbc is missing
+        pytest.skip(f"{name} is not importable here: {e}")
+
+
+class RowsSession:
+    """Stand-in read session whose execute() returns fixed rows.
+
+    Only for endpoints whose SQL needs SQL Server itself (e.g. the
+    v_daily_summary view read WITH (NOEXPAND)); everything else runs its real
+    queries against the sqlite_session fixture.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, *args, **kwargs):
+        return _Result(self.rows)
+
+    def close(self):
+        pass
+
+
+class _Result(list):
+    """Iterable result with the fetch methods endpoints call"""
+
+    def fetchall(self):
+        return list(self)
+
+    def first(self):
+        return self[0] if self else None
+
+
+def _build_app():
+    """The FastAPI app under test.
+
+    app.main also imports the site-only cityworks client; where that is
+    missing, mount the routers under test the way app/api/v1/api.py does.
+    """
+    try:
+        from app.main import app
+        return app
+    except ImportError:
+        pass
+    from fastapi import FastAPI, APIRouter
+    from fastapi.responses import ORJSONResponse
+    users = import_app_module("app.api.v1.endpoints.users")
+    data_lake = import_app_module("app.api.v1.endpoints.data_lake_endpoints")
+    api_router = APIRouter()
+    api_router.include_router(users.router, tags=["users"])
+    api_router.include_router(data_lake.router)
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(api_router, prefix="/api/v1")
+    return app
+
+
+@pytest.fixture
+def api():
+    """HTTP client for the app, signed in as an active admin.
+
+    api.use_db(session) serves both the read/write and read-only session
+    dependencies from the given session.
+    """
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    dependencies = import_app_module("app.api.dependencies")
+    db_session = import_app_module("app.db.session")
+    app = _build_app()
+
+    admin = dependencies.UserProxy(
+        employee_id=1, username="admin", email="admin@example.org", first_name="Ada",
+        last_name="Admin", role="admin", password_hash="", is_active=True,
+        created_at=datetime(2024, 1, 1),
+    )
+
+    def use_db(session):
+        app.dependency_overrides[db_session.get_db] = lambda: session
+        app.dependency_overrides[db_session.get_read_db] = lambda: session
+
+    app.dependency_overrides[dependencies.get_current_user] = lambda: admin
+    # No `with`: the startup ETL bootstrap and init_db must not run in tests
+    yield SimpleNamespace(client=TestClient(app), use_db=use_db)
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def sqlite_session():
+    """A session on an in-memory SQLite database with the app and pt schemas
+    attached, holding app.transactions and pt.employees"""
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+    database = import_app_module("app.models.database")
+
+    # TestClient runs sync endpoints in a worker thread; StaticPool shares the one connection
+    # PARSE_DECLTYPES: raw-SQL reads of pt.employees.created_at (TIMESTAMP) come back as
+    # datetime, as from SQL Server; ORM DateTime columns are declared DATETIME and unaffected
+    engine = sqlalchemy.create_engine(
+        "sqlite://", poolclass=StaticPool,
+        connect_args={"check_same_thread": False, "detect_types": sqlite3.PARSE_DECLTYPES}
+    )
+
+    @sqlalchemy.event.listens_for(engine, "connect")
+    def attach_schemas(dbapi_connection, connection_record):
+        for schema in ("app", "pt"):
+            dbapi_connection.execute(f"ATTACH DATABASE ':memory:' AS {schema}")
+
+    database.Transaction.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("""
+            CREATE TABLE pt.employees (
+                employee_id INTEGER PRIMARY KEY, username VARCHAR(50), email VARCHAR(100),
+                first_name VARCHAR(50), last_name VARCHAR(50), role VARCHAR(32),
+                password_hash VARCHAR(200), is_active INTEGER, created_at TIMESTAMP
+            )
+        """)
+
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def rows_session():
+    """Factory for RowsSession stand-ins: rows_session([row, ...])"""
+    return RowsSession
@@ -0,0 +1,65 @@
+"""iter_xlsx_frames reads ragged rows and skips formatted blank rows"""
+
+import re
+import zipfile
+
+import pytest
+
+from conftest import import_app_module
+
+openpyxl = pytest.importorskip("openpyxl")
+from openpyxl.styles import Font
+
+
+@pytest.fixture
+def etl_processor():
+    return import_app_module("app.utils.etl_processor")
+
+
+@pytest.fixture
+def ragged_xlsx(tmp_path):
+    """Header of three columns, one short and one long row, a blank row, and
+    a run of styled-but-empty rows after the data"""
+    path = tmp_path / "report.xlsx"
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Terminal", "Amount", "Note"])
+    sheet.append(["T1", 1.5, "ok"])
+    sheet.append(["T2", 2.0])
+    sheet.append(["T3", 3.25, "long", "extra"])
+    sheet.append([None, None, None])
+    sheet.append(["T4", 4.0, None])
+    for row in range(7, 12):
+        sheet.cell(row=row, column=1).font = Font(bold=True)
+    workbook.save(path)
+    _drop_dimension(path)
+    return str(path)
+
+
+def _drop_dimension(path):
+    """Remove the sheet's <dimension> element, as many report exporters omit
+    it; read-only openpyxl then yields each row at its own width"""
+    with zipfile.ZipFile(path) as source:
+        parts = {name: source.read(name) for name in source.namelist()}
+    sheet = "xl/worksheets/sheet1.xml"
+    parts[sheet] = re.sub(rb"<dimension[^>]*/>", b"", parts[sheet])
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+        for name, data in parts.items():
+            target.writestr(name, data)
+
+
+def test_ragged_and_blank_rows(ragged_xlsx, etl_processor):
+    frames = list(etl_processor.iter_xlsx_frames(ragged_xlsx, dtype={"Terminal": str}))
+    assert len(frames) == 1
+    df = frames[0]
+
+    assert list(df.columns) == ["Terminal", "Amount", "Note"]
+    assert df["Terminal"].tolist() == ["T1", "T2", "T3", "T4"]
+    assert df["Amount"].tolist() == [1.5, 2.0, 3.25, 4.0]
+    assert df["Note"].isna().tolist() == [False, True, False, True]
+
+
+def test_chunks_skip_blank_rows(ragged_xlsx, etl_processor, monkeypatch):
+    monkeypatch.setattr(etl_processor, "REPORT_CHUNK_SIZE", 3)
+    frames = list(etl_processor.iter_xlsx_frames(ragged_xlsx))
+    assert [len(df) for df in frames] == [3, 1]
@@ -0,0 +1,19 @@
+"""GET /users reads pt.employees and returns validated UserResponse rows"""
+
+from datetime import datetime
+
+
+def test_list_users(api, sqlite_session):
+    sqlite_session.connection().exec_driver_sql(
+        "INSERT INTO pt.employees VALUES (3, 'jdoe', 'jdoe@example.org', 'J', 'Doe', 'MANAGER', '', 1, ?)",
+        (datetime(2024, 1, 1),),
+    )
+    api.use_db(sqlite_session)
+
+    response = api.client.get("/api/v1/users")
+
+    assert response.status_code == 200
+    user, = response.json()
+    assert user["role"] == "manager"
+    assert user["is_active"] is True
+    assert user["full_name"] == "J Doe"
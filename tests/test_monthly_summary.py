@@ -0,0 +1,29 @@
+"""GET /data-lake/summary/monthly keys by_org_code with the int org_code as a string"""
+
+from datetime import date
+from types import SimpleNamespace
+
+
+def _row(summary_date, org_code, total_cents, transaction_count=1):
+    return SimpleNamespace(
+        summary_date=summary_date, source="WINDCAVE", payment_type="VISA",
+        org_code=org_code, total_cents=total_cents, transaction_count=transaction_count,
+    )
+
+
+def test_monthly_summary_org_codes(api, rows_session):
+    # v_daily_summary is a SQL Server indexed view read WITH (NOEXPAND), so its rows are fixed here
+    api.use_db(rows_session([
+        _row(date(2024, 3, 1), 82044, 1250),
+        _row(date(2024, 3, 2), 82044, 750),
+        _row(date(2024, 3, 2), 0, 100),
+        _row(date(2024, 3, 3), None, 500),
+    ]))
+
+    response = api.client.get("/api/v1/data-lake/summary/monthly", params={"year": 2024})
+
+    assert response.status_code == 200
+    month = response.json()[0]
+    assert month["month"] == 3
+    assert month["by_org_code"] == {"82044": 20.0, "0": 1.0, "unassigned": 5.0}
+    assert month["transaction_count"] == 4
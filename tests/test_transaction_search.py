@@ -0,0 +1,57 @@
+"""POST /data-lake/transactions/search against real rows in SQLite"""
+
+from datetime import datetime
+from decimal import Decimal
+
+from conftest import import_app_module
+
+
+def test_search_returns_schema_shaped_rows(api, sqlite_session):
+    database = import_app_module("app.models.database")
+    sqlite_session.add_all([
+        database.Transaction(
+            transaction_date=datetime(2024, 3, 1, 9, 30), transaction_amount=Decimal("12.50"),
+            settle_date=datetime(2024, 3, 2), settle_amount=Decimal("12.05"),
+            source=database.DataSourceType.WINDCAVE, location_type=next(iter(database.LocationType)),
+            location_name="Overture Center", device_terminal_id="T1",
+            payment_type=database.PaymentType.VISA, org_code=82045,
+        ),
+        database.Transaction(
+            transaction_date=datetime(2024, 3, 1, 10, 0), transaction_amount=Decimal("3.00"),
+            source=database.DataSourceType.IPS_CASH, location_type=next(iter(database.LocationType)),
+            device_terminal_id="T2", payment_type=database.PaymentType.CASH,
+        ),
+    ])
+    sqlite_session.commit()
+    api.use_db(sqlite_session)
+
+    response = api.client.post("/api/v1/data-lake/transactions/search", json={})
+
+    assert response.status_code == 200
+    card, cash = sorted(response.json(), key=lambda row: row["id"])
+    assert card["transaction_amount"] == 12.5
+    assert card["settle_amount"] == 12.05
+    assert card["source"] == database.DataSourceType.WINDCAVE.value
+    assert card["org_code"] == 82045
+    assert cash["settle_amount"] is None
+    assert cash["settle_date"] is None
+    assert cash["org_code"] is None
+
+
+def test_search_filters_in_sql(api, sqlite_session):
+    database = import_app_module("app.models.database")
+    for amount in ("1.00", "5.00", "9.00"):
+        sqlite_session.add(database.Transaction(
+            transaction_date=datetime(2024, 3, 1), transaction_amount=Decimal(amount),
+            source=database.DataSourceType.IPS_CASH, location_type=next(iter(database.LocationType)),
+            device_terminal_id="T1", payment_type=database.PaymentType.CASH,
+        ))
+    sqlite_session.commit()
+    api.use_db(sqlite_session)
+
+    response = api.client.post(
+        "/api/v1/data-lake/transactions/search", json={"min_amount": 2, "max_amount": 8}
+    )
+
+    assert response.status_code == 200
+    assert [row["transaction_amount"] for row in response.json()] == [5.0]